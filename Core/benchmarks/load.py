@@ -0,0 +1,192 @@
+"""Concurrent load test of `Healer.recover` against the local mock LLM server.
+
+Run from `Core/`:
+
+    python -m benchmarks.load --provider openai --concurrency 8 --requests 200
+    python -m benchmarks.load --latency lognormal:-1.6,0.5 --error-rate 0.02 --rate-limit-rate 0.05
+
+Each worker heals synthetic pages through its own Healer (artifacts go to a
+temporary directory) while all workers share one provider client, so the
+connection pool, retry policy and rate limiter behave as in a parallel run.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import statistics
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from benchmarks.mock_llm import MockLLMServer, build_mock_client
+from benchmarks.scoring import DEFAULT_CONFIG, DEFAULT_OUTPUT_DIR
+from benchmarks.synthetic import RecordedDriver, raw_candidate_payload, synthetic_candidates, synthetic_page
+from framework.config.loader import ConfigLoader
+from framework.config.schema import TestSuiteConfig
+from framework.core.dom_monitor import DomMonitor
+from framework.core.healer import Healer
+from framework.logging.artifacts import ArtifactManager, CapturePolicy
+from framework.logging.audit import HealingAuditLogger
+
+
+def run_load(
+    suite_config: TestSuiteConfig,
+    llm_client,
+    *,
+    requests: int = 100,
+    concurrency: int = 8,
+    page_size: int = 200,
+    element_keys: list[str] | None = None,
+    seed: int = 458,
+) -> dict[str, Any]:
+    """Runs `requests` heals over `concurrency` threads and reports throughput and latency percentiles."""
+
+    keys = element_keys or suite_config.element_keys()
+    rng = random.Random(seed)
+    drivers = []
+    for key in keys:
+        candidates, _ = synthetic_candidates(suite_config.get_element(key), page_size, 0.25, rng)
+        drivers.append((key, RecordedDriver(raw_candidate_payload(candidates), synthetic_page(candidates))))
+
+    local = threading.local()
+    writers: list[tuple[ArtifactManager, HealingAuditLogger]] = []
+    latencies: list[float] = []
+    errors: Counter[str] = Counter()
+    lock = threading.Lock()
+
+    with tempfile.TemporaryDirectory(prefix="heal-load-") as temp_dir:
+
+        def healer() -> Healer:
+            if not hasattr(local, "healer"):
+                root = Path(temp_dir) / threading.current_thread().name
+                artifact_manager = ArtifactManager(root, capture_policy=CapturePolicy("on_failure"))
+                audit_logger = HealingAuditLogger(root)
+                with lock:
+                    writers.append((artifact_manager, audit_logger))
+                local.healer = Healer(suite_config, llm_client, DomMonitor(), artifact_manager, audit_logger)
+            return local.healer
+
+        def heal(index: int) -> None:
+            key, driver = drivers[index % len(drivers)]
+            started = perf_counter()
+            try:
+                healer().recover(driver, key, RuntimeError("load test"))
+            except Exception as exc:  # noqa: BLE001 - failures are part of the report.
+                with lock:
+                    errors[type(exc).__name__] += 1
+                return
+            elapsed = perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+        started = perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="heal-load") as executor:
+            list(executor.map(heal, range(requests)))
+        # Queued audit records are part of the work, and must land before the directory goes.
+        for _, audit_logger in writers:
+            audit_logger.flush()
+        duration = perf_counter() - started
+        audit_write_errors = 0
+        for artifact_manager, audit_logger in writers:
+            artifact_manager.close()
+            audit_logger.close()
+            if audit_logger.batcher is not None:
+                audit_write_errors += len(audit_logger.batcher.errors)
+
+    ordered = sorted(latencies)
+    return {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "provider": llm_client.provider_name,
+            "requests": requests,
+            "concurrency": concurrency,
+            "page_size": page_size,
+            "seed": seed,
+        },
+        "succeeded": len(ordered),
+        "failed": sum(errors.values()),
+        "errors": dict(errors),
+        "audit_write_errors": audit_write_errors,
+        "duration_seconds": duration,
+        "throughput_per_second": len(ordered) / duration if duration else None,
+        "latency_seconds": {
+            "mean": statistics.fmean(ordered) if ordered else None,
+            "p50": _percentile(ordered, 50),
+            "p90": _percentile(ordered, 90),
+            "p99": _percentile(ordered, 99),
+            "max": ordered[-1] if ordered else None,
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG))
+    parser.add_argument("--provider", default="openai", choices=("openai", "anthropic", "gemini", "azure_openai"))
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--elements", default="all", help="comma-separated element keys, or 'all'")
+    parser.add_argument("--latency", default="lognormal:-1.6,0.5", help="fixed:<s>, uniform:<lo>,<hi>, ...")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.5)
+    parser.add_argument("--answers", help="JSON object mapping element keys to scripted selectors")
+    parser.add_argument("--seed", type=int, default=458)
+    parser.add_argument("--output")
+    args = parser.parse_args(argv)
+
+    suite_config = ConfigLoader.load(args.config)
+    element_keys = None if args.elements == "all" else [key.strip() for key in args.elements.split(",") if key.strip()]
+    with MockLLMServer(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        answers=json.loads(args.answers) if args.answers else None,
+        seed=args.seed,
+    ) as server:
+        report = run_load(
+            suite_config,
+            build_mock_client(args.provider, server.url),
+            requests=args.requests,
+            concurrency=max(args.concurrency, 1),
+            page_size=args.page_size,
+            element_keys=element_keys,
+            seed=args.seed,
+        )
+        report["server"] = dict(server.stats)
+
+    output = Path(args.output) if args.output else DEFAULT_OUTPUT_DIR / f"load_{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+    latency = report["latency_seconds"]
+    print(
+        f"{report['succeeded']} healed, {report['failed']} failed in {report['duration_seconds']:.2f}s "
+        f"({report['throughput_per_second'] or 0:.1f}/s)"
+    )
+    if report["succeeded"]:
+        print(
+            f"latency p50={latency['p50']:.3f}s p90={latency['p90']:.3f}s "
+            f"p99={latency['p99']:.3f}s max={latency['max']:.3f}s"
+        )
+    print(f"server: {report['server']}")
+    print(f"Results written to {output}")
+    return 0
+
+
+def _percentile(ordered: list[float], percent: float) -> float | None:
+    if not ordered:
+        return None
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
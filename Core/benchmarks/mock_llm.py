@@ -0,0 +1,280 @@
+"""Local stand-in for the LLM provider APIs used by `framework/llm/client.py`.
+
+Speaks the OpenAI chat-completions, Azure deployment chat-completions,
+Anthropic messages and Gemini generateContent formats (buffered and
+server-sent-event streams) with configurable latency, error and 429
+injection. Answers are scripted per element key, or default to the payload's
+best-ranked candidate.
+
+    with MockLLMServer(latency="lognormal:-1.6,0.5", rate_limit_rate=0.05) as server:
+        client = build_mock_client("openai", server.url)
+"""
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep
+from typing import Any
+
+from framework.llm.client import (
+    AnthropicSelectorRepairClient,
+    AzureOpenAISelectorRepairClient,
+    GeminiSelectorRepairClient,
+    HTTPSelectorRepairClient,
+    OpenAISelectorRepairClient,
+)
+from framework.llm.prompts import estimate_tokens
+from framework.llm.resilience import RateLimiter, RetryPolicy
+
+_GEMINI_PATH = re.compile(r"^/v1beta/models/(?P<model>[^/:]+):(?P<method>generateContent|streamGenerateContent)")
+_AZURE_PATH = re.compile(r"^/openai/deployments/(?P<deployment>[^/]+)/chat/completions")
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """Response delay distribution: `fixed:<s>`, `uniform:<lo>,<hi>`, `normal:<mean>,<std>` or
+    `lognormal:<mu>,<sigma>` (of the delay in seconds)."""
+
+    kind: str = "fixed"
+    params: tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> LatencyModel:
+        kind, _, values = spec.partition(":")
+        params = tuple(float(value) for value in values.split(",") if value) or (0.0,)
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec {spec!r}; expected e.g. fixed:0.2 or lognormal:-1.6,0.5")
+        return cls(kind, params)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "normal":
+            return max(rng.gauss(*self.params), 0.0)
+        if self.kind == "lognormal":
+            return math.exp(rng.gauss(*self.params))
+        return self.params[0]
+
+
+class MockLLMServer:
+    """Threaded HTTP server answering selector-repair requests in every provider format."""
+
+    def __init__(
+        self,
+        latency: str | LatencyModel = "fixed:0",
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_seconds: float = 1.0,
+        answers: dict[str, str] | None = None,
+        seed: int = 458,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.latency = LatencyModel.parse(latency) if isinstance(latency, str) else latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.answers = dict(answers or {})
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> MockLLMServer:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> MockLLMServer:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def answer_for(self, user_prompt: str) -> str:
+        """Builds the model answer for a user prompt in the format its mode asks for."""
+
+        try:
+            payload = json.loads(user_prompt)
+        except json.JSONDecodeError:
+            return "body"
+        if payload.get("mode") == "batch_repair":
+            elements = payload.get("elements") or payload.get("failed_elements") or []
+            return json.dumps({_element_key(element): self._selector_for(element) for element in elements})
+        selector = self._selector_for(payload)
+        if payload.get("response_format") == "ranked":
+            return json.dumps([{"selector": selector, "confidence": 0.9}])
+        return selector
+
+    def _selector_for(self, payload: dict[str, Any]) -> str:
+        key = _element_key(payload)
+        if key in self.answers:
+            return self.answers[key]
+        candidates = payload.get("candidates") or payload.get("top_ranked_candidates")
+        if isinstance(candidates, dict) and candidates.get("rows"):
+            return candidates["rows"][0][0]
+        if isinstance(candidates, list) and candidates:
+            return candidates[0].get("selector_hint", "body")
+        return "body"
+
+    def _draw(self) -> tuple[float, str]:
+        with self._lock:
+            delay = self.latency.sample(self._rng)
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return delay, "rate_limited"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay, "error"
+        return delay, "ok"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                path = self.path.split("?", 1)[0]
+                gemini = _GEMINI_PATH.match(path)
+                if gemini:
+                    provider = "gemini"
+                    system = "".join(part.get("text", "") for part in body["system_instruction"]["parts"])
+                    prompt = "".join(part.get("text", "") for part in body["contents"][0]["parts"])
+                    streaming = gemini.group("method") == "streamGenerateContent"
+                elif path == "/v1/messages":
+                    provider = "anthropic"
+                    system, prompt = body.get("system", ""), body["messages"][0]["content"]
+                    streaming = bool(body.get("stream"))
+                elif path == "/v1/chat/completions" or _AZURE_PATH.match(path):
+                    provider = "openai" if path == "/v1/chat/completions" else "azure_openai"
+                    system, prompt = body["messages"][0]["content"], body["messages"][1]["content"]
+                    streaming = bool(body.get("stream"))
+                else:
+                    self._send_json(404, {"error": f"unknown path {path}"})
+                    return
+
+                server._count(f"requests:{provider}")
+                delay, outcome = server._draw()
+                sleep(delay)
+                if outcome == "rate_limited":
+                    server._count("injected:429")
+                    self._send_json(429, {"error": "rate limited"}, {"Retry-After": f"{server.retry_after_seconds:g}"})
+                    return
+                if outcome == "error":
+                    server._count("injected:500")
+                    self._send_json(500, {"error": "injected failure"})
+                    return
+
+                answer = server.answer_for(prompt)
+                usage = (estimate_tokens(system) + estimate_tokens(prompt), estimate_tokens(answer))
+                if streaming:
+                    self._send_events(_stream_events(provider, answer))
+                else:
+                    self._send_json(200, _response_body(provider, answer, usage))
+                server._count("responses:200")
+
+            def _send_json(self, status: int, body: dict[str, Any], headers: dict[str, str] | None = None):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_events(self, events: list[dict[str, Any]]):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for event in events:
+                        chunk = f"data: {json.dumps(event)}\n\n".encode("utf-8")
+                        self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                except OSError:
+                    # The client closed the stream after the first line.
+                    self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def build_mock_client(provider: str, base_url: str, model: str = "mock-model") -> HTTPSelectorRepairClient:
+    """A provider client pointed at the mock server, with that provider's retry policy and rate limiter."""
+
+    if provider == "openai":
+        client = OpenAISelectorRepairClient("mock-key", model)
+        client.endpoint = f"{base_url}/v1/chat/completions"
+    elif provider == "anthropic":
+        client = AnthropicSelectorRepairClient("mock-key", model)
+        client.endpoint = f"{base_url}/v1/messages"
+    elif provider == "gemini":
+        client = GeminiSelectorRepairClient("mock-key", model)
+        client.endpoint_template = f"{base_url}/v1beta/models/{{model}}:generateContent"
+    elif provider in ("azure_openai", "azure"):
+        client = AzureOpenAISelectorRepairClient("mock-key", base_url, model)
+    else:
+        raise ValueError(f"The mock server does not emulate provider {provider!r}")
+    client.retry_policy = RetryPolicy.for_provider(client.provider_name)
+    client.rate_limiter = RateLimiter.for_provider(client.provider_name)
+    return client
+
+
+def _element_key(payload: dict[str, Any]) -> str:
+    return payload.get("key") or payload.get("failed_element_key") or ""
+
+
+def _response_body(provider: str, answer: str, usage: tuple[int, int]) -> dict[str, Any]:
+    prompt_tokens, completion_tokens = usage
+    if provider == "anthropic":
+        return {
+            "content": [{"type": "text", "text": answer}],
+            "usage": {"input_tokens": prompt_tokens, "output_tokens": completion_tokens},
+        }
+    if provider == "gemini":
+        return {
+            "candidates": [{"content": {"parts": [{"text": answer}]}}],
+            "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": completion_tokens},
+        }
+    return {
+        "choices": [{"message": {"role": "assistant", "content": answer}}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens},
+    }
+
+
+def _stream_events(provider: str, answer: str) -> list[dict[str, Any]]:
+    pieces = [answer[index : index + 8] for index in range(0, len(answer), 8)] + ["\n"]
+    if provider == "anthropic":
+        return [{"type": "message_start"}] + [
+            {"type": "content_block_delta", "delta": {"type": "text_delta", "text": piece}} for piece in pieces
+        ]
+    if provider == "gemini":
+        return [{"candidates": [{"content": {"parts": [{"text": piece}]}}]} for piece in pieces]
+    return [{"choices": [{"delta": {"content": piece}}]} for piece in pieces]
@@ -0,0 +1,251 @@
+"""Throughput, allocation and ranking-accuracy benchmarks for candidate scoring.
+
+Run from `Core/`:
+
+    python -m benchmarks.scoring --sizes 50,1000,10000,100000 --drifts 0,0.25,0.5
+    python -m benchmarks.scoring --baseline artifacts/benchmarks/previous.json
+
+Scoring, snippet building and the Python half of candidate extraction run against
+synthetic data and need no browser. Pass `--browser chrome` to also time the
+in-page `COLLECT_CANDIDATES_SCRIPT` against the rendered synthetic page.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable
+
+from benchmarks.synthetic import RecordedDriver, raw_candidate_payload, synthetic_candidates, synthetic_page
+from framework.config.loader import ConfigLoader
+from framework.config.schema import ElementDefinition, TestSuiteConfig
+from framework.utils.dom_extract import build_dom_snippet, extract_candidate_elements
+from framework.utils.scoring import score_candidates
+
+CORE_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CONFIG = CORE_ROOT / "config" / "test_suite.json"
+DEFAULT_OUTPUT_DIR = CORE_ROOT / "artifacts" / "benchmarks"
+DEFAULT_SIZES = (50, 1_000, 10_000, 100_000)
+DEFAULT_DRIFTS = (0.0, 0.25, 0.5)
+TOP_K = (1, 3, 5)
+
+
+def run_benchmarks(
+    suite_config: TestSuiteConfig,
+    *,
+    sizes=DEFAULT_SIZES,
+    drifts=DEFAULT_DRIFTS,
+    trials: int = 3,
+    seed: int = 458,
+    element_keys: list[str] | None = None,
+    driver=None,
+) -> dict[str, Any]:
+    keys = element_keys or suite_config.element_keys()
+    results: list[dict[str, Any]] = []
+    for key in keys:
+        element_definition = suite_config.get_element(key)
+        for size in sizes:
+            for drift in drifts:
+                rng = random.Random(f"{seed}:{key}:{size}:{drift}")
+                results.append(bench_scoring(element_definition, size, drift, trials, rng))
+            rng = random.Random(f"{seed}:{key}:{size}:io")
+            candidates, _ = synthetic_candidates(element_definition, size, 0.25, rng)
+            page_source = synthetic_page(candidates)
+            results.append(bench_extraction(key, candidates, trials))
+            results.append(bench_dom_snippet(key, page_source, candidates, trials))
+            if driver is not None:
+                results.append(bench_browser_extraction(driver, key, len(candidates), page_source, trials))
+    return {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": seed,
+            "trials": trials,
+        },
+        "results": results,
+    }
+
+
+def bench_scoring(
+    element_definition: ElementDefinition,
+    size: int,
+    drift: float,
+    trials: int,
+    rng: random.Random,
+) -> dict[str, Any]:
+    timings: list[float] = []
+    ranks: list[int] = []
+    peak_bytes = 0
+    for trial in range(trials):
+        candidates, target_index = synthetic_candidates(element_definition, size, drift, rng)
+        target = candidates[target_index]
+        if trial == 0:
+            peak_bytes = _peak_allocation(lambda: score_candidates(element_definition, list(candidates)))
+        started = perf_counter()
+        scored = score_candidates(element_definition, candidates)
+        timings.append(perf_counter() - started)
+        ranks.append(next(index for index, item in enumerate(scored) if item is target) + 1)
+    return {
+        **_timing_summary("score_candidates", element_definition.key, size, timings, peak_bytes),
+        "drift": drift,
+        "top_k_accuracy": {str(k): sum(rank <= k for rank in ranks) / len(ranks) for k in TOP_K},
+        "mean_target_rank": statistics.fmean(ranks),
+    }
+
+
+def bench_extraction(element_key: str, candidates, trials: int) -> dict[str, Any]:
+    driver = RecordedDriver(raw_candidate_payload(candidates))
+    peak_bytes = _peak_allocation(lambda: extract_candidate_elements(driver))
+    timings = _time_calls(lambda: extract_candidate_elements(driver), trials)
+    return _timing_summary("extract_candidate_elements", element_key, len(candidates), timings, peak_bytes)
+
+
+def bench_dom_snippet(element_key: str, page_source: str, candidates, trials: int) -> dict[str, Any]:
+    top_candidates = list(candidates[:5])
+    peak_bytes = _peak_allocation(lambda: build_dom_snippet(page_source, top_candidates))
+    timings = _time_calls(lambda: build_dom_snippet(page_source, top_candidates), trials)
+    result = _timing_summary("build_dom_snippet", element_key, len(candidates), timings, peak_bytes)
+    result["page_source_bytes"] = len(page_source.encode("utf-8"))
+    return result
+
+
+def bench_browser_extraction(driver, element_key: str, size: int, page_source: str, trials: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        page_path = Path(directory) / "synthetic.html"
+        page_path.write_text(page_source, encoding="utf-8")
+        driver.get(page_path.as_uri())
+        timings = _time_calls(lambda: extract_candidate_elements(driver), trials)
+    result = _timing_summary("extract_candidate_elements[browser]", element_key, size, timings, 0)
+    result["browser"] = driver.capabilities.get("browserName", "unknown")
+    return result
+
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any], tolerance: float = 0.2) -> list[str]:
+    """Lists regressions of `current` against `baseline` beyond the relative tolerance."""
+
+    previous = {_result_key(item): item for item in baseline.get("results", [])}
+    regressions: list[str] = []
+    for item in current.get("results", []):
+        reference = previous.get(_result_key(item))
+        if reference is None:
+            continue
+        label = "/".join(str(part) for part in _result_key(item))
+        if item["median_seconds"] > reference["median_seconds"] * (1 + tolerance):
+            regressions.append(
+                f"{label}: median {item['median_seconds']:.6f}s vs {reference['median_seconds']:.6f}s"
+            )
+        if reference["peak_alloc_bytes"] and item["peak_alloc_bytes"] > reference["peak_alloc_bytes"] * (1 + tolerance):
+            regressions.append(
+                f"{label}: peak allocation {item['peak_alloc_bytes']} vs {reference['peak_alloc_bytes']} bytes"
+            )
+        for k, accuracy in item.get("top_k_accuracy", {}).items():
+            expected = reference.get("top_k_accuracy", {}).get(k)
+            if expected is not None and accuracy < expected - 1e-9:
+                regressions.append(f"{label}: top-{k} accuracy {accuracy:.3f} vs {expected:.3f}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG))
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES))
+    parser.add_argument("--drifts", default=",".join(str(drift) for drift in DEFAULT_DRIFTS))
+    parser.add_argument("--elements", default="login_button", help="comma-separated element keys, or 'all'")
+    parser.add_argument("--trials", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=458)
+    parser.add_argument("--browser", choices=("chrome", "firefox"))
+    parser.add_argument("--output")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    suite_config = ConfigLoader.load(args.config)
+    element_keys = None if args.elements == "all" else [key.strip() for key in args.elements.split(",") if key.strip()]
+    driver = None
+    if args.browser:
+        from framework.core.browser import BrowserSession
+
+        driver = BrowserSession(suite_config.environment).start(args.browser)
+    try:
+        report = run_benchmarks(
+            suite_config,
+            sizes=[int(size) for size in args.sizes.split(",")],
+            drifts=[float(drift) for drift in args.drifts.split(",")],
+            trials=max(args.trials, 1),
+            seed=args.seed,
+            element_keys=element_keys,
+            driver=driver,
+        )
+    finally:
+        if driver is not None:
+            driver.quit()
+
+    output = Path(args.output) if args.output else DEFAULT_OUTPUT_DIR / f"scoring_{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+    for item in report["results"]:
+        accuracy = item.get("top_k_accuracy", {}).get("1")
+        suffix = f" top1={accuracy:.2f}" if accuracy is not None else ""
+        print(
+            f"{item['benchmark']:<38} {item['element_key']:<22} n={item['size']:<7} "
+            f"drift={item.get('drift', '-')!s:<5} median={item['median_seconds']:.6f}s "
+            f"peak={item['peak_alloc_bytes']}B{suffix}"
+        )
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_results(baseline, report, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+def _time_calls(call: Callable[[], Any], trials: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(trials):
+        started = perf_counter()
+        call()
+        timings.append(perf_counter() - started)
+    return timings
+
+
+def _peak_allocation(call: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _timing_summary(name: str, element_key: str, size: int, timings: list[float], peak_bytes: int) -> dict[str, Any]:
+    median = statistics.median(timings)
+    return {
+        "benchmark": name,
+        "element_key": element_key,
+        "size": size,
+        "median_seconds": median,
+        "min_seconds": min(timings),
+        "throughput_per_second": size / median if median else None,
+        "peak_alloc_bytes": peak_bytes,
+    }
+
+
+def _result_key(item: dict[str, Any]) -> tuple:
+    return (item["benchmark"], item["element_key"], item["size"], item.get("drift"))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
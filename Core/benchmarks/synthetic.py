@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import html
+import random
+from typing import Any
+
+from framework.config.schema import ElementDefinition
+from framework.core.metadata import CandidateElement
+from framework.utils.dom_extract import COLLECT_CANDIDATES_SCRIPT, COUNT_SELECTOR_MATCHES_SCRIPT
+
+_TAGS = ("input", "button", "a", "select", "textarea", "div", "span")
+_PARENT_TAGS = ("form", "div", "section", "nav", "li", "label")
+_WORDS = (
+    "account", "continue", "email", "forgot", "help", "login", "menu", "next",
+    "password", "phone", "privacy", "register", "remember", "reset", "search",
+    "settings", "sign", "submit", "terms", "username", "verify", "welcome",
+)
+_COLORS = (
+    "rgb(0, 0, 0)", "rgb(17, 24, 39)", "rgb(55, 65, 81)", "rgb(107, 114, 128)",
+    "rgb(255, 255, 255)", "rgb(79, 70, 229)", "rgb(220, 38, 38)",
+)
+_CLASSES = ("btn", "btn-primary", "btn-login", "form-control", "input", "link", "toggle-btn", "active", "muted")
+
+
+def synthetic_candidates(
+    element_definition: ElementDefinition,
+    count: int,
+    drift: float,
+    rng: random.Random,
+) -> tuple[list[CandidateElement], int]:
+    """Builds `count` candidates with one drifted copy of the element's historical metadata.
+
+    Returns the candidates and the index of the drifted target. A few decoys share
+    the target's tag and parent so ranking is not trivially separable.
+    """
+
+    count = max(count, 1)
+    target = drifted_candidate(element_definition, drift, rng)
+    candidates = [_distractor(element_definition, rng, decoy=index % 10 == 0) for index in range(count - 1)]
+    target_index = rng.randrange(count)
+    candidates.insert(target_index, target)
+    return candidates, target_index
+
+
+def drifted_candidate(element_definition: ElementDefinition, drift: float, rng: random.Random) -> CandidateElement:
+    metadata = element_definition.historical_metadata
+    drift = min(max(drift, 0.0), 1.0)
+    attributes = {
+        name: _mutate_text(value, drift, rng)
+        for name, value in metadata.attributes.items()
+        if rng.random() >= drift * 0.5
+    }
+    if rng.random() < drift:
+        attributes["id"] = f"el-{rng.randrange(1_000_000)}"
+    size = metadata.size.model_dump() if metadata.size else {"width": 120.0, "height": 40.0}
+    shift = drift * 500
+    return CandidateElement(
+        selector_hint=f"#target-{element_definition.key}",
+        tag=metadata.tag or "div",
+        text=_mutate_text(metadata.text or "", drift, rng),
+        attributes=attributes,
+        parent_tag=rng.choice(_PARENT_TAGS) if rng.random() < drift * 0.5 else metadata.parent_tag,
+        rect={
+            "x": metadata.location.x + rng.uniform(-shift, shift),
+            "y": metadata.location.y + rng.uniform(-shift, shift),
+            **size,
+        },
+        styles={
+            "color": rng.choice(_COLORS) if rng.random() < drift else metadata.color,
+            "backgroundColor": metadata.background_color or "",
+            "display": "block",
+            "visibility": "visible",
+            "zIndex": "auto",
+        },
+    )
+
+
+def synthetic_page(candidates: list[CandidateElement]) -> str:
+    """Renders candidates as a flat HTML document, one parent wrapper per candidate."""
+
+    parts = ["<!DOCTYPE html><html><head><title>synthetic</title></head><body>"]
+    for candidate in candidates:
+        attributes = "".join(
+            f' {html.escape(name)}="{html.escape(value, quote=True)}"'
+            for name, value in candidate.attributes.items()
+        )
+        text = html.escape(candidate.text)
+        if candidate.tag in ("input", "textarea", "select"):
+            element = f"<{candidate.tag}{attributes}>"
+            if candidate.tag != "input":
+                element += f"{text}</{candidate.tag}>"
+        else:
+            element = f"<{candidate.tag}{attributes}>{text}</{candidate.tag}>"
+        parts.append(f"<{candidate.parent_tag}>{element}</{candidate.parent_tag}>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def raw_candidate_payload(candidates: list[CandidateElement]) -> list[dict[str, Any]]:
+    """Mirrors what `COLLECT_CANDIDATES_SCRIPT` returns from the browser."""
+
+    return [
+        {
+            "selector_hint": candidate.selector_hint,
+            "tag": candidate.tag,
+            "text": candidate.text,
+            "attributes": dict(candidate.attributes),
+            "parent_tag": candidate.parent_tag,
+            "rect": dict(candidate.rect),
+            "styles": dict(candidate.styles),
+        }
+        for candidate in candidates
+    ]
+
+
+class RecordedDriver:
+    """Minimal driver stand-in that replays a captured candidate payload.
+
+    Every selector is reported to match exactly one element, so heals driven
+    through it always validate.
+    """
+
+    def __init__(self, raw_candidates: list[dict[str, Any]], page_source: str = "") -> None:
+        self.raw_candidates = raw_candidates
+        self.page_source = page_source
+
+    def execute_script(self, script: str, *args):
+        if script == COLLECT_CANDIDATES_SCRIPT:
+            return self.raw_candidates
+        if script == COUNT_SELECTOR_MATCHES_SCRIPT:
+            return [1 for _ in args[0]]
+        return []
+
+    def find_elements(self, by, selector: str):
+        return [object()]
+
+    def get_screenshot_as_png(self) -> bytes:
+        return b"\x89PNG\r\n"
+
+
+def _distractor(element_definition: ElementDefinition, rng: random.Random, *, decoy: bool) -> CandidateElement:
+    metadata = element_definition.historical_metadata
+    tag = (metadata.tag or "div") if decoy else rng.choice(_TAGS)
+    attributes: dict[str, str] = {"class": " ".join(rng.sample(_CLASSES, rng.randint(1, 3)))}
+    if rng.random() < 0.5:
+        attributes["name"] = rng.choice(_WORDS)
+    if tag == "input":
+        attributes["type"] = rng.choice(("text", "email", "password", "tel", "checkbox"))
+    identifier = rng.randrange(1_000_000)
+    return CandidateElement(
+        selector_hint=f"#node-{identifier}",
+        tag=tag,
+        text=" ".join(rng.choice(_WORDS) for _ in range(rng.randint(0, 3))).title(),
+        attributes=attributes,
+        parent_tag=metadata.parent_tag if decoy else rng.choice(_PARENT_TAGS),
+        rect={
+            "x": rng.uniform(0, 1440),
+            "y": rng.uniform(0, 2000),
+            "width": rng.uniform(20, 400),
+            "height": rng.uniform(16, 60),
+        },
+        styles={
+            "color": rng.choice(_COLORS),
+            "backgroundColor": rng.choice(_COLORS),
+            "display": "block",
+            "visibility": "visible",
+            "zIndex": "auto",
+        },
+    )
+
+
+def _mutate_text(value: str, drift: float, rng: random.Random) -> str:
+    if not value or drift <= 0:
+        return value
+    characters = list(value)
+    for index in range(len(characters)):
+        if rng.random() < drift * 0.5:
+            characters[index] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+    return "".join(characters)
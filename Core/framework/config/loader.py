@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import pickle
 import re
+import stat
+import threading
 from pathlib import Path
+from typing import Any
 
+import pydantic
+
+from framework.config import schema
 from framework.config.schema import TestSuiteConfig
+from framework.config.shards import ElementShards
+
+# Bump when the cache entry layout changes.
+CACHE_FORMAT = 3
+_ENV_PLACEHOLDER = re.compile(r'\$\{([^}]+)\}')
 
 
 def _load_dotenv(start_path: Path) -> None:
@@ -29,10 +42,35 @@ def _load_dotenv(start_path: Path) -> None:
             return
 
 
+def _placeholder_paths(obj, path: tuple = ()) -> list[tuple[tuple, str]]:
+    """Lists (path, template) for every string value holding a ${VAR} placeholder."""
+    if isinstance(obj, str):
+        return [(path, obj)] if _ENV_PLACEHOLDER.search(obj) else []
+    if isinstance(obj, dict):
+        return [found for key, value in obj.items() for found in _placeholder_paths(value, (*path, key))]
+    if isinstance(obj, list):
+        return [found for index, item in enumerate(obj) for found in _placeholder_paths(item, (*path, index))]
+    return []
+
+
+def _get_path(obj, path: tuple):
+    for step in path:
+        obj = obj[step] if isinstance(obj, (dict, list)) else getattr(obj, step)
+    return obj
+
+
+def _set_path(obj, path: tuple, value) -> None:
+    parent = _get_path(obj, path[:-1])
+    if isinstance(parent, (dict, list)):
+        parent[path[-1]] = value
+    else:
+        setattr(parent, path[-1], value)
+
+
 def _expand_env_vars(obj):
     """Recursively expand ${VAR} placeholders in all string values."""
     if isinstance(obj, str):
-        return re.sub(r'\$\{([^}]+)\}', lambda m: os.environ.get(m.group(1), ""), obj)
+        return _ENV_PLACEHOLDER.sub(lambda m: os.environ.get(m.group(1), ""), obj)
     if isinstance(obj, dict):
         return {k: _expand_env_vars(v) for k, v in obj.items()}
     if isinstance(obj, list):
@@ -40,14 +78,146 @@ def _expand_env_vars(obj):
     return obj
 
 
+def _stamp(path: Path | None) -> tuple[str, int, int] | None:
+    if path is None:
+        return None
+    stat = path.stat()
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+def _stamp_or_none(path: Path) -> tuple[str, int, int] | None:
+    try:
+        return _stamp(path)
+    except OSError:
+        return None
+
+
 class ConfigLoader:
-    """Loads and validates the JSON test suite configuration."""
+    """Loads and validates the JSON test suite configuration.
 
-    @staticmethod
-    def load(path: str | Path) -> TestSuiteConfig:
+    Validated configs are cached as pickles, in memory and under
+    CONFIG_CACHE_DIR (default `~/.cache/cs458-config-cache`), keyed by the
+    config file, the schema module and any element shard manifest (path,
+    mtime, size). Values filled in from ${VAR}s are never cached: the entry
+    keeps the placeholders and every load expands them from the current
+    environment, so secrets stay out of the cache and env changes need no
+    invalidation. Cache files are only unpickled when this user owns them and
+    nobody else can write or read them. Every load returns a fresh copy, so
+    callers may mutate it.
+    """
+
+    _memory: dict[str, dict[str, Any]] = {}
+    _memory_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | Path, cache_dir: str | Path | None = None) -> TestSuiteConfig:
         config_path = Path(path).resolve()
         _load_dotenv(config_path.parent)
+        if os.getenv("CONFIG_CACHE", "true").lower() in ("0", "false", "no", "off"):
+            return cls._compile(config_path)[0]
+
+        sources = (CACHE_FORMAT, pydantic.VERSION, _stamp(config_path), _stamp(Path(schema.__file__)))
+        cache_path = cls._cache_path(config_path, cache_dir)
+        entry = cls._cached_entry(str(config_path), cache_path, sources)
+        if entry is not None and all(_stamp_or_none(Path(name)) == stamp for name, stamp in entry["files"]):
+            config = pickle.loads(entry["model"])
+            for placeholder_path, template in entry["placeholders"]:
+                _set_path(config, placeholder_path, _expand_env_vars(template))
+            return config
+
+        config, placeholders = cls._compile(config_path)
+        template_config = config.model_copy(deep=True)
+        kept = []
+        for placeholder_path, template in placeholders:
+            try:
+                value = _get_path(config, placeholder_path)
+            except (AttributeError, KeyError, IndexError):
+                # The model ignored this key, so there is nothing to re-expand on a hit.
+                continue
+            if value != _expand_env_vars(template):
+                # A validator reshaped the expanded value; it cannot be re-expanded on a hit.
+                return config
+            _set_path(template_config, placeholder_path, template)
+            kept.append((placeholder_path, template))
+        entry = {
+            "sources": sources,
+            "placeholders": kept,
+            # Shard manifests are read at load time; the shards themselves are read on first use.
+            "files": [(str(path), _stamp(path)) for path in [cls._manifest_path(config_path, config)] if path],
+            "model": pickle.dumps(template_config, protocol=pickle.HIGHEST_PROTOCOL),
+        }
+        with cls._memory_lock:
+            cls._memory[str(config_path)] = entry
+        cls._write_entry(cache_path, entry)
+        return config
+
+    @staticmethod
+    def _compile(config_path: Path) -> tuple[TestSuiteConfig, list[tuple[tuple, str]]]:
         with config_path.open("r", encoding="utf-8") as handle:
             payload = json.load(handle)
+        placeholders = _placeholder_paths(payload)
         payload = _expand_env_vars(payload)
-        return TestSuiteConfig.model_validate(payload)
+        config = TestSuiteConfig.model_validate(payload)
+        manifest_path = ConfigLoader._manifest_path(config_path, config)
+        if manifest_path is not None:
+            config.attach_element_shards(ElementShards(manifest_path, transform=_expand_env_vars))
+        return config, placeholders
+
+    @staticmethod
+    def _manifest_path(config_path: Path, config: TestSuiteConfig) -> Path | None:
+        if not config.element_manifest:
+            return None
+        return (config_path.parent / config.element_manifest).resolve()
+
+    @staticmethod
+    def _cache_path(config_path: Path, cache_dir: str | Path | None) -> Path:
+        default_root = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "cs458-config-cache"
+        root = Path(cache_dir or os.getenv("CONFIG_CACHE_DIR") or default_root)
+        digest = hashlib.sha256(str(config_path).encode("utf-8")).hexdigest()[:24]
+        return root / f"{config_path.stem}-{digest}.pickle"
+
+    @classmethod
+    def _cached_entry(cls, key: str, cache_path: Path, sources: tuple) -> dict[str, Any] | None:
+        with cls._memory_lock:
+            entry = cls._memory.get(key)
+        if entry is not None and entry["sources"] == sources:
+            return entry
+        entry = cls._read_entry(cache_path)
+        if not isinstance(entry, dict) or entry.get("sources") != sources:
+            return None
+        with cls._memory_lock:
+            cls._memory[key] = entry
+        return entry
+
+    @staticmethod
+    def _read_entry(cache_path: Path) -> dict[str, Any] | None:
+        try:
+            if not _private(cache_path.parent.stat()):
+                return None
+            with cache_path.open("rb") as handle:
+                # Checked on the open file, so it cannot be swapped after the check.
+                if not stat.S_ISREG(os.fstat(handle.fileno()).st_mode) or not _private(os.fstat(handle.fileno())):
+                    return None
+                return pickle.loads(handle.read())
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    @staticmethod
+    def _write_entry(cache_path: Path, entry: dict[str, Any]) -> None:
+        try:
+            cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(descriptor, "wb") as handle:
+                handle.write(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+            os.replace(temp_path, cache_path)
+        except OSError:
+            # The cache is an optimisation; a read-only location must not break loading.
+            pass
+
+
+def _private(status: os.stat_result) -> bool:
+    """True when this user owns the file or directory and no one else can access it."""
+    if hasattr(os, "getuid") and status.st_uid != os.getuid():
+        return False
+    return not status.st_mode & 0o077
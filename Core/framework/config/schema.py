@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 
 class Location(BaseModel):
@@ -58,6 +58,7 @@ class CredentialSet(BaseModel):
 
 class ElementDefinition(BaseModel):
     key: str
+    page: str | None = None
     intended_role: str
     selector_type: str
     selector: str
@@ -76,11 +77,37 @@ class ElementDefinition(BaseModel):
 class TestSuiteConfig(BaseModel):
     environment: EnvironmentConfig
     credentials: CredentialSet
-    elements: list[ElementDefinition]
+    elements: list[ElementDefinition] = Field(default_factory=list)
+    # Shard manifest (relative to the config file) for elements loaded on first use.
+    element_manifest: str | None = None
     scenarios: dict[str, dict[str, Any]] = Field(default_factory=dict)
 
+    # framework.config.shards.ElementShards, attached by ConfigLoader.
+    _element_shards: Any = PrivateAttr(default=None)
+
+    def attach_element_shards(self, shards: Any) -> None:
+        self._element_shards = shards
+
     def get_element(self, key: str) -> ElementDefinition:
         for element in self.elements:
             if element.key == key:
                 return element
+        if self._element_shards is not None:
+            element = self._element_shards.get(key)
+            if element is not None:
+                return element
         raise KeyError(f"Unknown element key: {key}")
+
+    def elements_for_page(self, page: str) -> list[ElementDefinition]:
+        elements = [element for element in self.elements if element.page == page]
+        if self._element_shards is not None:
+            elements.extend(self._element_shards.for_page(page))
+        return elements
+
+    def element_keys(self) -> list[str]:
+        """Every element key, inline and sharded, without loading any shard."""
+
+        keys = [element.key for element in self.elements]
+        if self._element_shards is not None:
+            keys.extend(key for key in self._element_shards.keys() if key not in keys)
+        return keys
@@ -0,0 +1,131 @@
+"""Per-page element shard files for suites too large to validate up front.
+
+A suite config can replace (or extend) its inline `elements` with
+
+    "element_manifest": "elements/manifest.json"
+
+where the manifest, relative to the config file, lists each page's shard and
+the keys it holds:
+
+    {"pages": {"login": {"shard": "login.json", "keys": ["login_button", ...]}}}
+
+Each shard is a JSON list of element definitions. Only the manifest is read
+at load time; a shard is parsed the first time one of its keys is requested
+and each element is validated on first access. Split an existing suite with
+
+    python -m framework.config.shards config/test_suite.json config/elements
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from framework.config.schema import ElementDefinition
+
+
+class ElementShards:
+    """Lazily parsed and validated element definitions listed in a shard manifest."""
+
+    def __init__(self, manifest_path: str | Path, transform: Callable[[Any], Any] | None = None) -> None:
+        self.manifest_path = Path(manifest_path)
+        self.transform = transform
+        with self.manifest_path.open("r", encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        self._shard_paths: dict[str, Path] = {}
+        self._key_pages: dict[str, str] = {}
+        for page, entry in manifest.get("pages", {}).items():
+            self._shard_paths[page] = self.manifest_path.parent / entry["shard"]
+            for key in entry.get("keys", []):
+                self._key_pages[key] = page
+        self._raw: dict[str, dict[str, dict[str, Any]]] = {}
+        self._elements: dict[str, ElementDefinition] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def keys(self) -> list[str]:
+        return list(self._key_pages)
+
+    def get(self, key: str) -> ElementDefinition | None:
+        page = self._key_pages.get(key)
+        if page is None:
+            return None
+        with self._lock:
+            element = self._elements.get(key)
+            if element is None:
+                raw = self._shard(page).get(key)
+                if raw is None:
+                    raise KeyError(f"Element key {key} is listed for page {page} but missing from its shard")
+                element = self._elements[key] = ElementDefinition.model_validate(raw)
+            return element
+
+    def for_page(self, page: str) -> list[ElementDefinition]:
+        return [self.get(key) for key, key_page in self._key_pages.items() if key_page == page]
+
+    @property
+    def loaded_pages(self) -> list[str]:
+        return list(self._raw)
+
+    def _shard(self, page: str) -> dict[str, dict[str, Any]]:
+        shard = self._raw.get(page)
+        if shard is None:
+            with self._shard_paths[page].open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+            if self.transform is not None:
+                payload = self.transform(payload)
+            shard = {}
+            for raw in payload:
+                raw.setdefault("page", page)
+                shard[raw["key"]] = raw
+            self._raw[page] = shard
+        return shard
+
+
+def split_elements(config_path: str | Path, output_dir: str | Path) -> Path:
+    """Moves a config's inline elements into per-page shards and points the config at the new manifest."""
+
+    config_path = Path(config_path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with config_path.open("r", encoding="utf-8") as handle:
+        config = json.load(handle)
+
+    pages: dict[str, list[dict[str, Any]]] = {}
+    for element in config.pop("elements", []):
+        pages.setdefault(element.get("page") or "default", []).append(element)
+    manifest: dict[str, Any] = {"pages": {}}
+    for page, elements in sorted(pages.items()):
+        shard_name = f"{page}.json"
+        (output_dir / shard_name).write_text(json.dumps(elements, indent=2), encoding="utf-8")
+        manifest["pages"][page] = {"shard": shard_name, "keys": [element["key"] for element in elements]}
+    manifest_path = output_dir / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    config["elements"] = []
+    config["element_manifest"] = Path(os.path.relpath(manifest_path, config_path.parent)).as_posix()
+    config_path.write_text(json.dumps(config, indent=2), encoding="utf-8")
+    return manifest_path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("config")
+    parser.add_argument("output_dir")
+    args = parser.parse_args(argv)
+    print(f"Manifest written to {split_elements(args.config, args.output_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
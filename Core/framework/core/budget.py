@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+import threading
+
+from framework.core.exceptions import HealBudgetExceededError
+
+
+class HealBudget:
+    """Run-level cap on wall-clock time spent waiting for selector repairs.
+
+    A budget of zero or less is unlimited. Once the spent time reaches the
+    budget, further heals fail fast instead of waiting on the provider.
+    """
+
+    def __init__(self, total_seconds: float = 0.0) -> None:
+        self.total_seconds = total_seconds
+        self.spent_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "HealBudget":
+        return cls(float(os.getenv("HEAL_BUDGET_SECONDS", "0")))
+
+    @property
+    def remaining_seconds(self) -> float | None:
+        if self.total_seconds <= 0:
+            return None
+        with self._lock:
+            return max(self.total_seconds - self.spent_seconds, 0.0)
+
+    def ensure_available(self) -> None:
+        remaining = self.remaining_seconds
+        if remaining is not None and remaining <= 0:
+            raise HealBudgetExceededError(
+                f"Heal budget of {self.total_seconds:.1f}s is spent ({self.spent_seconds:.1f}s used)"
+            )
+
+    def charge(self, seconds: float) -> None:
+        with self._lock:
+            self.spent_seconds += seconds
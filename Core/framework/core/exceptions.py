@@ -4,3 +4,27 @@ class HealingError(RuntimeError):
 
 class SelectorValidationError(HealingError):
     """Raised when an LLM returns an unusable selector."""
+
+
+class CircuitOpenError(HealingError):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+
+class HealBudgetExceededError(HealingError):
+    """Raised when the run-level healing time budget has been spent."""
+
+
+class LLMRequestError(RuntimeError):
+    """Raised when an LLM HTTP request fails; carries what retry policies need."""
+
+    def __init__(
+        self,
+        message: str,
+        status: int | None = None,
+        retry_after: float | None = None,
+        timed_out: bool = False,
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.timed_out = timed_out
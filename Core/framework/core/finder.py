@@ -11,7 +11,9 @@ from selenium.common.exceptions import (
 from selenium.webdriver.common.by import By
 
 from framework.config.schema import TestSuiteConfig
+from framework.core.exceptions import CircuitOpenError, HealBudgetExceededError, HealingError
 from framework.llm.parser import infer_selector_type
+from framework.utils.dom_extract import count_selector_matches
 
 
 class SafeFinder:
@@ -24,13 +26,19 @@ class SafeFinder:
         dom_monitor,
         healer,
         audit_logger,
+        batch_heal: bool = True,
     ) -> None:
         self.driver = driver
         self.suite_config = suite_config
         self.dom_monitor = dom_monitor
         self.healer = healer
         self.audit_logger = audit_logger
-        self.selector_overrides = audit_logger.read_overrides()
+        # Shared registry: overrides healed by any runtime, in this process or
+        # another, show up here without re-reading files.
+        self.selector_overrides = audit_logger.overrides
+        # Heal every broken element of the same page in one LLM call when a
+        # redesign breaks several of them at once.
+        self.batch_heal = batch_heal
 
     def find(self, element_key: str, timeout: int | None = None):
         self.dom_monitor.install(self.driver)
@@ -40,8 +48,7 @@ class SafeFinder:
         try:
             return self._wait_for_first_match(selectors, duration)
         except (NoSuchElementException, TimeoutException, StaleElementReferenceException) as exc:
-            healed_selector = self.healer.recover(self.driver, element_key, exc, mode="target_repair")
-            self.selector_overrides[element_key] = healed_selector
+            healed_selector = self._heal(element_key, exc)
             return self.find_by_selector(healed_selector, timeout=duration)
 
     def find_by_selector(self, selector: str, timeout: int | None = None):
@@ -50,6 +57,57 @@ class SafeFinder:
         duration = timeout or self.suite_config.environment.default_timeout_seconds
         return self._wait_for_first_match([(by, selector)], duration)
 
+    def _heal(self, element_key: str, failure: Exception) -> str:
+        """Heals the element, together with its broken page siblings when there are any.
+
+        The batch is only a shortcut: whether it raises or just leaves this key
+        unhealed, the element gets its own single-key repair. Failures that
+        would stop that repair too, a spent budget or an open circuit, are
+        raised as they are.
+        """
+
+        missing = self._missing_page_siblings(element_key) if self.batch_heal else []
+        if missing:
+            try:
+                healed = self.healer.recover_batch(self.driver, [element_key, *missing], failure)
+            except (HealBudgetExceededError, CircuitOpenError):
+                raise
+            except HealingError:
+                healed = {}
+            if element_key in healed:
+                return healed[element_key]
+        # The healer's audit write registers the override in selector_overrides.
+        return self.healer.recover(self.driver, element_key, failure, mode="target_repair")
+
+    def _missing_page_siblings(self, element_key: str) -> list[str]:
+        """Lists other elements of the same page whose selectors all match nothing right now."""
+
+        page = self.suite_config.get_element(element_key).page
+        if not page:
+            return []
+        sibling_keys = [
+            element.key for element in self.suite_config.elements_for_page(page) if element.key != element_key
+        ]
+        specs_by_key = {
+            key: [
+                (selector, "xpath" if by == By.XPATH else "css")
+                for by, selector in self._selector_specs(key)
+            ]
+            for key in sibling_keys
+        }
+        all_specs = [spec for specs in specs_by_key.values() for spec in specs]
+        counts = count_selector_matches(self.driver, all_specs)
+        if len(counts) != len(all_specs):
+            # Counts that cannot be matched to their selectors say nothing about the siblings.
+            return []
+        missing: list[str] = []
+        offset = 0
+        for key, specs in specs_by_key.items():
+            if not any(counts[offset : offset + len(specs)]):
+                missing.append(key)
+            offset += len(specs)
+        return missing
+
     def _selector_specs(self, element_key: str) -> list[tuple[str, str]]:
         element_definition = self.suite_config.get_element(element_key)
         selectors: list[tuple[str, str]] = []
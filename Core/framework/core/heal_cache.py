@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class HealCache:
+    """Persistent LRU/TTL cache of validated heals keyed by element and page-region fingerprint.
+
+    Entries live in a single JSON file so every run, worker and browser that shares
+    the artifacts directory can reuse them. Writes merge with the current file
+    contents under an exclusive file lock and replace it atomically, so
+    concurrent workers neither see a torn file nor drop each other's entries.
+    Hits only touch the in-memory entry; the touch survives reloads of the
+    file and is merged into it with this worker's next write.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = 512,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock_path = self.path.with_name(f".{self.path.name}.lock")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        # Unwritten hits per key: (last used at, hit count).
+        self._touches: dict[str, tuple[float, int]] = {}
+        self._loaded_stamp: tuple[int, int] | None = None
+
+    @staticmethod
+    def cache_key(element_key: str, fingerprint: str, mode: str = "target_repair") -> str:
+        return f"{mode}:{element_key}:{fingerprint}"
+
+    def get(self, element_key: str, fingerprint: str, mode: str = "target_repair") -> str | None:
+        key = self.cache_key(element_key, fingerprint, mode)
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            now = time.time()
+            if self._expired(entry, now):
+                self._entries.pop(key, None)
+                self._persist(removed={key})
+                return None
+            entry["last_used_at"] = now
+            entry["hits"] = entry.get("hits", 0) + 1
+            self._touches[key] = (now, self._touches.get(key, (0, 0))[1] + 1)
+            return entry["selector"]
+
+    def put(self, element_key: str, fingerprint: str, selector: str, mode: str = "target_repair") -> None:
+        key = self.cache_key(element_key, fingerprint, mode)
+        now = time.time()
+        with self._lock:
+            self._reload_if_changed()
+            self._entries[key] = {
+                "selector": selector,
+                "created_at": now,
+                "last_used_at": now,
+                "hits": 0,
+            }
+            self._persist(updated={key})
+
+    def invalidate(self, element_key: str, fingerprint: str, mode: str = "target_repair") -> None:
+        key = self.cache_key(element_key, fingerprint, mode)
+        with self._lock:
+            self._reload_if_changed()
+            if self._entries.pop(key, None) is not None:
+                self._persist(removed={key})
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._reload_if_changed()
+            return len(self._entries)
+
+    def _expired(self, entry: dict[str, Any], now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry.get("created_at", 0) > self.ttl_seconds
+
+    def _read_file(self) -> dict[str, dict[str, Any]]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _reload_if_changed(self) -> None:
+        try:
+            stamp = self._stamp()
+        except FileNotFoundError:
+            return
+        if stamp != self._loaded_stamp:
+            self._entries = self._read_file()
+            self._apply_touches(self._entries)
+            self._loaded_stamp = stamp
+
+    def _apply_touches(self, entries: dict[str, dict[str, Any]]) -> None:
+        for key, (last_used_at, hits) in self._touches.items():
+            entry = entries.get(key)
+            if entry is not None:
+                entry["last_used_at"] = max(entry.get("last_used_at", 0), last_used_at)
+                entry["hits"] = entry.get("hits", 0) + hits
+
+    def _stamp(self) -> tuple[int, int]:
+        stat = self.path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _persist(self, updated: set[str] = frozenset(), removed: set[str] = frozenset()) -> None:
+        with self._file_lock():
+            merged = self._read_file()
+            for key in updated | removed:
+                self._touches.pop(key, None)
+            for key in removed:
+                merged.pop(key, None)
+            for key, entry in self._entries.items():
+                on_disk = merged.get(key)
+                if key in self._touches and on_disk is not None:
+                    continue
+                if key in updated or on_disk is None or entry.get("last_used_at", 0) >= on_disk.get("last_used_at", 0):
+                    merged[key] = entry
+            # Touched entries keep the file's version, plus this worker's hits.
+            self._apply_touches(merged)
+            self._touches.clear()
+            now = time.time()
+            merged = {key: entry for key, entry in merged.items() if not self._expired(entry, now)}
+            if len(merged) > self.max_entries:
+                newest = sorted(merged.items(), key=lambda item: item[1].get("last_used_at", 0), reverse=True)
+                merged = dict(newest[: self.max_entries])
+
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_text(json.dumps(merged, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(temp_path, self.path)
+            self._entries = merged
+            self._loaded_stamp = self._stamp()
+
+    @contextmanager
+    def _file_lock(self):
+        # Held from reading the file to replacing it, so another process's
+        # merge cannot start from a version this one is about to overwrite.
+        if fcntl is None:
+            yield
+            return
+        with self.lock_path.open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
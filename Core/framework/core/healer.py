@@ -1,16 +1,34 @@
 from __future__ import annotations
+
+import os
+from dataclasses import replace
+from time import monotonic
 from typing import Any
 
 from selenium.common.exceptions import InvalidSelectorException
 from selenium.webdriver.common.by import By
 
 from framework.config.schema import TestSuiteConfig
+from framework.core.budget import HealBudget
 from framework.core.exceptions import HealingError, SelectorValidationError
+from framework.core.heal_cache import HealCache
 from framework.core.metadata import HealAttempt
-from framework.llm.parser import parse_selector_response
-from framework.logging.artifacts import ArtifactManager
+from framework.core.single_flight import SingleFlight
+from framework.llm.parser import (
+    infer_selector_type,
+    parse_batch_selector_response,
+    parse_ranked_selector_response,
+    parse_selector_response,
+)
+from framework.logging.artifacts import ArtifactManager, CapturePolicy
 from framework.logging.audit import HealingAuditLogger
-from framework.utils.dom_extract import build_dom_snippet, extract_candidate_elements
+from framework.utils.dom_extract import (
+    build_dom_snippet,
+    count_selector_matches,
+    extract_candidate_elements,
+    structural_fingerprint,
+    unique_match_owners,
+)
 from framework.utils.scoring import score_candidates
 
 
@@ -24,46 +42,78 @@ class Healer:
         dom_monitor,
         artifact_manager: ArtifactManager,
         audit_logger: HealingAuditLogger,
+        heal_cache: HealCache | None = None,
+        capture_policy: CapturePolicy | None = None,
+        response_format: str | None = None,
+        single_flight: SingleFlight | None = None,
+        heal_budget: HealBudget | None = None,
     ) -> None:
         self.suite_config = suite_config
         self.llm_client = llm_client
         self.dom_monitor = dom_monitor
         self.artifact_manager = artifact_manager
         self.audit_logger = audit_logger
+        self.heal_cache = heal_cache
+        self.capture_policy = capture_policy
+        # "single" asks for one selector; "ranked" asks for several scored
+        # alternatives that are validated together in one browser round trip.
+        self.response_format = (response_format or os.getenv("HEAL_RESPONSE_FORMAT", "single")).lower()
+        self.single_flight = single_flight
+        self.heal_budget = heal_budget
 
     def recover(self, driver, element_key: str, failure: Exception, mode: str = "target_repair") -> str:
         element_definition = self.suite_config.get_element(element_key)
         timestamp = self.artifact_manager.timestamp()
         mutation_events = self.dom_monitor.flush_events(driver)
         page_source = driver.page_source
-        screenshot_path = self.artifact_manager.screenshot_path(element_key, timestamp)
-        driver.save_screenshot(str(screenshot_path))
-        dom_path = self.artifact_manager.write_dom_snapshot(element_key, page_source, timestamp)
         candidates = score_candidates(element_definition, extract_candidate_elements(driver))
         top_candidates = candidates[:5]
-        payload = self._build_payload(
-            element_definition=element_definition,
-            failure=failure,
-            mode=mode,
-            page_source=page_source,
-            mutation_events=mutation_events,
-            top_candidates=top_candidates,
-        )
+        fingerprint = structural_fingerprint(top_candidates)
 
         selector = ""
         success = False
+        error_message = ""
+        telemetry: dict[str, Any] = {}
         repair_provider = getattr(self.llm_client, "provider_name", "unknown")
         try:
-            selector = self.llm_client.repair_selector(payload)
-            selector, selector_type = parse_selector_response(selector)
-            self._validate_selector(driver, selector, selector_type)
+            cached_selector = self._cached_selector(driver, element_key, fingerprint, mode)
+            if cached_selector:
+                selector = cached_selector
+                repair_provider = "heal_cache"
+                success = True
+                return selector
+            payload = self._build_payload(
+                element_definition=element_definition,
+                failure=failure,
+                mode=mode,
+                page_source=page_source,
+                mutation_events=mutation_events,
+                top_candidates=top_candidates,
+            )
+            flight_key = HealCache.cache_key(element_key, fingerprint, mode)
+            previous_stats = getattr(self.llm_client, "last_call_stats", None)
+            try:
+                selector, shared = self._within_budget(lambda: self._repair_once(driver, flight_key, payload))
+            finally:
+                telemetry = self._call_telemetry(previous_stats)
+            if shared:
+                telemetry = {}
+                repair_provider = "single_flight"
+            else:
+                repair_provider = getattr(self.llm_client, "last_provider_name", "") or repair_provider
             success = True
+            if self.heal_cache is not None:
+                self.heal_cache.put(element_key, fingerprint, selector, mode)
             return selector
         except Exception as exc:  # noqa: BLE001 - audit logging needs the concrete failure.
+            error_message = f"{type(exc).__name__}: {exc}"
             if isinstance(exc, (SelectorValidationError, HealingError)):
                 raise
             raise HealingError(str(exc)) from exc
         finally:
+            artifact_paths = self._capture_artifacts(
+                driver, element_key, page_source, timestamp, fingerprint, success
+            )
             attempt = HealAttempt(
                 element_key=element_key,
                 old_selector=element_definition.selector,
@@ -72,13 +122,220 @@ class Healer:
                 llm_provider=repair_provider,
                 new_selector=selector,
                 success=success,
-                artifact_paths={
-                    "dom_snapshot": str(dom_path),
-                    "screenshot": str(screenshot_path),
-                },
+                artifact_paths=artifact_paths,
+                page_fingerprint=fingerprint,
+                error=error_message,
+                llm_telemetry=telemetry,
             )
             self.audit_logger.write(attempt)
 
+    def recover_batch(self, driver, element_keys: list[str], failure: Exception) -> dict[str, str]:
+        """Heals several elements of the current page with one capture and one LLM call.
+
+        Returns the validated selector for every key that could be healed; keys
+        absent from the result were not healed. Every key gets its own audit entry.
+        """
+
+        definitions = [self.suite_config.get_element(key) for key in element_keys]
+        timestamp = self.artifact_manager.timestamp()
+        mutation_events = self.dom_monitor.flush_events(driver)
+        page_source = driver.page_source
+        extracted = extract_candidate_elements(driver)
+        # score_candidates writes heuristic_score onto the candidates, so each
+        # element ranks its own copies of the single extraction.
+        top_by_key = {
+            definition.key: score_candidates(definition, [replace(item) for item in extracted])[:5]
+            for definition in definitions
+        }
+        fingerprints = {key: structural_fingerprint(top) for key, top in top_by_key.items()}
+
+        healed: dict[str, str] = {}
+        providers: dict[str, str] = {}
+        telemetry: dict[str, Any] = {}
+        default_provider = getattr(self.llm_client, "provider_name", "unknown")
+        error_message = ""
+        try:
+            for key in element_keys:
+                cached_selector = self._cached_selector(driver, key, fingerprints[key], "target_repair")
+                if cached_selector:
+                    healed[key] = cached_selector
+                    providers[key] = "heal_cache"
+            pending = [definition for definition in definitions if definition.key not in healed]
+            if pending:
+                payload = self._build_batch_payload(
+                    definitions=pending,
+                    failure=failure,
+                    page_source=page_source,
+                    mutation_events=mutation_events,
+                    top_by_key=top_by_key,
+                )
+                pending_keys = [definition.key for definition in pending]
+                previous_stats = getattr(self.llm_client, "last_call_stats", None)
+                try:
+                    repaired = self._within_budget(
+                        lambda: self._request_batch_repair(driver, payload, pending_keys)
+                    )
+                finally:
+                    telemetry = self._call_telemetry(previous_stats)
+                provider = getattr(self.llm_client, "last_provider_name", "") or default_provider
+                for key, selector in repaired.items():
+                    healed[key] = selector
+                    providers[key] = provider
+                    if self.heal_cache is not None:
+                        self.heal_cache.put(key, fingerprints[key], selector, "target_repair")
+            return healed
+        except Exception as exc:  # noqa: BLE001 - audit logging needs the concrete failure.
+            error_message = f"{type(exc).__name__}: {exc}"
+            if isinstance(exc, HealingError):
+                raise
+            raise HealingError(str(exc)) from exc
+        finally:
+            all_candidates = [item for top in top_by_key.values() for item in top]
+            artifact_paths = self._capture_artifacts(
+                driver,
+                f"batch_{element_keys[0]}",
+                page_source,
+                timestamp,
+                structural_fingerprint(all_candidates),
+                len(healed) == len(element_keys),
+            )
+            # The shared LLM call is accounted once, on the first key that went to the model.
+            telemetry_key = next((key for key in element_keys if providers.get(key) != "heal_cache"), None)
+            for definition in definitions:
+                key = definition.key
+                self.audit_logger.write(
+                    HealAttempt(
+                        element_key=key,
+                        old_selector=definition.selector,
+                        failure_type=type(failure).__name__,
+                        top_candidates=[self._candidate_payload(item) for item in top_by_key[key]],
+                        llm_provider=providers.get(key, default_provider),
+                        new_selector=healed.get(key, ""),
+                        success=key in healed,
+                        artifact_paths=artifact_paths,
+                        page_fingerprint=fingerprints[key],
+                        error=error_message or ("" if key in healed else "Batch repair returned no matching selector"),
+                        llm_telemetry=telemetry if key == telemetry_key else {},
+                    )
+                )
+
+    def _call_telemetry(self, previous_stats) -> dict[str, Any]:
+        """Stats of the client call this thread just made; empty if no call reached the client.
+
+        Clients keep `last_call_stats` per thread, so heals running at the same
+        time on a shared client never read each other's measurements.
+        """
+
+        stats = getattr(self.llm_client, "last_call_stats", None)
+        if stats is None or stats is previous_stats:
+            return {}
+        return stats.to_dict()
+
+    def _within_budget(self, work):
+        if self.heal_budget is None:
+            return work()
+        self.heal_budget.ensure_available()
+        started = monotonic()
+        try:
+            return work()
+        finally:
+            self.heal_budget.charge(monotonic() - started)
+
+    def _capture_artifacts(
+        self,
+        driver,
+        element_key: str,
+        page_source: str,
+        timestamp: str,
+        fingerprint: str,
+        success: bool,
+    ) -> dict[str, str]:
+        policy = self.capture_policy or self.artifact_manager.capture_policy
+        skip_reason = self.artifact_manager.capture_skip_reason(element_key, fingerprint, success, policy)
+        if skip_reason:
+            return {
+                "capture_policy": str(policy),
+                "skipped": "dom_snapshot,screenshot",
+                "skip_reason": skip_reason,
+            }
+        # The page has not been touched since recovery started, so capturing after
+        # the repair still reflects the state the heal was computed from. This
+        # runs while the audit entry is written, so a failed capture is recorded
+        # there instead of replacing the heal's own outcome.
+        artifact_paths: dict[str, str] = {}
+        errors: list[str] = []
+        try:
+            artifact_paths["dom_snapshot"] = self.artifact_manager.write_dom_snapshot(
+                element_key, page_source, timestamp
+            )
+        except Exception as exc:  # noqa: BLE001 - see above.
+            errors.append(f"dom_snapshot: {type(exc).__name__}: {exc}")
+        try:
+            screenshot_path = self.artifact_manager.write_screenshot(
+                element_key, driver.get_screenshot_as_png(), timestamp
+            )
+            artifact_paths["screenshot"] = str(screenshot_path)
+        except Exception as exc:  # noqa: BLE001 - see above.
+            errors.append(f"screenshot: {type(exc).__name__}: {exc}")
+        if errors:
+            artifact_paths["capture_error"] = "; ".join(errors)
+        return artifact_paths
+
+    def _request_repair(self, driver, payload: dict[str, Any]) -> str:
+        def accept(response: str) -> str:
+            if self.response_format == "ranked":
+                return self._select_ranked(driver, response)
+            selector, selector_type = parse_selector_response(response)
+            self._validate_selector(driver, selector, selector_type)
+            return selector
+
+        if getattr(self.llm_client, "accepts_validator", False):
+            return self.llm_client.repair_selector(payload, validator=accept)
+        return accept(self.llm_client.repair_selector(payload))
+
+    def _request_batch_repair(self, driver, payload: dict[str, Any], element_keys: list[str]) -> dict[str, str]:
+        repaired: dict[str, str] = {}
+
+        def accept(response: str) -> str:
+            nonlocal repaired
+            repaired = self._validate_batch(driver, response, element_keys)
+            return response
+
+        if getattr(self.llm_client, "accepts_validator", False):
+            self.llm_client.repair_selector(payload, validator=accept)
+        else:
+            accept(self.llm_client.repair_selector(payload))
+        return repaired
+
+    def _repair_once(self, driver, flight_key: str, payload: dict[str, Any]) -> tuple[str, bool]:
+        """Runs the LLM repair, sharing one in-flight repair per key across workers."""
+
+        if self.single_flight is None:
+            return self._request_repair(driver, payload), False
+        return self.single_flight.run(
+            flight_key,
+            lambda: self._request_repair(driver, payload),
+            lambda selector: self._selector_matches(driver, selector),
+        )
+
+    def _cached_selector(self, driver, element_key: str, fingerprint: str, mode: str) -> str | None:
+        if self.heal_cache is None:
+            return None
+        selector = self.heal_cache.get(element_key, fingerprint, mode)
+        if not selector:
+            return None
+        if not self._selector_matches(driver, selector):
+            self.heal_cache.invalidate(element_key, fingerprint, mode)
+            return None
+        return selector
+
+    def _selector_matches(self, driver, selector: str) -> bool:
+        try:
+            self._validate_selector(driver, selector, infer_selector_type(selector))
+        except SelectorValidationError:
+            return False
+        return True
+
     def _build_payload(
         self,
         *,
@@ -99,6 +356,39 @@ class Healer:
             "top_ranked_candidates": [self._candidate_payload(item) for item in top_candidates],
             "dom_snippet": build_dom_snippet(page_source, list(top_candidates)),
             "mutation_events": mutation_events[-20:],
+            **({"response_format": "ranked"} if self.response_format == "ranked" else {}),
+        }
+
+    def _build_batch_payload(
+        self,
+        *,
+        definitions,
+        failure: Exception,
+        page_source: str,
+        mutation_events: list[dict[str, Any]],
+        top_by_key,
+    ) -> dict[str, Any]:
+        snippet_candidates = {}
+        for definition in definitions:
+            for candidate in top_by_key[definition.key]:
+                snippet_candidates.setdefault(candidate.selector_hint, candidate)
+        return {
+            "mode": "batch_repair",
+            "failure_type": type(failure).__name__,
+            "failed_elements": [
+                {
+                    "failed_element_key": definition.key,
+                    "old_selector": definition.selector,
+                    "expected_role": definition.intended_role,
+                    "historical_metadata": definition.historical_metadata.model_dump(),
+                    "top_ranked_candidates": [
+                        self._candidate_payload(item) for item in top_by_key[definition.key]
+                    ],
+                }
+                for definition in definitions
+            ],
+            "dom_snippet": build_dom_snippet(page_source, list(snippet_candidates.values())),
+            "mutation_events": mutation_events[-20:],
         }
 
     @staticmethod
@@ -114,6 +404,31 @@ class Healer:
             "heuristic_score": candidate.heuristic_score,
         }
 
+    @staticmethod
+    def _select_ranked(driver, response: str) -> str:
+        ranked = parse_ranked_selector_response(response)
+        counts = count_selector_matches(driver, [(item.selector, item.selector_type) for item in ranked])
+        matching = [item for item, count in zip(ranked, counts) if count]
+        if not matching:
+            raise SelectorValidationError("None of the ranked LLM selectors matched an element")
+        unique = [item for item, count in zip(ranked, counts) if count == 1]
+        return (unique or matching)[0].selector
+
+    @staticmethod
+    def _validate_batch(driver, response: str, element_keys: list[str]) -> dict[str, str]:
+        parsed = parse_batch_selector_response(response, element_keys)
+        owners = unique_match_owners(driver, list(parsed.values()))
+        # Keys sharing an element cannot all be right; all of them fall back to a single-key heal.
+        shared = {owner for index, owner in enumerate(owners) if owner is not None and owner != index}
+        repaired = {
+            key: selector
+            for index, ((key, (selector, _)), owner) in enumerate(zip(parsed.items(), owners))
+            if owner == index and index not in shared
+        }
+        if not repaired:
+            raise SelectorValidationError("None of the batch-repaired LLM selectors matched an element")
+        return repaired
+
     @staticmethod
     def _validate_selector(driver, selector: str, selector_type: str) -> None:
         by = By.XPATH if selector_type == "xpath" else By.CSS_SELECTOR
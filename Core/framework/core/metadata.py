@@ -36,3 +36,6 @@ class HealAttempt:
     new_selector: str
     success: bool
     artifact_paths: dict[str, str] = field(default_factory=dict)
+    page_fingerprint: str = ""
+    error: str = ""
+    llm_telemetry: dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+
+class SingleFlight:
+    """Cross-process single-flight coordination backed by marker files.
+
+    The first caller for a key creates `<key>.flight` exclusively and runs the
+    work without holding any lock. Callers that arrive while that file exists
+    wait for the result the leader publishes under the flight's id, and reuse
+    it if `accept` still approves it; a caller that did not wait on the flight
+    never sees its result. The leader removes the flight file when it is done
+    and sweeps results older than `wait_timeout`, which no waiter still needs.
+    A caller that waits longer than `wait_timeout` runs the work itself.
+    """
+
+    def __init__(self, root: str | Path, wait_timeout: float = 120.0, poll_interval: float = 0.05) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    def run(self, key: str, work: Callable[[], str], accept: Callable[[str], bool]) -> tuple[str, bool]:
+        """Returns the result and whether it was shared from another caller."""
+
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        flight_path = self.root / f"{name}.flight"
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            flight_id = self._claim(flight_path)
+            if flight_id is not None:
+                return self._lead(key, name, flight_path, flight_id, work), False
+            flight_id = self._current_flight(flight_path)
+            if not flight_id:
+                # The flight ended, or its leader is still writing the id: try again.
+                time.sleep(self.poll_interval)
+                continue
+            shared = self._await_result(key, name, flight_path, flight_id, deadline)
+            if shared is not None:
+                return (shared, True) if accept(shared) else (work(), False)
+            if time.monotonic() >= deadline:
+                return work(), False
+            # The leader gave up without a result; one of its waiters leads the next flight.
+
+    def _claim(self, flight_path: Path) -> str | None:
+        """Creates the flight file and returns its id, or None if another caller holds it."""
+
+        try:
+            descriptor = os.open(flight_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            if self._stale(flight_path):
+                flight_path.unlink(missing_ok=True)
+            return None
+        flight_id = uuid.uuid4().hex
+        try:
+            os.write(descriptor, flight_id.encode("ascii"))
+        finally:
+            os.close(descriptor)
+        return flight_id
+
+    def _lead(self, key: str, name: str, flight_path: Path, flight_id: str, work: Callable[[], str]) -> str:
+        try:
+            self._sweep_results()
+            value = work()
+            result_path = self._result_path(name, flight_id)
+            temp_path = result_path.with_name(f"{result_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_text(json.dumps({"key": key, "value": value}), encoding="utf-8")
+            os.replace(temp_path, result_path)
+            return value
+        finally:
+            flight_path.unlink(missing_ok=True)
+
+    def _await_result(self, key: str, name: str, flight_path: Path, flight_id: str, deadline: float) -> str | None:
+        result_path = self._result_path(name, flight_id)
+        while True:
+            value = self._read_result(result_path, key)
+            if value is not None:
+                return value
+            if self._current_flight(flight_path) != flight_id:
+                # The result is written before the flight file goes away.
+                return self._read_result(result_path, key)
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def _result_path(self, name: str, flight_id: str) -> Path:
+        return self.root / f"{name}.{flight_id}.result"
+
+    def _sweep_results(self) -> None:
+        cutoff = time.time() - self.wait_timeout
+        for path in self.root.glob("*.result"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+    def _stale(self, flight_path: Path) -> bool:
+        # A leader that died mid-flight leaves its file behind.
+        try:
+            return time.time() - flight_path.stat().st_mtime > self.wait_timeout
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _current_flight(flight_path: Path) -> str | None:
+        try:
+            return flight_path.read_text(encoding="ascii")
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _read_result(path: Path, key: str) -> str | None:
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if record.get("key") != key:
+            return None
+        return record.get("value")
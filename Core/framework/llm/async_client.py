@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any
+
+from framework.llm.client import (
+    AnthropicSelectorRepairClient,
+    AzureOpenAISelectorRepairClient,
+    GeminiSelectorRepairClient,
+    HTTPSelectorRepairClient,
+    OpenAISelectorRepairClient,
+    SelectorRepairClient,
+    _create_guarded_client,
+)
+from framework.llm.telemetry import LLMCallStats
+
+# asyncio primitives belong to one event loop, so semaphores are kept per loop.
+_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.BoundedSemaphore]] = (
+    weakref.WeakKeyDictionary()
+)
+_semaphores_lock = threading.Lock()
+
+
+class AsyncSelectorRepairClient(ABC):
+    """asyncio-native counterpart of SelectorRepairClient.
+
+    `last_call_stats` belongs to the task that made the call, so concurrent
+    repairs on one client never see each other's measurements.
+    """
+
+    provider_name = "unknown"
+
+    @property
+    def last_call_stats(self) -> LLMCallStats | None:
+        return self._call_stats().get()
+
+    @last_call_stats.setter
+    def last_call_stats(self, stats: LLMCallStats | None) -> None:
+        self._call_stats().set(stats)
+
+    @abstractmethod
+    async def repair_selector(self, payload: dict[str, Any]) -> str:
+        raise NotImplementedError
+
+    def _call_stats(self) -> ContextVar[LLMCallStats | None]:
+        var = self.__dict__.get("_call_stats_var")
+        if var is None:
+            var = self.__dict__.setdefault("_call_stats_var", ContextVar("last_call_stats", default=None))
+        return var
+
+
+class AsyncHTTPSelectorRepairClient(AsyncSelectorRepairClient):
+    """Awaitable selector repair over a provider's HTTP API.
+
+    Each request runs the wrapped sync client on a worker thread, so it goes
+    through the shared keep-alive pool (and any proxy) with the same retry,
+    rate limit and circuit breaker handling as blocking calls. In-flight
+    requests per provider are bounded by a semaphore shared by every client of
+    that provider on the same loop.
+    """
+
+    def __init__(self, client: HTTPSelectorRepairClient, max_concurrency: int | None = None) -> None:
+        self.client = client
+        self.provider_name = client.provider_name
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("LLM_ASYNC_CONCURRENCY", "8"))
+        self.max_concurrency = max(max_concurrency, 1)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    async def repair_selector(self, payload: dict[str, Any]) -> str:
+        self.last_call_stats = None
+        async with _provider_semaphore(self.provider_name, self.max_concurrency):
+            executor = self._ensure_executor()
+            loop = asyncio.get_running_loop()
+            text, stats, error = await loop.run_in_executor(executor, _repair_in_thread, self.client, payload)
+        self.last_call_stats = stats
+        if error is not None:
+            raise error
+        return text
+
+    def close(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        # Sized to the semaphore so the default executor never lowers the limit.
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix=f"llm-async-{self.provider_name}"
+                )
+            return self._executor
+
+
+class AsyncOpenAISelectorRepairClient(AsyncHTTPSelectorRepairClient):
+    def __init__(self, api_key: str, model: str | None = None, max_concurrency: int | None = None) -> None:
+        super().__init__(OpenAISelectorRepairClient(api_key, model), max_concurrency)
+
+
+class AsyncAnthropicSelectorRepairClient(AsyncHTTPSelectorRepairClient):
+    def __init__(self, api_key: str, model: str | None = None, max_concurrency: int | None = None) -> None:
+        super().__init__(AnthropicSelectorRepairClient(api_key, model), max_concurrency)
+
+
+class AsyncGeminiSelectorRepairClient(AsyncHTTPSelectorRepairClient):
+    def __init__(self, api_key: str, model: str | None = None, max_concurrency: int | None = None) -> None:
+        super().__init__(GeminiSelectorRepairClient(api_key, model), max_concurrency)
+
+
+class AsyncAzureOpenAISelectorRepairClient(AsyncHTTPSelectorRepairClient):
+    def __init__(
+        self,
+        api_key: str,
+        endpoint: str,
+        deployment: str,
+        api_version: str | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        super().__init__(AzureOpenAISelectorRepairClient(api_key, endpoint, deployment, api_version), max_concurrency)
+
+
+class SyncSelectorRepairClientAdapter(SelectorRepairClient):
+    """Exposes an async client through the blocking SelectorRepairClient interface.
+
+    Coroutines run on a private event loop in a daemon thread, so existing
+    callers (Healer, hedging, thread pools) share one loop and its
+    per-provider concurrency limit.
+    """
+
+    def __init__(self, async_client: AsyncSelectorRepairClient) -> None:
+        self.async_client = async_client
+        self.provider_name = async_client.provider_name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def repair_selector(self, payload: dict[str, Any]) -> str:
+        stats: list[LLMCallStats | None] = []
+
+        async def call() -> str:
+            try:
+                return await self.async_client.repair_selector(payload)
+            finally:
+                stats.append(self.async_client.last_call_stats)
+
+        self.last_call_stats = None
+        try:
+            return asyncio.run_coroutine_threadsafe(call(), self._ensure_loop()).result()
+        finally:
+            if stats:
+                self.last_call_stats = stats[0]
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+        close_client = getattr(self.async_client, "close", None)
+        if close_client is not None:
+            close_client()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="llm-async-adapter", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+
+def create_async_selector_repair_client() -> AsyncHTTPSelectorRepairClient:
+    """Builds the async client for LLM_PROVIDER. Hedging is only available on the sync client."""
+
+    provider = os.getenv("LLM_PROVIDER", "openai").lower()
+    client = _create_guarded_client(provider)
+    if not isinstance(client, HTTPSelectorRepairClient):
+        raise RuntimeError(f"LLM provider {provider} has no async client")
+    return AsyncHTTPSelectorRepairClient(client)
+
+
+def _provider_semaphore(provider: str, limit: int) -> asyncio.BoundedSemaphore:
+    loop = asyncio.get_running_loop()
+    with _semaphores_lock:
+        semaphores = _semaphores.setdefault(loop, {})
+        semaphore = semaphores.get(provider)
+        if semaphore is None:
+            semaphore = asyncio.BoundedSemaphore(limit)
+            semaphores[provider] = semaphore
+        return semaphore
+
+
+def _repair_in_thread(
+    client: HTTPSelectorRepairClient, payload: dict[str, Any]
+) -> tuple[str, LLMCallStats | None, Exception | None]:
+    # The client's per-thread stats are only visible on the worker thread that made the call.
+    try:
+        return client.repair_selector(payload), client.last_call_stats, None
+    except Exception as exc:  # noqa: BLE001 - re-raised by the awaiting task.
+        return "", client.last_call_stats, exc
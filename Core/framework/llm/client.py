@@ -1,25 +1,214 @@
 from __future__ import annotations
 
+import http.client
 import json
 import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Any
-from urllib import error, request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from time import monotonic, sleep
+from typing import Any, Callable, Iterator
 
-from framework.llm.prompts import SYSTEM_PROMPT, build_user_prompt
+from framework.core.exceptions import LLMRequestError
+from framework.llm.parser import parse_selector_response
+from framework.llm.prompts import (
+    EncodedPrompt,
+    build_system_prompt,
+    encode_user_prompt,
+    estimate_tokens,
+    expects_single_line,
+    first_complete_line,
+    max_response_tokens,
+    prompt_token_budget,
+)
+from framework.llm.resilience import CircuitBreaker, RateLimiter, RetryPolicy, parse_retry_after
+from framework.llm.telemetry import LLMCallStats, token_cost
+from framework.llm.transport import get_connection_pool
+
+
+class _PerThread:
+    """Instance attribute whose value is only visible to the thread that set it.
+
+    One client is shared by every worker thread, so what a call leaves behind
+    for its caller must not be overwritten by a call running on another thread.
+    """
+
+    def __init__(self, default: Any = None) -> None:
+        self.default = default
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        return getattr(_thread_state(instance), self.name, self.default)
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        setattr(_thread_state(instance), self.name, value)
+
+
+def _thread_state(instance: Any) -> threading.local:
+    state = instance.__dict__.get("_thread_state")
+    if state is None:
+        state = instance.__dict__.setdefault("_thread_state", threading.local())
+    return state
 
 
 class SelectorRepairClient(ABC):
     """Provider-neutral interface for selector repair."""
 
     provider_name = "unknown"
+    # Composite clients that can reject responses themselves take a `validator`
+    # callable that parses and checks a raw response, returning the selector.
+    accepts_validator = False
+    # Latency, token and retry measurements of this thread's most recent call, if it reached a model.
+    last_call_stats: LLMCallStats | None = _PerThread()
+    # Provider that answered this thread's most recent call, for composite clients.
+    last_provider_name: str = _PerThread("")
 
     @abstractmethod
     def repair_selector(self, payload: dict[str, Any]) -> str:
         raise NotImplementedError
 
 
-class OpenAISelectorRepairClient(SelectorRepairClient):
+class HTTPSelectorRepairClient(SelectorRepairClient):
+    """Selector repair over a provider's JSON HTTP API.
+
+    Providers only describe the request and how to read the reply, so the sync
+    and async transports can share them.
+    """
+
+    circuit_breaker: CircuitBreaker | None = None
+    retry_policy: RetryPolicy | None = None
+    rate_limiter: RateLimiter | None = None
+    # Stream single-selector answers and stop reading at the first complete line.
+    stream_responses = False
+    # Token counts of this thread's most recent prompt, for reporting.
+    last_prompt: EncodedPrompt | None = _PerThread()
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self, "model", None) or getattr(self, "deployment", "")
+
+    def repair_selector(self, payload: dict[str, Any]) -> str:
+        self.last_call_stats = None
+        url, body, headers = self.build_request(payload)
+        tokens = self.request_tokens(payload)
+        stats = LLMCallStats(self.provider_name, self.model_name)
+        started = monotonic()
+        text = ""
+        usage = None
+        try:
+            if self.stream_responses and expects_single_line(payload):
+                url, body = self.build_stream_request(url, body)
+                stream_first_line = partial(_stream_first_line, extract=self.parse_stream_event)
+                text = self._post(url, body, headers, tokens, send=stream_first_line, stats=stats)
+            else:
+                response = self._post(url, body, headers, tokens, stats=stats)
+                usage = self.parse_usage(response)
+                text = self.parse_response(response)
+            return text
+        finally:
+            stats.latency_seconds = monotonic() - started
+            self.record_usage(stats, usage, text)
+            self.last_call_stats = stats
+
+    @abstractmethod
+    def build_request(self, payload: dict[str, Any]) -> tuple[str, dict[str, Any], dict[str, str]]:
+        """Returns the URL, JSON body and headers for a repair request."""
+
+    @abstractmethod
+    def parse_response(self, response: dict[str, Any]) -> str:
+        """Extracts the model's text answer from a decoded provider response."""
+
+    def parse_usage(self, response: dict[str, Any]) -> tuple[int, int] | None:
+        """Prompt and completion token counts reported by the provider, if any."""
+
+        usage = response.get("usage") or {}
+        if "prompt_tokens" not in usage:
+            return None
+        return int(usage["prompt_tokens"]), int(usage.get("completion_tokens", 0))
+
+    def build_stream_request(self, url: str, body: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        """Turns a repair request into its server-sent-events form."""
+
+        return url, {**body, "stream": True}
+
+    def parse_stream_event(self, event: dict[str, Any]) -> str:
+        """Extracts the text delta carried by one decoded stream event."""
+
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming")
+
+    def encode_prompt(self, payload: dict[str, Any]) -> str:
+        """Encodes the user prompt within this provider's token budget."""
+
+        encoded = encode_user_prompt(payload, prompt_token_budget(self.provider_name))
+        self.last_prompt = encoded
+        return encoded.text
+
+    def request_tokens(self, payload: dict[str, Any]) -> int:
+        """Tokens a request may consume against the provider's quota: prompt plus output allowance."""
+
+        prompt_tokens = self.last_prompt.estimated_tokens if self.last_prompt is not None else 0
+        return prompt_tokens + max_response_tokens(payload)
+
+    def record_usage(self, stats: LLMCallStats, usage: tuple[int, int] | None, text: str) -> None:
+        if usage is not None:
+            stats.prompt_tokens, stats.completion_tokens = usage
+        else:
+            stats.prompt_tokens = self.last_prompt.estimated_tokens if self.last_prompt is not None else 0
+            stats.completion_tokens = estimate_tokens(text) if text else 0
+            stats.tokens_estimated = True
+        stats.cost_usd = token_cost(self.provider_name, stats.prompt_tokens, stats.completion_tokens)
+
+    def _post(
+        self,
+        url: str,
+        payload: dict[str, Any],
+        headers: dict[str, str],
+        tokens: int = 0,
+        send: Callable[[str, dict[str, Any], dict[str, str]], Any] | None = None,
+        stats: LLMCallStats | None = None,
+    ) -> Any:
+        send = send or _post_json
+        breaker = self.circuit_breaker
+        probe = breaker.before_call() if breaker is not None else False
+        settled = False
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                if self.rate_limiter is not None:
+                    sleep(self.rate_limiter.reserve(tokens))
+                _timing.ttfb_seconds = None
+                try:
+                    response = send(url, payload, headers)
+                except Exception as exc:
+                    delay = self.retry_policy.retry_delay(attempt, exc) if self.retry_policy is not None else None
+                    if delay is not None:
+                        if stats is not None:
+                            stats.retries += 1
+                        sleep(delay)
+                        continue
+                    if breaker is not None and breaker.is_failure(exc):
+                        breaker.record_failure()
+                        settled = True
+                    raise
+                if stats is not None:
+                    stats.ttfb_seconds = _timing.ttfb_seconds
+                if breaker is not None:
+                    breaker.record_success()
+                    settled = True
+                return response
+        finally:
+            # Also reached on KeyboardInterrupt or a cancelled hedge worker.
+            if probe and not settled:
+                breaker.abandon_probe()
+
+
+class OpenAISelectorRepairClient(HTTPSelectorRepairClient):
     provider_name = "openai"
     endpoint = "https://api.openai.com/v1/chat/completions"
 
@@ -27,27 +216,30 @@ class OpenAISelectorRepairClient(SelectorRepairClient):
         self.api_key = api_key
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
-    def repair_selector(self, payload: dict[str, Any]) -> str:
+    def build_request(self, payload: dict[str, Any]) -> tuple[str, dict[str, Any], dict[str, str]]:
         body = {
             "model": self.model,
             "temperature": 0,
             "messages": [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": build_user_prompt(payload)},
+                {"role": "system", "content": build_system_prompt(payload)},
+                {"role": "user", "content": self.encode_prompt(payload)},
             ],
         }
-        response = _post_json(
-            self.endpoint,
-            body,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-        )
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        return self.endpoint, body, headers
+
+    def parse_response(self, response: dict[str, Any]) -> str:
         return response["choices"][0]["message"]["content"]
 
+    def parse_stream_event(self, event: dict[str, Any]) -> str:
+        choices = event.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content") or ""
+
 
-class AnthropicSelectorRepairClient(SelectorRepairClient):
+class AnthropicSelectorRepairClient(HTTPSelectorRepairClient):
     provider_name = "anthropic"
     endpoint = "https://api.anthropic.com/v1/messages"
 
@@ -55,30 +247,42 @@ class AnthropicSelectorRepairClient(SelectorRepairClient):
         self.api_key = api_key
         self.model = model or os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-latest")
 
-    def repair_selector(self, payload: dict[str, Any]) -> str:
+    def build_request(self, payload: dict[str, Any]) -> tuple[str, dict[str, Any], dict[str, str]]:
         body = {
             "model": self.model,
-            "max_tokens": 128,
+            "max_tokens": max_response_tokens(payload),
             "temperature": 0,
-            "system": SYSTEM_PROMPT,
+            "system": build_system_prompt(payload),
             "messages": [
-                {"role": "user", "content": build_user_prompt(payload)},
+                {"role": "user", "content": self.encode_prompt(payload)},
             ],
         }
-        response = _post_json(
-            self.endpoint,
-            body,
-            headers={
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json",
-            },
-        )
+        headers = {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json",
+        }
+        return self.endpoint, body, headers
+
+    def parse_response(self, response: dict[str, Any]) -> str:
         content = response["content"][0]["text"]
         return content
 
+    def parse_usage(self, response: dict[str, Any]) -> tuple[int, int] | None:
+        usage = response.get("usage") or {}
+        if "input_tokens" not in usage:
+            return None
+        return int(usage["input_tokens"]), int(usage.get("output_tokens", 0))
+
+    def parse_stream_event(self, event: dict[str, Any]) -> str:
+        if event.get("type") == "error":
+            raise RuntimeError(f"Anthropic stream failed: {event.get('error')}")
+        if event.get("type") != "content_block_delta":
+            return ""
+        return event.get("delta", {}).get("text", "")
 
-class GeminiSelectorRepairClient(SelectorRepairClient):
+
+class GeminiSelectorRepairClient(HTTPSelectorRepairClient):
     provider_name = "gemini"
     endpoint_template = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
 
@@ -86,18 +290,18 @@ class GeminiSelectorRepairClient(SelectorRepairClient):
         self.api_key = api_key
         self.model = model or os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 
-    def repair_selector(self, payload: dict[str, Any]) -> str:
+    def build_request(self, payload: dict[str, Any]) -> tuple[str, dict[str, Any], dict[str, str]]:
         body = {
             "system_instruction": {
                 "parts": [
-                    {"text": SYSTEM_PROMPT},
+                    {"text": build_system_prompt(payload)},
                 ]
             },
             "contents": [
                 {
                     "role": "user",
                     "parts": [
-                        {"text": build_user_prompt(payload)},
+                        {"text": self.encode_prompt(payload)},
                     ],
                 }
             ],
@@ -105,15 +309,14 @@ class GeminiSelectorRepairClient(SelectorRepairClient):
                 "temperature": 0,
             },
         }
-        response = _post_json(
-            self.endpoint_template.format(model=self.model),
-            body,
-            headers={
-                "x-goog-api-key": self.api_key,
-                "x-goog-api-client": "cs458-self-healing-framework/0.1.0",
-                "Content-Type": "application/json",
-            },
-        )
+        headers = {
+            "x-goog-api-key": self.api_key,
+            "x-goog-api-client": "cs458-self-healing-framework/0.1.0",
+            "Content-Type": "application/json",
+        }
+        return self.endpoint_template.format(model=self.model), body, headers
+
+    def parse_response(self, response: dict[str, Any]) -> str:
         candidates = response.get("candidates", [])
         if not candidates:
             raise RuntimeError("Gemini returned no candidates")
@@ -124,8 +327,22 @@ class GeminiSelectorRepairClient(SelectorRepairClient):
             raise RuntimeError("Gemini returned an empty response")
         return content
 
+    def parse_usage(self, response: dict[str, Any]) -> tuple[int, int] | None:
+        usage = response.get("usageMetadata") or {}
+        if "promptTokenCount" not in usage:
+            return None
+        return int(usage["promptTokenCount"]), int(usage.get("candidatesTokenCount", 0))
+
+    def build_stream_request(self, url: str, body: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        return url.replace(":generateContent", ":streamGenerateContent?alt=sse"), body
+
+    def parse_stream_event(self, event: dict[str, Any]) -> str:
+        candidates = event.get("candidates") or [{}]
+        parts = candidates[0].get("content", {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts if isinstance(part, dict))
+
 
-class AzureOpenAISelectorRepairClient(SelectorRepairClient):
+class AzureOpenAISelectorRepairClient(HTTPSelectorRepairClient):
     provider_name = "azure_openai"
 
     def __init__(
@@ -140,27 +357,116 @@ class AzureOpenAISelectorRepairClient(SelectorRepairClient):
         self.deployment = deployment
         self.api_version = api_version or os.getenv("AZURE_OPENAI_API_VERSION", "2025-01-01-preview")
 
-    def repair_selector(self, payload: dict[str, Any]) -> str:
+    def build_request(self, payload: dict[str, Any]) -> tuple[str, dict[str, Any], dict[str, str]]:
         url = f"{self.endpoint}/openai/deployments/{self.deployment}/chat/completions?api-version={self.api_version}"
         body = {
             "messages": [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": build_user_prompt(payload)},
+                {"role": "system", "content": build_system_prompt(payload)},
+                {"role": "user", "content": self.encode_prompt(payload)},
             ],
         }
-        response = _post_json(
-            url,
-            body,
-            headers={
-                "api-key": self.api_key,
-                "Content-Type": "application/json",
-            },
-        )
+        headers = {
+            "api-key": self.api_key,
+            "Content-Type": "application/json",
+        }
+        return url, body, headers
+
+    def parse_response(self, response: dict[str, Any]) -> str:
         return response["choices"][0]["message"]["content"]
 
+    def parse_stream_event(self, event: dict[str, Any]) -> str:
+        choices = event.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content") or ""
+
+
+class HedgedSelectorRepairClient(SelectorRepairClient):
+    """Sends the repair to a primary provider and, after a hedge delay, to a secondary one.
+
+    The first response accepted by `validator` (or, without one, by
+    `parse_selector_response`) wins. The losing request is left to finish in
+    the background and its result is ignored.
+    """
+
+    accepts_validator = True
+
+    def __init__(
+        self,
+        primary: SelectorRepairClient,
+        secondary: SelectorRepairClient,
+        hedge_delay_seconds: float = 2.0,
+    ) -> None:
+        self.primary = primary
+        self.secondary = secondary
+        self.hedge_delay_seconds = hedge_delay_seconds
+        self.provider_name = f"hedged:{primary.provider_name}+{secondary.provider_name}"
+
+    def repair_selector(
+        self,
+        payload: dict[str, Any],
+        validator: Callable[[str], str] | None = None,
+    ) -> str:
+        accept = validator or (lambda response: parse_selector_response(response)[0])
+        self.last_call_stats = None
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hedged-repair")
+        pending = {executor.submit(_call_with_stats, self.primary, payload): self.primary}
+        hedge_at = monotonic() + self.hedge_delay_seconds
+        hedged = False
+        errors: list[str] = []
+        try:
+            while pending or not hedged:
+                if not hedged and (not pending or monotonic() >= hedge_at):
+                    pending[executor.submit(_call_with_stats, self.secondary, payload)] = self.secondary
+                    hedged = True
+                timeout = None if hedged else max(hedge_at - monotonic(), 0)
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    client = pending.pop(future)
+                    try:
+                        response, stats = future.result()
+                        selector = accept(response)
+                    except Exception as exc:  # noqa: BLE001 - fall through to the other provider.
+                        errors.append(f"{client.provider_name}: {exc}")
+                        continue
+                    self.last_provider_name = client.provider_name
+                    self.last_call_stats = stats
+                    return selector
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        raise RuntimeError(f"All hedged providers failed: {'; '.join(errors)}")
+
+
+def _call_with_stats(client: SelectorRepairClient, payload: dict[str, Any]) -> tuple[str, LLMCallStats | None]:
+    # Runs on a hedging worker thread, where the client's per-thread stats are visible.
+    return client.repair_selector(payload), getattr(client, "last_call_stats", None)
+
 
 def create_selector_repair_client() -> SelectorRepairClient:
     provider = os.getenv("LLM_PROVIDER", "openai").lower()
+    client = _create_guarded_client(provider)
+    hedge_provider = os.getenv("LLM_HEDGE_PROVIDER", "").lower()
+    if hedge_provider and hedge_provider != provider:
+        return HedgedSelectorRepairClient(
+            client,
+            _create_guarded_client(hedge_provider),
+            float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "2.0")),
+        )
+    return client
+
+
+def _create_guarded_client(provider: str) -> SelectorRepairClient:
+    if provider == "local":
+        from framework.llm.local_client import LocalHeuristicSelectorRepairClient
+
+        return LocalHeuristicSelectorRepairClient()
+    client = _create_provider_client(provider)
+    client.circuit_breaker = CircuitBreaker.for_provider(client.provider_name)
+    client.retry_policy = RetryPolicy.for_provider(client.provider_name)
+    client.rate_limiter = RateLimiter.for_provider(client.provider_name)
+    client.stream_responses = os.getenv("LLM_STREAMING", "false").lower() in ("1", "true", "yes")
+    return client
+
+
+def _create_provider_client(provider: str) -> HTTPSelectorRepairClient:
     if provider == "openai":
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
@@ -190,15 +496,90 @@ def create_selector_repair_client() -> SelectorRepairClient:
     raise RuntimeError(f"Unsupported LLM provider: {provider}")
 
 
-def _post_json(url: str, payload: dict[str, Any], headers: dict[str, str]) -> dict[str, Any]:
+class _RequestTiming(threading.local):
+    # Time to first byte of the request the current thread sent last.
+    ttfb_seconds: float | None = None
+
+
+_timing = _RequestTiming()
+
+
+def _post_json(
+    url: str,
+    payload: dict[str, Any],
+    headers: dict[str, str],
+    timeout: float | None = None,
+) -> dict[str, Any]:
+    encoded = json.dumps(payload).encode("utf-8")
+    if timeout is None:
+        timeout = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+    try:
+        response = get_connection_pool().request("POST", url, body=encoded, headers=headers, timeout=timeout)
+    except TimeoutError as exc:
+        raise LLMRequestError(f"LLM request timed out after {timeout:g}s", timed_out=True) from exc
+    except (OSError, http.client.HTTPException) as exc:
+        raise LLMRequestError(f"LLM request could not be completed: {exc}") from exc
+    _timing.ttfb_seconds = response.ttfb_seconds
+    _raise_for_status(response.status, response.headers, response.body)
+    return json.loads(response.body.decode("utf-8"))
+
+
+def _stream_first_line(
+    url: str,
+    payload: dict[str, Any],
+    headers: dict[str, str],
+    extract: Callable[[dict[str, Any]], str],
+    timeout: float | None = None,
+) -> str:
+    """Streams a completion and returns its first complete line, closing the stream early."""
+
     encoded = json.dumps(payload).encode("utf-8")
-    req = request.Request(url, data=encoded, headers=headers, method="POST")
+    if timeout is None:
+        timeout = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+    text = ""
+    started = monotonic()
     try:
-        with request.urlopen(req, timeout=30) as response:
-            raw = response.read().decode("utf-8")
-    except error.HTTPError as exc:
-        detail = exc.read().decode("utf-8", errors="replace")
-        raise RuntimeError(f"LLM request failed with status {exc.code}: {detail}") from exc
-    except error.URLError as exc:
-        raise RuntimeError(f"LLM request could not be completed: {exc.reason}") from exc
-    return json.loads(raw)
+        with get_connection_pool().stream("POST", url, body=encoded, headers=headers, timeout=timeout) as response:
+            if response.status >= 400:
+                _raise_for_status(response.status, response.headers, response.read())
+            for data in _server_sent_events(response):
+                if data == "[DONE]":
+                    break
+                if _timing.ttfb_seconds is None:
+                    _timing.ttfb_seconds = monotonic() - started
+                text += extract(json.loads(data))
+                line = first_complete_line(text)
+                if line is not None:
+                    return line
+    except TimeoutError as exc:
+        raise LLMRequestError(f"LLM request timed out after {timeout:g}s", timed_out=True) from exc
+    except (OSError, http.client.HTTPException) as exc:
+        raise LLMRequestError(f"LLM request could not be completed: {exc}") from exc
+    return text
+
+
+def _server_sent_events(response: http.client.HTTPResponse) -> Iterator[str]:
+    data_lines: list[str] = []
+    while True:
+        raw_line = response.readline()
+        if not raw_line:
+            break
+        line = raw_line.decode("utf-8").rstrip("\r\n")
+        if not line:
+            if data_lines:
+                yield "\n".join(data_lines)
+                data_lines = []
+        elif line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+    if data_lines:
+        yield "\n".join(data_lines)
+
+
+def _raise_for_status(status: int, headers, body: bytes) -> None:
+    if status >= 400:
+        detail = body.decode("utf-8", errors="replace")
+        raise LLMRequestError(
+            f"LLM request failed with status {status}: {detail}",
+            status=status,
+            retry_after=parse_retry_after(headers.get("Retry-After")),
+        )
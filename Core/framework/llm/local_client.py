@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import re
+from time import monotonic
+from typing import Any, Callable
+
+from framework.core.exceptions import SelectorValidationError
+from framework.llm.client import SelectorRepairClient
+from framework.llm.telemetry import LLMCallStats
+
+# Attributes that usually identify an element on purpose, most stable first.
+STABLE_ATTRIBUTES = ("data-testid", "data-test", "data-qa", "data-cy", "name", "aria-label", "placeholder", "title")
+DISMISS_XPATHS = (
+    "//*[@role='dialog' or @aria-modal='true']//button[@aria-label='Close' or @aria-label='Dismiss']",
+    "//button[normalize-space()='Close' or normalize-space()='Dismiss' or normalize-space()='×' "
+    "or normalize-space()='X' or normalize-space()='OK' or normalize-space()='Got it']",
+    "//*[@role='dialog' or @aria-modal='true']//button",
+)
+_CSS_IDENTIFIER = re.compile(r"^-?[_a-zA-Z][_a-zA-Z0-9-]*$")
+# Ids with long digit runs are usually generated per render and will not survive a reload.
+_GENERATED_ID = re.compile(r"\d{4,}|^[0-9a-f]{8,}$|^(ember|react|mui|ng)-?\d", re.IGNORECASE)
+
+
+class LocalHeuristicSelectorRepairClient(SelectorRepairClient):
+    """Offline repair that derives selectors from the payload's ranked candidates.
+
+    Each candidate yields selectors by id, test ids, name and other stable
+    attributes whose value no other candidate shares, then a text XPath. With a
+    validator the selectors are tried against the page in order and the first
+    accepted one wins, so no network round trip is ever needed.
+    """
+
+    provider_name = "local"
+    accepts_validator = True
+
+    def repair_selector(
+        self,
+        payload: dict[str, Any],
+        validator: Callable[[str], str] | None = None,
+    ) -> str:
+        started = monotonic()
+        try:
+            return self._repair(payload, validator)
+        finally:
+            self.last_call_stats = LLMCallStats(self.provider_name, "heuristic", latency_seconds=monotonic() - started)
+
+    def _repair(self, payload: dict[str, Any], validator: Callable[[str], str] | None) -> str:
+        if payload.get("mode") == "batch_repair":
+            response = json.dumps(
+                {
+                    element["failed_element_key"]: selectors[0]
+                    for element in payload.get("failed_elements", [])
+                    if (selectors := synthesize_selectors(element.get("top_ranked_candidates", [])))
+                }
+            )
+            return validator(response) if validator else response
+
+        if payload.get("mode") == "obstacle_repair":
+            selectors = list(DISMISS_XPATHS)
+        else:
+            selectors = synthesize_selectors(payload.get("top_ranked_candidates", []))
+        if not selectors:
+            raise SelectorValidationError("Local heuristics found no candidate to build a selector from")
+
+        if payload.get("response_format") == "ranked":
+            step = 1 / (len(selectors) + 1)
+            ranked = [
+                {"selector": selector, "confidence": round(1 - index * step, 2)}
+                for index, selector in enumerate(selectors)
+            ]
+            response = json.dumps(ranked)
+            return validator(response) if validator else response
+        if validator is None:
+            return selectors[0]
+
+        error: Exception | None = None
+        for selector in selectors:
+            try:
+                return validator(selector)
+            except SelectorValidationError as exc:
+                error = exc
+        raise SelectorValidationError(f"No locally synthesized selector matched: {error}")
+
+
+def synthesize_selectors(candidates: list[dict[str, Any]], limit: int = 8) -> list[str]:
+    """Builds selectors for the ranked candidates, best candidate and most robust form first."""
+
+    value_counts: dict[tuple[str, str], int] = {}
+    for candidate in candidates:
+        for name, value in (candidate.get("attributes") or {}).items():
+            if value:
+                value_counts[(name, value)] = value_counts.get((name, value), 0) + 1
+
+    selectors: list[str] = []
+    for candidate in candidates:
+        for selector in _candidate_selectors(candidate, value_counts):
+            if selector not in selectors:
+                selectors.append(selector)
+    return selectors[:limit]
+
+
+def _candidate_selectors(candidate: dict[str, Any], value_counts: dict[tuple[str, str], int]) -> list[str]:
+    tag = candidate.get("tag") or "*"
+    attributes = {name: value for name, value in (candidate.get("attributes") or {}).items() if value}
+    selectors: list[str] = []
+
+    element_id = attributes.get("id")
+    if element_id and not _GENERATED_ID.search(element_id):
+        selectors.append(f"#{element_id}" if _CSS_IDENTIFIER.match(element_id) else f'[id="{_css_string(element_id)}"]')
+    for name in STABLE_ATTRIBUTES:
+        value = attributes.get(name)
+        if value and value_counts.get((name, value), 0) == 1:
+            selectors.append(f'{tag}[{name}="{_css_string(value)}"]')
+
+    text = " ".join((candidate.get("text") or "").split())
+    if text and len(text) <= 80:
+        selectors.append(f"//{tag}[normalize-space()={_xpath_literal(text)}]")
+
+    hint = candidate.get("selector_hint")
+    if hint:
+        selectors.append(hint)
+    return selectors
+
+
+def _css_string(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _xpath_literal(value: str) -> str:
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
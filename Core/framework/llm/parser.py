@@ -1,8 +1,18 @@
 from __future__ import annotations
 
+import json
+from dataclasses import dataclass
+
 from framework.core.exceptions import SelectorValidationError
 
 
+@dataclass(frozen=True)
+class RankedSelector:
+    selector: str
+    selector_type: str
+    confidence: float
+
+
 def infer_selector_type(selector: str) -> str:
     stripped = selector.strip()
     if stripped.startswith("/") or stripped.startswith("("):
@@ -19,3 +29,83 @@ def parse_selector_response(response: str) -> tuple[str, str]:
     if "```" in selector:
         raise SelectorValidationError("LLM returned markdown instead of a selector")
     return selector, infer_selector_type(selector)
+
+
+def parse_ranked_selector_response(response: str) -> list[RankedSelector]:
+    """Parses a JSON array of `{"selector", "confidence"}` items, best first.
+
+    A bare single-line selector is accepted as one candidate with full confidence,
+    so a model that ignores the ranked contract still yields a usable answer.
+    """
+
+    text = _strip_code_fence(response)
+    try:
+        items = json.loads(text)
+    except json.JSONDecodeError:
+        selector, selector_type = parse_selector_response(response)
+        return [RankedSelector(selector, selector_type, 1.0)]
+    if isinstance(items, dict):
+        items = items.get("selectors", [items])
+    if not isinstance(items, list):
+        raise SelectorValidationError("LLM returned an unexpected ranked selector payload")
+
+    ranked: list[RankedSelector] = []
+    seen: set[str] = set()
+    for item in items:
+        if isinstance(item, str):
+            item = {"selector": item}
+        if not isinstance(item, dict) or not isinstance(item.get("selector"), str):
+            continue
+        try:
+            selector, selector_type = parse_selector_response(item["selector"])
+        except SelectorValidationError:
+            continue
+        if selector in seen:
+            continue
+        seen.add(selector)
+        try:
+            confidence = min(max(float(item.get("confidence", 0.5)), 0.0), 1.0)
+        except (TypeError, ValueError):
+            confidence = 0.5
+        ranked.append(RankedSelector(selector, selector_type, confidence))
+    if not ranked:
+        raise SelectorValidationError("LLM returned no usable ranked selectors")
+    ranked.sort(key=lambda item: item.confidence, reverse=True)
+    return ranked
+
+
+def parse_batch_selector_response(response: str, element_keys: list[str]) -> dict[str, tuple[str, str]]:
+    """Parses a JSON object mapping element keys to selectors.
+
+    Keys that are missing or carry an unusable selector are left out; the result
+    keeps the order of `element_keys`.
+    """
+
+    try:
+        mapping = json.loads(_strip_code_fence(response))
+    except json.JSONDecodeError as exc:
+        raise SelectorValidationError("LLM returned an invalid batch selector payload") from exc
+    if isinstance(mapping, dict) and isinstance(mapping.get("selectors"), dict):
+        mapping = mapping["selectors"]
+    if not isinstance(mapping, dict):
+        raise SelectorValidationError("LLM returned an unexpected batch selector payload")
+
+    parsed: dict[str, tuple[str, str]] = {}
+    for key in element_keys:
+        value = mapping.get(key)
+        if not isinstance(value, str):
+            continue
+        try:
+            parsed[key] = parse_selector_response(value)
+        except SelectorValidationError:
+            continue
+    if not parsed:
+        raise SelectorValidationError("LLM returned no usable batch selectors")
+    return parsed
+
+
+def _strip_code_fence(response: str) -> str:
+    text = response.strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    return text
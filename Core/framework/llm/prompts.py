@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable
 
 SYSTEM_PROMPT = """You repair Selenium selectors. Return exactly one valid selector string and nothing else.
 Rules:
@@ -13,7 +16,260 @@ Rules:
 6. IMPORTANT: If mode is "obstacle_repair", an overlay is blocking the target element. You must return the selector for the DISMISS/CLOSE button of the overlay, NOT the original target element. Look for buttons with text like "Close", "Dismiss", "X", or similar within the overlay."""
 
 
-def build_user_prompt(payload: dict[str, Any]) -> str:
+RANKED_SYSTEM_PROMPT = """You repair Selenium selectors. Return a JSON array of up to 5 candidate selectors for the target, best first.
+Each item must be an object: {"selector": "<css or xpath>", "confidence": <number between 0 and 1>}.
+Rules:
+1. Use only elements present in the provided DOM snippet.
+2. Do not invent tags, attributes, text, or hierarchy.
+3. Prefer CSS selectors that uniquely identify the intended element; use XPath only when CSS cannot.
+4. Offer genuinely different alternatives (id, data attributes, name, structure, text) rather than near-duplicates.
+5. Output only the JSON array: no explanation, no markdown, and no code fence.
+6. IMPORTANT: If mode is "obstacle_repair", an overlay is blocking the target element. Every selector must target the DISMISS/CLOSE button of the overlay, NOT the original target element."""
+
+BATCH_SYSTEM_PROMPT = """You repair several Selenium selectors on the same page at once.
+The payload lists "failed_elements", each with its own failed_element_key, historical metadata, and ranked candidates.
+Return a single JSON object mapping every failed_element_key to one valid selector string.
+Rules:
+1. Use only elements present in the provided DOM snippet.
+2. Do not invent tags, attributes, text, or hierarchy.
+3. Prefer a CSS selector when it uniquely identifies the intended element; otherwise use a valid XPath.
+4. Each key must map to a different element; omit a key only if no element on the page fits it.
+5. Output only the JSON object: no explanation, no markdown, and no code fence."""
+
+
+COMPACT_PAYLOAD_LEGEND = """The payload is compact JSON with abbreviated keys: key=failed_element_key, old=old_selector,
+failure=failure_type, role=expected_role, history=historical_metadata, elements=failed_elements,
+dom=page source excerpt, mutations=recent DOM mutation events.
+"candidates" is a table: "cols" names the columns and every item of "rows" is one ranked candidate, best first."""
+
+# Long payload keys and their compact forms.
+COMPACT_KEYS = {
+    "failed_element_key": "key",
+    "old_selector": "old",
+    "failure_type": "failure",
+    "expected_role": "role",
+    "historical_metadata": "history",
+    "failed_elements": "elements",
+    "top_ranked_candidates": "candidates",
+    "dom_snippet": "dom",
+    "mutation_events": "mutations",
+}
+CANDIDATE_COLUMNS = ("selector_hint", "tag", "text", "attributes", "parent_tag", "rect", "styles", "heuristic_score")
+DEFAULT_PROMPT_TOKEN_BUDGET = 4000
+
+
+@dataclass
+class EncodedPrompt:
+    text: str
+    estimated_tokens: int
+    original_tokens: int
+    token_budget: int
+    trimmed: list[str] = field(default_factory=list)
+
+
+def prompt_encoding() -> str:
+    """`compact` (default) or `json` for the original pretty-printed payload, from LLM_PROMPT_ENCODING."""
+
+    return os.getenv("LLM_PROMPT_ENCODING", "compact").lower()
+
+
+def prompt_token_budget(provider: str) -> int:
+    """Reads LLM_PROMPT_TOKEN_BUDGET_<PROVIDER>, falling back to LLM_PROMPT_TOKEN_BUDGET (0 is unlimited)."""
+
+    value = os.getenv(f"LLM_PROMPT_TOKEN_BUDGET_{provider.upper()}") or os.getenv("LLM_PROMPT_TOKEN_BUDGET")
+    return int(value) if value else DEFAULT_PROMPT_TOKEN_BUDGET
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BPE token count: about four characters per token for English text and markup."""
+
+    return math.ceil(len(text) / 4)
+
+
+def build_system_prompt(payload: dict[str, Any]) -> str:
+    """Picks the system prompt matching the mode and response format of the payload."""
+
+    if payload.get("mode") == "batch_repair":
+        prompt = BATCH_SYSTEM_PROMPT
+    elif payload.get("response_format") == "ranked":
+        prompt = RANKED_SYSTEM_PROMPT
+    else:
+        prompt = SYSTEM_PROMPT
+    if prompt_encoding() == "compact":
+        return f"{prompt}\n{COMPACT_PAYLOAD_LEGEND}"
+    return prompt
+
+
+def expects_single_line(payload: dict[str, Any]) -> bool:
+    """Whether the prompt asks for a one-line selector (not a ranked list or batch map)."""
+
+    return payload.get("mode") != "batch_repair" and payload.get("response_format") != "ranked"
+
+
+def first_complete_line(text: str) -> str | None:
+    """First newline-terminated line of a partial answer that could be a selector.
+
+    Blank lines and markdown fence lines are skipped, so a fenced answer still
+    yields the selector inside the fence.
+    """
+
+    for line in text.split("\n")[:-1]:
+        stripped = line.strip()
+        if stripped and not stripped.startswith("```"):
+            return stripped
+    return None
+
+
+def max_response_tokens(payload: dict[str, Any]) -> int:
+    """Output-token allowance for providers that require an explicit limit."""
+
+    if payload.get("mode") == "batch_repair":
+        return 64 + 96 * len(payload.get("failed_elements", []))
+    if payload.get("response_format") == "ranked":
+        return 512
+    return 128
+
+
+def build_user_prompt(payload: dict[str, Any], token_budget: int = 0) -> str:
     """Formats a deterministic user payload for the model."""
 
-    return json.dumps(payload, indent=2, sort_keys=True)
+    return encode_user_prompt(payload, token_budget).text
+
+
+def encode_user_prompt(payload: dict[str, Any], token_budget: int = 0) -> EncodedPrompt:
+    """Encodes the payload and trims its least useful parts until it fits `token_budget`.
+
+    Trimming goes from least to most useful: mutation events, candidate styles
+    and geometry, the DOM excerpt (halved repeatedly), then lower-ranked
+    candidates. A budget of 0 disables trimming.
+    """
+
+    original = json.dumps(payload, indent=2, sort_keys=True)
+    original_tokens = estimate_tokens(original)
+    if prompt_encoding() != "compact":
+        return EncodedPrompt(original, original_tokens, original_tokens, token_budget)
+
+    compact = _compact_payload(payload)
+    text = _dump_compact(compact)
+    trimmed: list[str] = []
+    if token_budget > 0:
+        for name, step in _TRIM_STEPS:
+            while estimate_tokens(text) > token_budget and step(compact):
+                if name not in trimmed:
+                    trimmed.append(name)
+                text = _dump_compact(compact)
+            if estimate_tokens(text) <= token_budget:
+                break
+    return EncodedPrompt(text, estimate_tokens(text), original_tokens, token_budget, trimmed)
+
+
+def _dump_compact(compact: dict[str, Any]) -> str:
+    return json.dumps(compact, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _compact_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    compact: dict[str, Any] = {}
+    for key, value in payload.items():
+        if key == "top_ranked_candidates":
+            value = _candidate_table(value)
+        elif key == "failed_elements":
+            value = [_compact_payload(element) for element in value]
+        elif key == "dom_snippet":
+            value = _dom_excerpt(value)
+        elif key == "mutation_events":
+            value = list(value)
+        elif key == "historical_metadata" and isinstance(value, dict):
+            value = _drop_empty(value)
+        compact[COMPACT_KEYS.get(key, key)] = value
+    return compact
+
+
+def _candidate_table(candidates: list[dict[str, Any]]) -> dict[str, Any]:
+    rows = []
+    for candidate in candidates:
+        row = []
+        for column in CANDIDATE_COLUMNS:
+            value = candidate.get(column)
+            if column == "heuristic_score" and isinstance(value, float):
+                value = round(value, 3)
+            elif column == "rect" and isinstance(value, dict):
+                value = [round(value.get(axis, 0)) for axis in ("x", "y", "width", "height")]
+            elif isinstance(value, dict):
+                value = _drop_empty(value)
+            row.append(value)
+        rows.append(row)
+    columns = ["rect:x,y,w,h" if column == "rect" else column for column in CANDIDATE_COLUMNS]
+    return {"cols": columns, "rows": rows}
+
+
+def _dom_excerpt(snippet: Any) -> Any:
+    # build_dom_snippet wraps the excerpt in JSON together with hints the candidate table already carries.
+    if isinstance(snippet, str):
+        try:
+            decoded = json.loads(snippet)
+        except json.JSONDecodeError:
+            return snippet
+        if isinstance(decoded, dict) and "page_source_excerpt" in decoded:
+            return decoded["page_source_excerpt"]
+    return snippet
+
+
+def _drop_empty(values: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in values.items() if value not in (None, "", [], {})}
+
+
+def _tables(compact: dict[str, Any]) -> list[dict[str, Any]]:
+    tables = [compact["candidates"]] if isinstance(compact.get("candidates"), dict) else []
+    for element in compact.get("elements", []):
+        tables.extend(_tables(element))
+    return tables
+
+
+def _trim_mutations(compact: dict[str, Any]) -> bool:
+    events = compact.get("mutations")
+    if not events:
+        return False
+    del events[: max(len(events) // 2, 1)]
+    return True
+
+
+def _drop_column(column: str) -> Callable[[dict[str, Any]], bool]:
+    def step(compact: dict[str, Any]) -> bool:
+        changed = False
+        for table in _tables(compact):
+            names = [name.split(":", 1)[0] for name in table["cols"]]
+            if column in names:
+                index = names.index(column)
+                del table["cols"][index]
+                for row in table["rows"]:
+                    del row[index]
+                changed = True
+        return changed
+
+    return step
+
+
+def _halve_dom(compact: dict[str, Any]) -> bool:
+    dom = compact.get("dom")
+    if not isinstance(dom, str) or len(dom) < 200:
+        return False
+    compact["dom"] = dom[: len(dom) // 2]
+    return True
+
+
+def _drop_last_candidates(compact: dict[str, Any]) -> bool:
+    changed = False
+    for table in _tables(compact):
+        if len(table["rows"]) > 1:
+            table["rows"].pop()
+            changed = True
+    return changed
+
+
+_TRIM_STEPS: list[tuple[str, Callable[[dict[str, Any]], bool]]] = [
+    ("mutations", _trim_mutations),
+    ("styles", _drop_column("styles")),
+    ("rect", _drop_column("rect")),
+    ("dom", _halve_dom),
+    ("candidates", _drop_last_candidates),
+]
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import os
+import random
+import threading
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from time import monotonic, time
+from typing import Callable
+
+from framework.core.exceptions import CircuitOpenError, LLMRequestError
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one LLM provider.
+
+    After `failure_threshold` consecutive request failures the circuit opens and
+    calls fail fast with `CircuitOpenError` for `cooldown_seconds`. The first call
+    after the cooldown is let through as a half-open probe: success closes the
+    circuit, failure re-opens it for another cooldown. Only timeouts, connection
+    errors, 429 and 5xx responses are failures (see `is_failure`); a request the
+    provider rejected says nothing about its health.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    _registry: dict[str, "CircuitBreaker"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 60.0,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.cooldown_seconds = cooldown_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_provider(cls, provider: str) -> "CircuitBreaker | None":
+        """Returns the process-wide breaker for a provider, or None when disabled."""
+
+        threshold = int(os.getenv("LLM_BREAKER_THRESHOLD", "3"))
+        if threshold <= 0:
+            return None
+        with cls._registry_lock:
+            breaker = cls._registry.get(provider)
+            if breaker is None:
+                breaker = cls(
+                    provider,
+                    failure_threshold=threshold,
+                    cooldown_seconds=float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "60")),
+                )
+                cls._registry[provider] = breaker
+            return breaker
+
+    @staticmethod
+    def is_failure(error: BaseException) -> bool:
+        if not isinstance(error, LLMRequestError):
+            return isinstance(error, OSError)
+        return error.status is None or error.status == 429 or error.status >= 500
+
+    def before_call(self) -> bool:
+        """Raises CircuitOpenError while the circuit is open; returns True if this call is the half-open probe."""
+
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.cooldown_seconds - (self.clock() - self._opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"{self.name} circuit is open after {self.consecutive_failures} consecutive "
+                        f"failures; failing fast for another {remaining:.1f}s"
+                    )
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(f"{self.name} circuit is half-open; a recovery probe is in flight")
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = self.clock()
+
+    def abandon_probe(self) -> None:
+        """Lets the next call probe when the probe ended without a verdict (rejected or interrupted)."""
+
+        with self._lock:
+            self._probe_in_flight = False
+
+
+def _provider_env(name: str, provider: str, default: str) -> str:
+    return os.getenv(f"{name}_{provider.upper()}") or os.getenv(name) or default
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses a Retry-After header given either in seconds or as an HTTP date."""
+
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Jittered exponential backoff for rate-limited and transiently failing requests.
+
+    Attempt n waits a random time up to `base_delay_seconds * 2**n` (capped at
+    `max_delay_seconds`), unless the server sent Retry-After. A Retry-After
+    longer than `max_delay_seconds` is not waited out; the error is raised.
+    """
+
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 20.0
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+    @classmethod
+    def for_provider(cls, provider: str) -> "RetryPolicy":
+        """Reads LLM_RETRY_MAX_ATTEMPTS / LLM_RETRY_BASE_DELAY_SECONDS / LLM_RETRY_MAX_DELAY_SECONDS,
+        each overridable per provider with a `_<PROVIDER>` suffix."""
+
+        return cls(
+            max_attempts=max(int(_provider_env("LLM_RETRY_MAX_ATTEMPTS", provider, "3")), 1),
+            base_delay_seconds=float(_provider_env("LLM_RETRY_BASE_DELAY_SECONDS", provider, "0.5")),
+            max_delay_seconds=float(_provider_env("LLM_RETRY_MAX_DELAY_SECONDS", provider, "20")),
+        )
+
+    def retry_delay(self, attempt: int, error: Exception) -> float | None:
+        """Seconds to wait before retrying after `attempt` (1-based) failed, or None to give up."""
+
+        if attempt >= self.max_attempts or not isinstance(error, LLMRequestError):
+            return None
+        if error.status is None:
+            if error.timed_out:
+                return None
+        elif error.status not in self.retry_statuses:
+            return None
+        if error.retry_after is not None:
+            return error.retry_after if error.retry_after <= self.max_delay_seconds else None
+        return random.uniform(0, min(self.base_delay_seconds * 2 ** (attempt - 1), self.max_delay_seconds))
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate_per_minute`.
+
+    `reserve` takes the tokens immediately, letting the balance go negative, and
+    returns how long the caller must wait before using them. That keeps callers
+    in arrival order and works for both blocking and asyncio callers.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None, clock: Callable[[], float] = monotonic):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+            self._updated_at = now
+            self._tokens -= amount
+            return max(-self._tokens, 0.0) / self.rate_per_second
+
+
+class RateLimiter:
+    """Client-side requests-per-minute and tokens-per-minute limits for one provider."""
+
+    _registry: dict[str, "RateLimiter"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0, clock=monotonic) -> None:
+        self.requests = TokenBucket(requests_per_minute, clock=clock) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock) if tokens_per_minute > 0 else None
+
+    @classmethod
+    def for_provider(cls, provider: str) -> "RateLimiter | None":
+        """Returns the process-wide limiter from LLM_RATE_LIMIT_RPM / LLM_RATE_LIMIT_TPM
+        (optionally suffixed `_<PROVIDER>`), or None when neither is set."""
+
+        requests_per_minute = float(_provider_env("LLM_RATE_LIMIT_RPM", provider, "0"))
+        tokens_per_minute = float(_provider_env("LLM_RATE_LIMIT_TPM", provider, "0"))
+        if requests_per_minute <= 0 and tokens_per_minute <= 0:
+            return None
+        with cls._registry_lock:
+            limiter = cls._registry.get(provider)
+            if limiter is None:
+                limiter = cls(requests_per_minute, tokens_per_minute)
+                cls._registry[provider] = limiter
+            return limiter
+
+    def reserve(self, tokens: int) -> float:
+        """Reserves one request and `tokens` tokens; returns the seconds to wait first."""
+
+        wait = self.requests.reserve(1) if self.requests else 0.0
+        if self.tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from framework.llm.client import SelectorRepairClient
+from framework.llm.prompts import build_system_prompt
+
+# Payload fields that change between otherwise identical failures and would defeat the cache.
+VOLATILE_PAYLOAD_KEYS = ("mutation_events",)
+# Candidate fields, at any depth, that jitter between runs of the same page (layout and float scores).
+JITTER_PAYLOAD_KEYS = ("rect", "heuristic_score")
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache of raw LLM responses.
+
+    Each response lives in its own file named by the request hash, so workers
+    sharing the cache directory never contend on one index. Entries expire
+    `ttl_seconds` after they were written (<= 0 keeps them forever) and the
+    least recently used ones are evicted beyond `max_entries`. Eviction scans
+    the directory, so it runs once every `evict_every` puts (by default a
+    sixteenth of `max_entries`) and the cache may briefly hold that many more.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        max_entries: int = 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+        evict_every: int | None = None,
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evict_every = max(evict_every if evict_every is not None else max_entries // 16, 1)
+        self._puts_since_eviction = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, root: str | Path) -> ResponseCache | None:
+        """Reads LLM_RESPONSE_CACHE_TTL_SECONDS (0 disables) and LLM_RESPONSE_CACHE_MAX_ENTRIES."""
+
+        ttl_seconds = float(os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+        if ttl_seconds <= 0:
+            return None
+        return cls(root, int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "1024")), ttl_seconds)
+
+    @staticmethod
+    def request_key(provider: str, model: str, system_prompt: str, payload: dict[str, Any]) -> str:
+        canonical = _without_jitter({key: value for key, value in payload.items() if key not in VOLATILE_PAYLOAD_KEYS})
+        material = json.dumps(
+            [provider, model, system_prompt, canonical], sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if self._expired(record.get("created_at", 0), time.time()):
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            # The file's mtime doubles as the LRU clock.
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return record.get("response")
+
+    def put(self, key: str, response: str) -> None:
+        path = self._path(key)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_text(json.dumps({"response": response, "created_at": time.time()}), encoding="utf-8")
+        os.replace(temp_path, path)
+        with self._lock:
+            self._puts_since_eviction += 1
+            if self._puts_since_eviction < self.evict_every:
+                return
+            self._puts_since_eviction = 0
+        self._evict()
+
+    def invalidate(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.root.glob("*.json"))
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for path in self.root.glob("*.json"):
+                try:
+                    entries.append((path.stat().st_mtime_ns, path))
+                except FileNotFoundError:
+                    continue
+            if len(entries) <= self.max_entries:
+                return
+            entries.sort()
+            for _, path in entries[: len(entries) - self.max_entries]:
+                path.unlink(missing_ok=True)
+
+
+class CachingSelectorRepairClient(SelectorRepairClient):
+    """Replays stored responses for repair requests the wrapped client has already answered.
+
+    Only responses the caller's `validator` accepted are stored, and a replayed
+    response that the validator now rejects is dropped before asking the model.
+    """
+
+    accepts_validator = True
+
+    def __init__(self, client: SelectorRepairClient, cache: ResponseCache) -> None:
+        self.client = client
+        self.cache = cache
+        self.provider_name = client.provider_name
+        self.model = getattr(client, "model", None) or getattr(client, "deployment", "")
+
+    def repair_selector(
+        self,
+        payload: dict[str, Any],
+        validator: Callable[[str], str] | None = None,
+    ) -> str:
+        key = self.cache.request_key(self.provider_name, self.model, build_system_prompt(payload), payload)
+        self.last_call_stats = None
+        cached = self.cache.get(key)
+        if cached is not None:
+            if validator is None:
+                self.last_provider_name = "response_cache"
+                return cached
+            try:
+                selector = validator(cached)
+            except Exception:  # noqa: BLE001 - the page moved on; ask the model again.
+                self.cache.invalidate(key)
+            else:
+                self.last_provider_name = "response_cache"
+                return selector
+
+        accepted: list[str] = []
+
+        def remember(response: str) -> str:
+            result = validator(response) if validator else response
+            accepted.append(response)
+            return result
+
+        try:
+            if getattr(self.client, "accepts_validator", False):
+                result = self.client.repair_selector(payload, validator=remember)
+                self.last_provider_name = getattr(self.client, "last_provider_name", "") or self.provider_name
+            else:
+                result = remember(self.client.repair_selector(payload))
+                self.last_provider_name = self.provider_name
+        finally:
+            self.last_call_stats = getattr(self.client, "last_call_stats", None)
+        if accepted:
+            self.cache.put(key, accepted[-1])
+        return result
+
+
+def _without_jitter(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _without_jitter(item) for key, item in value.items() if key not in JITTER_PAYLOAD_KEYS}
+    if isinstance(value, list):
+        return [_without_jitter(item) for item in value]
+    return value
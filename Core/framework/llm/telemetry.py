@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable
+
+
+@dataclass
+class LLMCallStats:
+    """Measurements of one selector-repair call, as stored on HealAttempt.llm_telemetry."""
+
+    provider: str
+    model: str = ""
+    latency_seconds: float = 0.0
+    ttfb_seconds: float | None = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # True when the provider reported no usage and the counts are estimates.
+    tokens_estimated: bool = False
+    retries: int = 0
+    cost_usd: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def token_cost(provider: str, prompt_tokens: int, completion_tokens: int) -> float | None:
+    """Prices a call from LLM_COST_PER_1K_TOKENS_<PROVIDER>="<input>,<output>" (USD per 1000 tokens)."""
+
+    prices = os.getenv(f"LLM_COST_PER_1K_TOKENS_{provider.upper()}")
+    if not prices:
+        return None
+    input_price, _, output_price = prices.partition(",")
+    return (prompt_tokens * float(input_price) + completion_tokens * float(output_price or input_price)) / 1000
+
+
+def summarize_llm_telemetry(attempts: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Aggregates the llm_telemetry of audit entries per provider and model."""
+
+    groups: dict[tuple[str, str], list[tuple[dict[str, Any], bool]]] = {}
+    for attempt in attempts:
+        stats = attempt.get("llm_telemetry")
+        if stats:
+            groups.setdefault((stats["provider"], stats.get("model", "")), []).append((stats, attempt.get("success")))
+
+    summary = []
+    for (provider, model), calls in sorted(groups.items()):
+        latencies = sorted(stats["latency_seconds"] for stats, _ in calls)
+        ttfbs = [stats["ttfb_seconds"] for stats, _ in calls if stats.get("ttfb_seconds") is not None]
+        costs = [stats["cost_usd"] for stats, _ in calls if stats.get("cost_usd") is not None]
+        summary.append(
+            {
+                "provider": provider,
+                "model": model,
+                "calls": len(calls),
+                "success_rate": round(sum(1 for _, success in calls if success) / len(calls), 3),
+                "latency_mean_seconds": round(sum(latencies) / len(latencies), 4),
+                "latency_p50_seconds": round(_percentile(latencies, 50), 4),
+                "latency_p95_seconds": round(_percentile(latencies, 95), 4),
+                "ttfb_mean_seconds": round(sum(ttfbs) / len(ttfbs), 4) if ttfbs else None,
+                "prompt_tokens": sum(stats.get("prompt_tokens", 0) for stats, _ in calls),
+                "completion_tokens": sum(stats.get("completion_tokens", 0) for stats, _ in calls),
+                "retries": sum(stats.get("retries", 0) for stats, _ in calls),
+                "cost_usd": round(sum(costs), 6) if costs else None,
+            }
+        )
+    return summary
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    index = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
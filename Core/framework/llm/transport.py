@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import http.client
+import os
+import ssl
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import monotonic
+from typing import Iterator
+from urllib.parse import urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+# Errors that mean a kept-alive connection was closed by the server between requests.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+@dataclass
+class HTTPResponse:
+    status: int
+    headers: http.client.HTTPMessage
+    body: bytes
+    # Seconds from sending the request until the response headers arrived.
+    ttfb_seconds: float = 0.0
+
+
+class HTTPConnectionPool:
+    """Thread-safe keep-alive HTTP(S) connection pool shared by the LLM clients.
+
+    Connections are kept per (scheme, host, port) and reused until the server
+    closes them, so repeated repair calls skip DNS, TCP and TLS setup. At most
+    `max_connections_per_host` requests run against one host at a time; further
+    callers wait for a free connection.
+    """
+
+    def __init__(self, max_connections_per_host: int = 4, timeout: float = 30.0) -> None:
+        self.max_connections_per_host = max(max_connections_per_host, 1)
+        self.timeout = timeout
+        self._ssl_context = ssl.create_default_context()
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._slots: dict[tuple[str, str, int], threading.BoundedSemaphore] = {}
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> HTTPResponse:
+        key, path = self._target(url)
+        timeout = self.timeout if timeout is None else timeout
+
+        slot = self._slot(key)
+        slot.acquire()
+        try:
+            connection, reused = self._checkout(key, timeout)
+            try:
+                response, will_close = self._send(connection, method, path, body, headers or {})
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                if not reused:
+                    raise
+                connection = self._new_connection(key, timeout)
+                try:
+                    response, will_close = self._send(connection, method, path, body, headers or {})
+                except BaseException:
+                    connection.close()
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+            if will_close:
+                connection.close()
+            else:
+                self._checkin(key, connection)
+            return response
+        finally:
+            slot.release()
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """Yields the unread response so the caller can consume it incrementally.
+
+        A response read to the end goes back to the pool as usual; one the
+        caller stops reading early is closed, which aborts the transfer.
+        """
+
+        key, path = self._target(url)
+        timeout = self.timeout if timeout is None else timeout
+        slot = self._slot(key)
+        slot.acquire()
+        try:
+            connection, reused = self._checkout(key, timeout)
+            try:
+                raw = self._open(connection, method, path, body, headers or {})
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                if not reused:
+                    raise
+                connection = self._new_connection(key, timeout)
+                try:
+                    raw = self._open(connection, method, path, body, headers or {})
+                except BaseException:
+                    connection.close()
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+            try:
+                yield raw
+            finally:
+                if raw.isclosed() and not raw.will_close:
+                    self._checkin(key, connection)
+                else:
+                    connection.close()
+        finally:
+            slot.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    @staticmethod
+    def _target(url: str) -> tuple[tuple[str, str, int], str]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        return (scheme, parts.hostname or "", port), path
+
+    @staticmethod
+    def _open(
+        connection: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: dict[str, str],
+    ) -> http.client.HTTPResponse:
+        connection.request(method, path, body=body, headers=headers)
+        return connection.getresponse()
+
+    @classmethod
+    def _send(
+        cls,
+        connection: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: dict[str, str],
+    ) -> tuple[HTTPResponse, bool]:
+        started = monotonic()
+        raw = cls._open(connection, method, path, body, headers)
+        ttfb_seconds = monotonic() - started
+        payload = raw.read()
+        return HTTPResponse(raw.status, raw.headers, payload, ttfb_seconds), raw.will_close
+
+    def _slot(self, key) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_connections_per_host)
+                self._slots[key] = slot
+            return slot
+
+    def _checkout(self, key, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+        if connection is None:
+            return self._new_connection(key, timeout), False
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection, True
+
+    def _checkin(self, key, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append(connection)
+
+    def _new_connection(self, key, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        proxy = getproxies().get(scheme)
+        if proxy and not proxy_bypass(host):
+            # Tunnel through the proxy with CONNECT; TLS, if any, is still end to end.
+            proxy_parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            if scheme == "https":
+                connection = http.client.HTTPSConnection(
+                    proxy_parts.hostname, proxy_parts.port or 80, timeout=timeout, context=self._ssl_context
+                )
+            else:
+                connection = http.client.HTTPConnection(proxy_parts.hostname, proxy_parts.port or 80, timeout=timeout)
+            connection.set_tunnel(host, port)
+            return connection
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+
+_default_pool: HTTPConnectionPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> HTTPConnectionPool:
+    """Returns the process-wide pool, sized from LLM_POOL_SIZE and LLM_TIMEOUT_SECONDS."""
+
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = HTTPConnectionPool(
+                max_connections_per_host=int(os.getenv("LLM_POOL_SIZE", "4")),
+                timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "30")),
+            )
+        return _default_pool
@@ -1,18 +1,85 @@
 from __future__ import annotations
 
+import os
+import random
 import shutil
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from framework.logging.background import BackgroundWriter
+from framework.logging.blob_store import REF_PREFIX, BlobStore
+
+
+@dataclass(frozen=True)
+class CapturePolicy:
+    """Decides which heal attempts pay for a screenshot and DOM snapshot.
+
+    Modes: `always`, `on_failure`, `sampled` (keep `sample_percent` of heals) and
+    `first_occurrence` (once per element and page fingerprint within a run).
+    """
+
+    mode: str = "always"
+    sample_percent: float = 100.0
+
+    MODES = ("always", "on_failure", "sampled", "first_occurrence")
+
+    def __post_init__(self) -> None:
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unsupported capture policy: {self.mode}")
+        if not 0 <= self.sample_percent <= 100:
+            raise ValueError("sample_percent must be between 0 and 100")
+
+    @classmethod
+    def parse(cls, spec: str) -> "CapturePolicy":
+        """Parses `always`, `on_failure`, `first_occurrence` or `sampled:<percent>`."""
+
+        mode, _, argument = spec.strip().lower().partition(":")
+        if mode == "sampled":
+            return cls(mode, float(argument or 10))
+        return cls(mode)
+
+    @classmethod
+    def from_env(cls) -> "CapturePolicy":
+        return cls.parse(os.getenv("HEAL_CAPTURE_POLICY", "always"))
+
+    def __str__(self) -> str:
+        if self.mode == "sampled":
+            return f"sampled:{self.sample_percent:g}"
+        return self.mode
+
 
 class ArtifactManager:
-    """Creates and manages framework artifact files."""
+    """Creates and manages framework artifact files.
+
+    Snapshot and screenshot writes are queued to a background writer so the
+    calling test thread only pays for the driver-side capture. Call `flush()`
+    before reading artifacts back; the pytest session and interpreter exit drain
+    every writer automatically.
+    """
 
-    def __init__(self, root: str | Path = "artifacts") -> None:
+    def __init__(
+        self,
+        root: str | Path = "artifacts",
+        background: bool = True,
+        max_queue: int = 64,
+        capture_policy: CapturePolicy | None = None,
+    ) -> None:
         self.root = Path(root)
+        self.capture_policy = capture_policy or CapturePolicy.from_env()
+        self._random = random.Random()
+        self._seen_lock = threading.Lock()
+        self._seen_captures: set[str] | None = None
+        self.writer = BackgroundWriter("artifact-writer", max_queue) if background else None
         self.dom_root = self.root / "dom_snapshots"
         self.screenshot_root = self.root / "screenshots"
         self.run_log_root = self.root / "run_logs"
+        # Survives reset() so heal caches carry over between test runs.
+        self.cache_root = self.root / "cache"
+        self.dom_blobs = BlobStore.from_env(self.dom_root / "blobs")
+        # Refs already queued by this manager, so repeats skip the blob store entirely.
+        self._queued_blobs: set[str] = set()
         self._ensure_structure()
 
     def _ensure_structure(self) -> None:
@@ -20,22 +87,101 @@ class ArtifactManager:
         self.dom_root.mkdir(parents=True, exist_ok=True)
         self.screenshot_root.mkdir(parents=True, exist_ok=True)
         self.run_log_root.mkdir(parents=True, exist_ok=True)
+        self.cache_root.mkdir(parents=True, exist_ok=True)
 
     @staticmethod
     def timestamp() -> str:
         return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 
-    def write_dom_snapshot(self, element_key: str, page_source: str, timestamp: str | None = None) -> Path:
-        stamp = timestamp or self.timestamp()
-        path = self.dom_root / f"{stamp}_{element_key}.html"
-        path.write_text(page_source, encoding="utf-8")
+    def write_dom_snapshot(self, element_key: str, page_source: str, timestamp: str | None = None) -> str:
+        """Stores the page source once per distinct content and returns its `sha256:` ref.
+
+        Hashing runs on the calling thread; compression and the write happen on
+        the background writer, and only for content not stored before.
+        """
+
+        data = page_source.encode("utf-8")
+        ref = self.dom_blobs.ref(data)
+        with self._seen_lock:
+            if ref in self._queued_blobs:
+                return ref
+            self._queued_blobs.add(ref)
+
+        def store() -> None:
+            try:
+                self.dom_blobs.put(data, ref)
+            except BaseException:
+                # Not stored after all: the next snapshot with this content retries.
+                with self._seen_lock:
+                    self._queued_blobs.discard(ref)
+                raise
+
+        self._submit(store)
+        return ref
+
+    def read_dom_snapshot(self, ref: str) -> str:
+        """Returns a snapshot by its ref, decompressing on demand; older path refs are read as files."""
+
+        if ref.startswith(REF_PREFIX):
+            self.flush()
+            return self.dom_blobs.get(ref).decode("utf-8")
+        return Path(ref).read_text(encoding="utf-8")
+
+    def write_screenshot(self, element_key: str, png: bytes, timestamp: str | None = None) -> Path:
+        path = self.screenshot_path(element_key, timestamp)
+        self._submit(lambda: path.write_bytes(png))
         return path
 
     def screenshot_path(self, element_key: str, timestamp: str | None = None) -> Path:
         stamp = timestamp or self.timestamp()
         return self.screenshot_root / f"{stamp}_{element_key}.png"
 
+    def capture_skip_reason(
+        self,
+        element_key: str,
+        fingerprint: str,
+        success: bool,
+        policy: CapturePolicy | None = None,
+    ) -> str | None:
+        """Returns None when the heal should be captured, otherwise why it was skipped."""
+
+        policy = policy or self.capture_policy
+        if policy.mode == "on_failure" and success:
+            return "heal succeeded"
+        if policy.mode == "sampled" and self._random.random() * 100 >= policy.sample_percent:
+            return "not sampled"
+        if policy.mode == "first_occurrence" and not self._first_capture(f"{element_key}:{fingerprint}"):
+            return "already captured for fingerprint"
+        return None
+
+    def _first_capture(self, capture_key: str) -> bool:
+        ledger = self.run_log_root / "captured_fingerprints.txt"
+        with self._seen_lock:
+            if self._seen_captures is None:
+                try:
+                    self._seen_captures = set(ledger.read_text(encoding="utf-8").split())
+                except FileNotFoundError:
+                    self._seen_captures = set()
+            if capture_key in self._seen_captures:
+                return False
+            self._seen_captures.add(capture_key)
+            with ledger.open("a", encoding="utf-8") as handle:
+                handle.write(capture_key + "\n")
+            return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
     def reset(self) -> Path:
+        self.flush()
+        self._seen_captures = None
+        self._queued_blobs = set()
         self._ensure_structure()
         for child in self.root.iterdir():
             if child.is_file() and child.name != ".gitkeep":
@@ -44,6 +190,12 @@ class ArtifactManager:
             self._clear_directory(directory)
         return self.root
 
+    def _submit(self, job) -> None:
+        if self.writer is None:
+            job()
+        else:
+            self.writer.submit(job)
+
     @staticmethod
     def _clear_directory(directory: Path) -> None:
         for child in directory.iterdir():
@@ -1,19 +1,80 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
 from framework.core.metadata import HealAttempt
+from framework.logging.audit_store import SQLiteAuditStore
+from framework.logging.background import BatchingWriter
+from framework.logging.overrides import SelectorOverrideRegistry
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DURABILITY_MODES = ("none", "flush", "fsync")
+# One batching writer per audit root, shared by every logger writing there so
+# a reader flushing its logger also sees what the others queued.
+_batchers: "weakref.WeakValueDictionary[Path, BatchingWriter]" = weakref.WeakValueDictionary()
+_batchers_lock = threading.Lock()
 
 
 class HealingAuditLogger:
-    """Persists healing attempts and latest selector overrides."""
+    """Persists healing attempts and latest selector overrides.
+
+    Attempts are appended to `healed_elements.jsonl`, one JSON object per line
+    written with a single O_APPEND write, so concurrent workers never
+    interleave or rewrite each other's entries. Every `compact_every` appends
+    the log is rewritten without torn lines and trimmed to the newest
+    `max_entries` (0 keeps everything).
+
+    With a `store` (HEAL_AUDIT_STORE=sqlite) attempts and overrides live in
+    SQLite instead and `export()` produces the JSON files from it.
 
-    def __init__(self, root: str | Path = "artifacts") -> None:
+    With `background` on, `write` only queues the record; batches reach disk
+    every `batch_size` records or `flush_interval_seconds`. Reads flush first.
+    `durability` is `none` (leave writes to the OS, SQLite synchronous=OFF),
+    `flush` (each batch handed to the OS, SQLite synchronous=NORMAL) or
+    `fsync` (each batch fsynced, SQLite synchronous=FULL). For the JSON files
+    `none` and `flush` are the same, since a batch is one unbuffered write.
+    """
+
+    def __init__(
+        self,
+        root: str | Path = "artifacts",
+        compact_every: int | None = None,
+        max_entries: int | None = None,
+        store: SQLiteAuditStore | None = None,
+        background: bool | None = None,
+        durability: str | None = None,
+    ) -> None:
         self.root = Path(root)
         self.root.mkdir(parents=True, exist_ok=True)
-        self.healed_elements_path = self.root / "healed_elements.json"
+        self.healed_elements_path = self.root / "healed_elements.jsonl"
+        # Array written by earlier versions; still read so old runs stay visible.
+        self.legacy_healed_elements_path = self.root / "healed_elements.json"
         self.selector_overrides_path = self.root / "selector_overrides.json"
+        self.lock_path = self.root / ".healed_elements.lock"
+        self.compact_every = (
+            int(os.getenv("HEAL_AUDIT_COMPACT_EVERY", "1000")) if compact_every is None else compact_every
+        )
+        self.max_entries = int(os.getenv("HEAL_AUDIT_MAX_ENTRIES", "0")) if max_entries is None else max_entries
+        self._appends_since_compaction = 0
+        self._lock = threading.Lock()
+        self.durability = (durability or os.getenv("HEAL_AUDIT_DURABILITY", "flush")).strip().lower()
+        if self.durability not in DURABILITY_MODES:
+            raise ValueError(f"Invalid audit durability {self.durability!r}; expected one of {DURABILITY_MODES}")
+        self.store = store if store is not None else SQLiteAuditStore.from_env(self.root, self.durability)
+        if background is None:
+            background = os.getenv("HEAL_AUDIT_BACKGROUND", "true").lower() not in ("0", "false", "no", "off")
+        self.batcher = self._shared_batcher() if background else None
+        self.overrides = SelectorOverrideRegistry.shared(self.root, self.store)
 
     def write(self, attempt: HealAttempt) -> None:
         payload = {
@@ -25,28 +86,169 @@ class HealingAuditLogger:
             "new_selector": attempt.new_selector,
             "success": attempt.success,
             "artifact_paths": attempt.artifact_paths,
+            "page_fingerprint": attempt.page_fingerprint,
+            "error": attempt.error,
+            "llm_telemetry": attempt.llm_telemetry,
         }
-        attempts = self.read_attempts()
-        attempts.append(payload)
-        self.healed_elements_path.write_text(
-            json.dumps(attempts, indent=2, sort_keys=True),
-            encoding="utf-8",
+        record = (payload, attempt.new_selector if attempt.success and attempt.new_selector else None)
+        if record[1]:
+            # Visible to every finder of this process now; persisted with the batch.
+            self.overrides.remember(attempt.element_key, attempt.new_selector)
+        if self.batcher is not None:
+            self.batcher.add((self, record))
+        else:
+            self._persist([record])
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Waits until every queued record for this root is on disk. Returns False on timeout."""
+
+        if self.batcher is None:
+            return True
+        return self.batcher.flush(timeout)
+
+    def append(self, *payloads: dict) -> None:
+        """Appends entries to the log synchronously, in one write."""
+
+        data = b"".join(
+            (json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+            for payload in payloads
         )
+        with self._lock:
+            with self._file_lock(exclusive=False):
+                descriptor = os.open(self.healed_elements_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(descriptor, data)
+                    if self.durability == "fsync":
+                        os.fsync(descriptor)
+                finally:
+                    os.close(descriptor)
+            self._appends_since_compaction += len(payloads)
+            due = self.compact_every > 0 and self._appends_since_compaction >= self.compact_every
+        if due:
+            self.compact()
 
-        if attempt.success and attempt.new_selector:
-            overrides = self.read_overrides()
-            overrides[attempt.element_key] = attempt.new_selector
-            self.selector_overrides_path.write_text(
-                json.dumps(overrides, indent=2, sort_keys=True),
-                encoding="utf-8",
-            )
+    def compact(self) -> int:
+        """Rewrites the log without malformed lines and beyond `max_entries`; returns the entries kept.
+
+        The selector override log is rewritten too, down to one line per key.
+        """
+
+        self.overrides.compact()
+        with self._lock, self._file_lock(exclusive=True):
+            if not self.healed_elements_path.exists():
+                return 0
+            entries = [line for line, entry in self._lines() if entry is not None]
+            if self.max_entries > 0:
+                entries = entries[-self.max_entries :]
+            temp_path = self.healed_elements_path.with_name(f"{self.healed_elements_path.name}.{os.getpid()}.tmp")
+            with temp_path.open("w", encoding="utf-8") as handle:
+                for entry in entries:
+                    handle.write(entry + "\n")
+            os.replace(temp_path, self.healed_elements_path)
+            self._appends_since_compaction = 0
+            return len(entries)
 
     def read_overrides(self) -> dict[str, str]:
-        if not self.selector_overrides_path.exists():
-            return {}
-        return json.loads(self.selector_overrides_path.read_text(encoding="utf-8"))
+        return dict(self.overrides)
+
+    def iter_attempts(self) -> Iterator[dict]:
+        """Streams logged attempts oldest first, skipping a line torn by a crashed writer."""
+
+        self.flush()
+        if self.store is not None:
+            yield from self.store.iter_attempts()
+            return
+        if self.legacy_healed_elements_path.exists():
+            yield from json.loads(self.legacy_healed_elements_path.read_text(encoding="utf-8"))
+        for _, entry in self._lines():
+            if entry is not None:
+                yield entry
 
     def read_attempts(self) -> list[dict]:
-        if not self.healed_elements_path.exists():
-            return []
-        return json.loads(self.healed_elements_path.read_text(encoding="utf-8"))
+        return list(self.iter_attempts())
+
+    def export(self) -> None:
+        """Writes selector_overrides.json and, from the SQLite store, healed_elements.jsonl.
+
+        With the JSON files the override log is compacted as well.
+        """
+
+        self.flush()
+        if self.store is not None:
+            self.store.export(self.healed_elements_path, self.selector_overrides_path)
+        else:
+            self.overrides.export()
+            self.overrides.compact()
+
+    def close(self) -> None:
+        self.flush()
+        if self.store is not None:
+            self.store.close()
+
+    def _shared_batcher(self) -> BatchingWriter:
+        key = self.root.resolve()
+        with _batchers_lock:
+            batcher = _batchers.get(key)
+            if batcher is None:
+                batcher = BatchingWriter(
+                    _persist_batch,
+                    "audit-writer",
+                    batch_size=int(os.getenv("HEAL_AUDIT_BATCH_SIZE", "32")),
+                    flush_interval_seconds=float(os.getenv("HEAL_AUDIT_FLUSH_INTERVAL_SECONDS", "1.0")),
+                )
+                _batchers[key] = batcher
+            return batcher
+
+    def _persist(self, records: list[tuple[dict, str | None]]) -> None:
+        if self.store is not None:
+            self.store.append_attempts(records)
+            return
+        self.append(*(payload for payload, _ in records))
+        overrides = {payload["element_key"]: override for payload, override in records if override}
+        if overrides:
+            self.overrides.persist(overrides, fsync=self.durability == "fsync")
+
+    def _lines(self) -> Iterator[tuple[str, dict | None]]:
+        """Yields each stripped log line with its entry, or None if it is not a complete JSON object."""
+
+        try:
+            handle = self.healed_elements_path.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    entry = None
+                yield line, entry if isinstance(entry, dict) else None
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        # Appenders share the lock; compaction takes it exclusively so no line
+        # lands in the file it is about to replace.
+        if fcntl is None:
+            yield
+            return
+        with self.lock_path.open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _persist_batch(items: list[tuple[HealingAuditLogger, tuple[dict, str | None]]]) -> None:
+    """Writes a queued batch, one call per logger run so each logger keeps its own settings."""
+
+    index = 0
+    while index < len(items):
+        logger = items[index][0]
+        records = []
+        while index < len(items) and items[index][0] is logger:
+            records.append(items[index][1])
+            index += 1
+        logger._persist(records)
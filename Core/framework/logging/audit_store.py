@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Iterator
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS heal_attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    element_key TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    success INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS heal_attempts_element_key ON heal_attempts (element_key, timestamp);
+CREATE INDEX IF NOT EXISTS heal_attempts_timestamp ON heal_attempts (timestamp);
+CREATE TABLE IF NOT EXISTS selector_overrides (
+    element_key TEXT PRIMARY KEY,
+    selector TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+# One store per database file and sync mode, shared by every logger of the
+# process, so the override registry of a root is backed by a single store.
+_stores: "weakref.WeakValueDictionary[tuple[Path, str], SQLiteAuditStore]" = weakref.WeakValueDictionary()
+_stores_lock = threading.Lock()
+
+
+class SQLiteAuditStore:
+    """Heal attempts and selector overrides in one SQLite database in WAL mode.
+
+    WAL lets readers proceed while another process writes, and every write is
+    a single short transaction, so parallel workers sharing the database never
+    lose each other's updates. Each thread gets its own connection.
+    """
+
+    def __init__(self, path: str | Path, busy_timeout_seconds: float = 30.0, synchronous: str = "NORMAL") -> None:
+        self.path = Path(path)
+        self.synchronous = synchronous
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._connection().executescript(SCHEMA)
+
+    @classmethod
+    def from_env(cls, root: str | Path, durability: str = "flush") -> SQLiteAuditStore | None:
+        """Reads HEAL_AUDIT_STORE (`files` by default, `sqlite` for `<root>/heal_audit.sqlite3`)."""
+
+        if os.getenv("HEAL_AUDIT_STORE", "files").strip().lower() != "sqlite":
+            return None
+        synchronous = {"none": "OFF", "flush": "NORMAL", "fsync": "FULL"}[durability]
+        return cls.shared(Path(root) / "heal_audit.sqlite3", synchronous)
+
+    @classmethod
+    def shared(cls, path: str | Path, synchronous: str = "NORMAL") -> SQLiteAuditStore:
+        key = (Path(path).resolve(), synchronous)
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = cls(path, synchronous=synchronous)
+                _stores[key] = store
+            return store
+
+    def append_attempt(self, payload: dict, override: str | None = None) -> None:
+        """Records an attempt and, when given, the element's new override in one transaction."""
+
+        self.append_attempts([(payload, override)])
+
+    def append_attempts(self, records: list[tuple[dict, str | None]]) -> None:
+        """Records a batch of (attempt, new override or None) in one transaction."""
+
+        now = time.time()
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT INTO heal_attempts (element_key, timestamp, success, payload) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        payload.get("element_key", ""),
+                        now,
+                        int(bool(payload.get("success"))),
+                        json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str),
+                    )
+                    for payload, _ in records
+                ],
+            )
+            for payload, override in records:
+                if override:
+                    self._upsert_override(connection, payload.get("element_key", ""), override, now)
+
+    def set_override(self, element_key: str, selector: str) -> None:
+        with self._connection() as connection:
+            self._upsert_override(connection, element_key, selector, time.time())
+
+    def delete_override(self, element_key: str) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM selector_overrides WHERE element_key = ?", (element_key,))
+
+    def overrides(self) -> dict[str, str]:
+        rows = self._connection().execute("SELECT element_key, selector FROM selector_overrides")
+        return dict(rows.fetchall())
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits; a cheap check before re-reading overrides."""
+
+        return self._connection().execute("PRAGMA data_version").fetchone()[0]
+
+    def iter_attempts(
+        self,
+        element_key: str | None = None,
+        since: float | None = None,
+        success: bool | None = None,
+    ) -> Iterator[dict]:
+        """Streams attempts oldest first, optionally for one element, after a timestamp or by outcome."""
+
+        clauses, params = [], []
+        if element_key is not None:
+            clauses.append("element_key = ?")
+            params.append(element_key)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if success is not None:
+            clauses.append("success = ?")
+            params.append(int(success))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self._connection().execute(f"SELECT payload FROM heal_attempts{where} ORDER BY id", params)
+        for (payload,) in cursor:
+            yield json.loads(payload)
+
+    def export(self, attempts_path: str | Path, overrides_path: str | Path) -> None:
+        """Writes the attempts as JSON Lines and the overrides as a JSON object."""
+
+        attempts_path, overrides_path = Path(attempts_path), Path(overrides_path)
+        temp_path = attempts_path.with_name(f"{attempts_path.name}.{os.getpid()}.tmp")
+        with temp_path.open("w", encoding="utf-8") as handle:
+            for (payload,) in self._connection().execute("SELECT payload FROM heal_attempts ORDER BY id"):
+                handle.write(payload + "\n")
+        os.replace(temp_path, attempts_path)
+        overrides_path.write_text(json.dumps(self.overrides(), indent=2, sort_keys=True), encoding="utf-8")
+
+    def close(self) -> None:
+        """Closes every thread's connection; the next call on a thread opens a new one."""
+
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Only its own thread uses a connection; close() may run on another one.
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout_seconds, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"PRAGMA synchronous={self.synchronous}")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    @staticmethod
+    def _upsert_override(connection: sqlite3.Connection, element_key: str, selector: str, now: float) -> None:
+        connection.execute(
+            "INSERT INTO selector_overrides (element_key, selector, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(element_key) DO UPDATE SET selector = excluded.selector, updated_at = excluded.updated_at",
+            (element_key, selector, now),
+        )
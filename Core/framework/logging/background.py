@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+import warnings
+import weakref
+from time import monotonic
+from typing import Any, Callable
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Runs persistence jobs on a daemon thread behind a bounded queue.
+
+    `submit` blocks once the queue is full, so a slow disk applies backpressure
+    instead of growing memory without bound. Job failures are collected in
+    `errors` rather than raised on the submitting thread, and `drain_all`
+    warns about the ones not reported yet.
+    """
+
+    _instances: "weakref.WeakSet[BackgroundWriter]" = weakref.WeakSet()
+
+    def __init__(self, name: str = "background-writer", max_queue: int = 64) -> None:
+        self.name = name
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self.errors: list[BaseException] = []
+        self._reported_errors = 0
+        BackgroundWriter._instances.add(self)
+
+    def submit(self, job: Callable[[], Any]) -> None:
+        self._ensure_started()
+        self._queue.put(job)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Waits until every submitted job has run. Returns False on timeout."""
+
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = None) -> None:
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self.flush(timeout)
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def report_errors(self) -> None:
+        """Warns once about each job failure since the last report."""
+
+        errors = self.errors[self._reported_errors :]
+        self._reported_errors += len(errors)
+        for error in errors:
+            warnings.warn(f"{self.name} job failed: {type(error).__name__}: {error}", RuntimeWarning, stacklevel=2)
+
+    @classmethod
+    def drain_all(cls, timeout: float | None = None) -> None:
+        for writer in list(cls._instances):
+            writer.flush(timeout)
+            writer.report_errors()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                job()
+            except Exception as exc:  # noqa: BLE001 - a failed write must not kill the writer.
+                self.errors.append(exc)
+            finally:
+                self._queue.task_done()
+
+
+class BatchingWriter:
+    """Groups records into batches that a BackgroundWriter hands to `sink`.
+
+    A batch is queued once `batch_size` records are pending or
+    `flush_interval_seconds` after the first of them arrived, whichever comes
+    first, so `add` never touches the disk.
+    """
+
+    _instances: "weakref.WeakSet[BatchingWriter]" = weakref.WeakSet()
+
+    def __init__(
+        self,
+        sink: Callable[[list[Any]], None],
+        name: str = "batching-writer",
+        batch_size: int = 32,
+        flush_interval_seconds: float = 1.0,
+        max_queue: int = 64,
+    ) -> None:
+        self.sink = sink
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.writer = BackgroundWriter(name, max_queue)
+        self._pending: list[Any] = []
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        BatchingWriter._instances.add(self)
+
+    @property
+    def errors(self) -> list[BaseException]:
+        return self.writer.errors
+
+    def add(self, record: Any) -> None:
+        with self._lock:
+            self._pending.append(record)
+            if len(self._pending) < self.batch_size:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.flush_interval_seconds, self._submit_pending)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self._submit_pending()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Queues the pending batch and waits until every batch has been written."""
+
+        self._submit_pending()
+        return self.writer.flush(timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        self._submit_pending()
+        self.writer.close(timeout)
+
+    @classmethod
+    def drain_all(cls, timeout: float | None = None) -> None:
+        for writer in list(cls._instances):
+            writer.flush(timeout)
+
+    def _submit_pending(self) -> None:
+        # Submitting under the lock keeps batches in arrival order.
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if batch:
+                self.writer.submit(lambda: self.sink(batch))
+
+
+atexit.register(BackgroundWriter.drain_all)
+# Registered last so it runs first: pending batches reach the writers before they drain.
+atexit.register(BatchingWriter.drain_all)
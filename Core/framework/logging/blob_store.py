@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import hashlib
+import lzma
+import os
+import threading
+import zlib
+from pathlib import Path
+
+# Codec name -> (file suffix, compress, decompress).
+CODECS = {
+    "zlib": (".zz", lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (".xz", lambda data: lzma.compress(data, preset=6), lzma.decompress),
+    "none": ("", lambda data: data, lambda data: data),
+}
+REF_PREFIX = "sha256:"
+
+
+class BlobStore:
+    """Content-addressed store that keeps each distinct blob once, compressed.
+
+    Blobs are named by the sha256 of their uncompressed bytes, so identical
+    page sources captured for different keys or heals share one file. The
+    codec only changes the file suffix; `get` reads whichever one exists.
+    """
+
+    def __init__(self, root: str | Path, codec: str = "zlib") -> None:
+        if codec not in CODECS:
+            raise ValueError(f"Unsupported blob codec {codec!r}; expected one of {sorted(CODECS)}")
+        self.root = Path(root)
+        self.codec = codec
+
+    @classmethod
+    def from_env(cls, root: str | Path) -> BlobStore:
+        """Reads DOM_SNAPSHOT_COMPRESSION (`zlib` by default, `lzma` or `none`)."""
+
+        return cls(root, os.getenv("DOM_SNAPSHOT_COMPRESSION", "zlib").strip().lower())
+
+    @staticmethod
+    def ref(data: bytes) -> str:
+        return REF_PREFIX + hashlib.sha256(data).hexdigest()
+
+    def put(self, data: bytes, ref: str | None = None) -> str:
+        """Stores `data` unless a blob with the same content exists and returns its ref."""
+
+        ref = ref or self.ref(data)
+        if self.path_for(ref) is not None:
+            return ref
+        suffix, compress, _ = CODECS[self.codec]
+        path = self._base_path(ref).with_suffix(suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(compress(data))
+        os.replace(temp_path, path)
+        return ref
+
+    def get(self, ref: str) -> bytes:
+        path = self.path_for(ref)
+        if path is None:
+            raise FileNotFoundError(f"No blob stored for {ref}")
+        for suffix, _, decompress in CODECS.values():
+            if path.suffix == suffix:
+                return decompress(path.read_bytes())
+        raise ValueError(f"Unknown blob encoding for {path}")
+
+    def path_for(self, ref: str) -> Path | None:
+        base = self._base_path(ref)
+        for suffix, _, _ in CODECS.values():
+            path = base.with_suffix(suffix)
+            if path.exists():
+                return path
+        return None
+
+    def __contains__(self, ref: str) -> bool:
+        return self.path_for(ref) is not None
+
+    def _base_path(self, ref: str) -> Path:
+        digest = ref.removeprefix(REF_PREFIX)
+        if len(digest) != 64 or any(char not in "0123456789abcdef" for char in digest):
+            raise ValueError(f"Invalid blob ref {ref!r}")
+        return self.root / digest[:2] / digest
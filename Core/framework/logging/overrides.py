@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import weakref
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from framework.logging.audit_store import SQLiteAuditStore
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# One registry per artifacts root, so every logger and finder of a process shares it.
+_registries: "weakref.WeakValueDictionary[Path, SelectorOverrideRegistry]" = weakref.WeakValueDictionary()
+_registries_lock = threading.Lock()
+
+
+class SelectorOverrideRegistry(MutableMapping):
+    """Authoritative in-memory map of healed selectors, kept in step with other processes.
+
+    Changes are appended to `selector_overrides.jsonl` (or upserted into the
+    SQLite store) instead of rewriting a whole file. Before each lookup the
+    registry compares a cheap version stamp, the log's size or SQLite's
+    `data_version`, and reads only what other processes added since.
+    `selector_overrides.json` is a snapshot written by `export`, and `compact`
+    rewrites the log down to one line per key.
+    """
+
+    def __init__(self, root: str | Path, store: SQLiteAuditStore | None = None) -> None:
+        self.root = Path(root)
+        self.snapshot_path = self.root / "selector_overrides.json"
+        self.log_path = self.root / "selector_overrides.jsonl"
+        self.lock_path = self.root / ".selector_overrides.lock"
+        self.store = store
+        self._overrides: dict[str, str] = {}
+        self._log_offset = 0
+        self._log_inode: int | None = None
+        self._store_version: int | None = None
+        # Keys the store held at the last refresh, to notice ones deleted since.
+        self._store_keys: set[str] = set()
+        self._lock = threading.RLock()
+        self._load_snapshot()
+
+    @classmethod
+    def shared(cls, root: str | Path, store: SQLiteAuditStore | None = None) -> SelectorOverrideRegistry:
+        """The registry of `root` for this process; replaced only if the root switches between files and SQLite."""
+
+        key = Path(root).resolve()
+        with _registries_lock:
+            registry = _registries.get(key)
+            if registry is None or (registry.store is None) != (store is None):
+                registry = cls(root, store)
+                _registries[key] = registry
+            return registry
+
+    def __getitem__(self, element_key: str) -> str:
+        self.refresh()
+        return self._overrides[element_key]
+
+    def __setitem__(self, element_key: str, selector: str) -> None:
+        self.remember(element_key, selector)
+        self.persist({element_key: selector})
+
+    def __delitem__(self, element_key: str) -> None:
+        with self._lock:
+            del self._overrides[element_key]
+        self.persist({element_key: None})
+
+    def __iter__(self) -> Iterator[str]:
+        self.refresh()
+        return iter(dict(self._overrides))
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._overrides)
+
+    def remember(self, element_key: str, selector: str) -> None:
+        """Updates the in-memory map only; the audit writer persists the change later."""
+
+        with self._lock:
+            self._overrides[element_key] = selector
+
+    def persist(self, changes: dict[str, str | None], fsync: bool = False) -> None:
+        """Appends changes to the override log (a None selector removes the key)."""
+
+        if self.store is not None:
+            for element_key, selector in changes.items():
+                if selector is None:
+                    self.store.delete_override(element_key)
+                else:
+                    self.store.set_override(element_key, selector)
+            return
+        data = "".join(
+            json.dumps({"key": key, "selector": selector}, separators=(",", ":")) + "\n"
+            for key, selector in changes.items()
+        ).encode("utf-8")
+        with self._file_lock(exclusive=False):
+            descriptor = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(descriptor, data)
+                if fsync:
+                    os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+
+    def refresh(self) -> bool:
+        """Reads changes other processes persisted since the last call. Returns True if any were read."""
+
+        with self._lock:
+            if self.store is not None:
+                version = self.store.data_version()
+                if version == self._store_version:
+                    return False
+                self._store_version = version
+                stored = self.store.overrides()
+                for element_key in self._store_keys - stored.keys():
+                    self._overrides.pop(element_key, None)
+                self._overrides.update(stored)
+                self._store_keys = set(stored)
+                return True
+            return self._read_log()
+
+    def export(self) -> None:
+        """Writes the current map to selector_overrides.json."""
+
+        self.refresh()
+        if not self._overrides and not self.snapshot_path.exists():
+            return
+        temp_path = self.snapshot_path.with_name(f"{self.snapshot_path.name}.{os.getpid()}.tmp")
+        with self._lock:
+            temp_path.write_text(json.dumps(self._overrides, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(temp_path, self.snapshot_path)
+
+    def compact(self) -> int:
+        """Rewrites the override log with one line per key; returns the keys kept."""
+
+        if self.store is not None or not self.log_path.exists():
+            return 0
+        with self._file_lock(exclusive=True), self._lock:
+            if not self.log_path.exists():
+                return 0
+            self._read_log()
+            temp_path = self.log_path.with_name(f"{self.log_path.name}.{os.getpid()}.tmp")
+            with temp_path.open("w", encoding="utf-8") as handle:
+                for key, selector in sorted(self._overrides.items()):
+                    handle.write(json.dumps({"key": key, "selector": selector}, separators=(",", ":")) + "\n")
+            os.replace(temp_path, self.log_path)
+            stat = self.log_path.stat()
+            self._log_inode, self._log_offset = stat.st_ino, stat.st_size
+            return len(self._overrides)
+
+    def _load_snapshot(self) -> None:
+        if self.store is None and self.snapshot_path.exists():
+            self._overrides.update(json.loads(self.snapshot_path.read_text(encoding="utf-8")))
+
+    def _read_log(self) -> bool:
+        try:
+            stat = self.log_path.stat()
+        except FileNotFoundError:
+            return False
+        if stat.st_ino != self._log_inode:
+            # A new log (first read, or the artifacts were reset): start over.
+            self._log_inode, self._log_offset = stat.st_ino, 0
+        if stat.st_size <= self._log_offset:
+            return False
+        with self.log_path.open("rb") as handle:
+            handle.seek(self._log_offset)
+            chunk = handle.read(stat.st_size - self._log_offset)
+        # Leave a line still being written for the next refresh.
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        self._log_offset += len(complete)
+        for line in complete.splitlines():
+            try:
+                change = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if change.get("selector") is None:
+                self._overrides.pop(change.get("key"), None)
+            else:
+                self._overrides[change["key"]] = change["selector"]
+        return bool(complete)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        # Appenders share the lock; compaction takes it exclusively so no change
+        # lands in the log it is about to replace.
+        if fcntl is None:
+            yield
+            return
+        with self.lock_path.open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
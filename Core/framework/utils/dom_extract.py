@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from typing import Any
 
@@ -63,6 +64,69 @@ for (const root of roots) {
 return items.slice(0, 80);
 """
 
+COUNT_SELECTOR_MATCHES_SCRIPT = r"""
+const specs = arguments[0] || [];
+return specs.map(([selector, type]) => {
+  try {
+    if (type === "xpath") {
+      return document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+    }
+    return document.querySelectorAll(selector).length;
+  } catch (error) {
+    return -1;
+  }
+});
+"""
+
+UNIQUE_MATCH_OWNERS_SCRIPT = r"""
+const specs = arguments[0] || [];
+const seen = [];
+return specs.map(([selector, type], index) => {
+  let node = null;
+  try {
+    if (type === "xpath") {
+      const snapshot = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      if (snapshot.snapshotLength === 1) node = snapshot.snapshotItem(0);
+    } else {
+      const nodes = document.querySelectorAll(selector);
+      if (nodes.length === 1) node = nodes[0];
+    }
+  } catch (error) {
+    return -1;
+  }
+  if (node === null) return -1;
+  const owner = seen.indexOf(node);
+  seen[index] = node;
+  return owner < 0 ? index : owner;
+});
+"""
+
+
+def count_selector_matches(driver, selectors: list[tuple[str, str]]) -> list[int | None]:
+    """Counts matches for several (selector, selector_type) pairs in one browser round trip.
+
+    Invalid selectors are reported as None.
+    """
+
+    if not selectors:
+        return []
+    counts = driver.execute_script(COUNT_SELECTOR_MATCHES_SCRIPT, [list(spec) for spec in selectors]) or []
+    return [None if count is None or count < 0 else int(count) for count in counts]
+
+
+def unique_match_owners(driver, selectors: list[tuple[str, str]]) -> list[int | None]:
+    """Resolves several (selector, selector_type) pairs to single elements in one browser round trip.
+
+    Each pair gets the index of the first pair that resolves to the same
+    element (its own index if none before it does), or None when it is invalid
+    or does not match exactly one element.
+    """
+
+    if not selectors:
+        return []
+    owners = driver.execute_script(UNIQUE_MATCH_OWNERS_SCRIPT, [list(spec) for spec in selectors]) or []
+    return [None if owner is None or owner < 0 else int(owner) for owner in owners]
+
 
 def extract_candidate_elements(driver) -> list[CandidateElement]:
     raw_candidates = driver.execute_script(COLLECT_CANDIDATES_SCRIPT) or []
@@ -89,3 +153,17 @@ def build_dom_snippet(page_source: str, candidates: list[CandidateElement], max_
         "page_source_excerpt": page_source[: max_chars // 2],
     }
     return json.dumps(summary, indent=2)
+
+
+def structural_fingerprint(candidates: list[CandidateElement]) -> str:
+    """Hashes the tag/attribute-name skeleton of the given candidates.
+
+    Attribute values are left out so that regenerated ids or class hashes on an
+    otherwise unchanged page region produce the same fingerprint.
+    """
+
+    skeleton = sorted(
+        f"{candidate.parent_tag}>{candidate.tag}[{','.join(sorted(candidate.attributes))}]"
+        for candidate in candidates
+    )
+    return hashlib.sha256("|".join(skeleton).encode("utf-8")).hexdigest()[:16]
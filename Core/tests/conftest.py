@@ -1,20 +1,56 @@
 from __future__ import annotations
 
+import json
 import time
 from pathlib import Path
 
 import pytest
 
 from framework.config.loader import ConfigLoader
+from framework.llm.telemetry import summarize_llm_telemetry
 from framework.logging.artifacts import ArtifactManager
+from framework.logging.audit import HealingAuditLogger
+from framework.logging.background import BackgroundWriter, BatchingWriter
+
+ARTIFACTS_ROOT = Path(__file__).resolve().parents[1] / "artifacts"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_config_cache(tmp_path_factory):
+    """Keeps compiled test configs out of the user's cache directory."""
+
+    patch = pytest.MonkeyPatch()
+    patch.setenv("CONFIG_CACHE_DIR", str(tmp_path_factory.mktemp("config-cache")))
+    yield
+    patch.undo()
 
 
 @pytest.fixture(scope="session", autouse=True)
 def reset_artifacts_for_test_run():
-    artifacts_root = Path(__file__).resolve().parents[1] / "artifacts"
-    manager = ArtifactManager(artifacts_root)
+    manager = ArtifactManager(ARTIFACTS_ROOT)
     manager.reset()
-    return manager
+    yield manager
+    BatchingWriter.drain_all()
+    BackgroundWriter.drain_all()
+    audit_logger = HealingAuditLogger(ARTIFACTS_ROOT)
+    audit_logger.export()
+    audit_logger.close()
+
+
+def pytest_terminal_summary(terminalreporter):
+    summary = summarize_llm_telemetry(HealingAuditLogger(ARTIFACTS_ROOT).iter_attempts())
+    if not summary:
+        return
+    (ARTIFACTS_ROOT / "llm_telemetry_summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    terminalreporter.section("LLM telemetry")
+    for row in summary:
+        cost = f", ${row['cost_usd']:.4f}" if row["cost_usd"] is not None else ""
+        terminalreporter.write_line(
+            f"{row['provider']}/{row['model'] or '-'}: {row['calls']} calls, "
+            f"p50 {row['latency_p50_seconds'] * 1000:.0f} ms, p95 {row['latency_p95_seconds'] * 1000:.0f} ms, "
+            f"{row['prompt_tokens']} prompt + {row['completion_tokens']} completion tokens, "
+            f"{row['retries']} retries{cost}"
+        )
 
 
 @pytest.fixture()
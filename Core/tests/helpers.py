@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Callable, Iterable, Iterator
 from urllib import error, request
 
 import pytest
@@ -17,12 +19,22 @@ from selenium.webdriver.support.ui import WebDriverWait
 
 from framework.core.actions import SafeActions
 from framework.core.browser import BrowserSession
+from framework.core.budget import HealBudget
 from framework.core.dom_monitor import DomMonitor
 from framework.core.finder import SafeFinder
+from framework.core.heal_cache import HealCache
 from framework.core.healer import Healer
-from framework.llm.client import create_selector_repair_client, _post_json
+from framework.core.metadata import HealAttempt
+from framework.core.single_flight import SingleFlight
+from framework.llm.client import SelectorRepairClient, _post_json, create_selector_repair_client
+from framework.llm.response_cache import CachingSelectorRepairClient, ResponseCache
 from framework.logging.artifacts import ArtifactManager
 from framework.logging.audit import HealingAuditLogger
+from framework.utils.dom_extract import (
+    COLLECT_CANDIDATES_SCRIPT,
+    COUNT_SELECTOR_MATCHES_SCRIPT,
+    UNIQUE_MATCH_OWNERS_SCRIPT,
+)
 
 
 @dataclass
@@ -37,18 +49,168 @@ class FrameworkRuntime:
     actions: SafeActions
 
 
-class LazySelectorRepairClient:
+# One heal budget for the whole pytest run, shared by every runtime.
+RUN_HEAL_BUDGET = HealBudget.from_env()
+
+
+class LazySelectorRepairClient(SelectorRepairClient):
     """Defers provider client construction until a heal is actually needed."""
 
-    def __init__(self) -> None:
+    accepts_validator = True
+
+    def __init__(self, response_cache: ResponseCache | None = None) -> None:
         self.provider_name = os.getenv("LLM_PROVIDER", "openai").lower()
+        self.response_cache = response_cache
         self._client = None
 
-    def repair_selector(self, payload):
+    def repair_selector(self, payload, validator=None):
         if self._client is None:
             self._client = create_selector_repair_client()
+            if self.response_cache is not None:
+                self._client = CachingSelectorRepairClient(self._client, self.response_cache)
             self.provider_name = self._client.provider_name
-        return self._client.repair_selector(payload)
+        try:
+            if getattr(self._client, "accepts_validator", False):
+                selector = self._client.repair_selector(payload, validator=validator)
+                self.last_provider_name = getattr(self._client, "last_provider_name", "")
+                return selector
+            response = self._client.repair_selector(payload)
+            return validator(response) if validator else response
+        finally:
+            self.last_call_stats = getattr(self._client, "last_call_stats", None)
+
+
+class FakeDriver:
+    """Browser-free driver stand-in for unit-testing the healing pipeline."""
+
+    def __init__(self, page_source: str = "<html><body></body></html>", candidates=None, matches=None) -> None:
+        self.page_source = page_source
+        self.candidates = candidates or []
+        self.matches: dict[str, int] = matches or {}
+        self.find_calls: list[str | tuple[str, ...]] = []
+
+    def execute_script(self, script: str, *args):
+        if script == COLLECT_CANDIDATES_SCRIPT:
+            return self.candidates
+        if script == COUNT_SELECTOR_MATCHES_SCRIPT:
+            self.find_calls.append(tuple(selector for selector, _ in args[0]))
+            return [self.matches.get(selector, 0) for selector, _ in args[0]]
+        if script == UNIQUE_MATCH_OWNERS_SCRIPT:
+            # Elements are identified by selector, so only repeated selectors share one.
+            selectors = [selector for selector, _ in args[0]]
+            self.find_calls.append(tuple(selectors))
+            return [selectors.index(selector) if self.matches.get(selector) == 1 else -1 for selector in selectors]
+        return []
+
+    def find_elements(self, by, selector: str):
+        self.find_calls.append(selector)
+        return [object()] * self.matches.get(selector, 0)
+
+    def get_screenshot_as_png(self) -> bytes:
+        return b"\x89PNG\r\n"
+
+
+class ScriptedRepairClient:
+    """Returns canned selector responses and counts how often it was asked."""
+
+    provider_name = "scripted"
+
+    def __init__(self, *responses: str) -> None:
+        self.responses = list(responses)
+        self.calls = 0
+
+    def repair_selector(self, payload):
+        self.calls += 1
+        return self.responses[min(self.calls, len(self.responses)) - 1]
+
+
+LOGIN_CANDIDATES = [
+    {
+        "selector_hint": "#loginButtonMutated",
+        "tag": "button",
+        "text": "Sign In",
+        "attributes": {"id": "loginButtonMutated", "type": "submit", "class": "btn btn-login"},
+        "parent_tag": "form",
+        "rect": {"x": 320, "y": 410, "width": 200, "height": 44},
+        "styles": {"color": "rgb(255, 255, 255)"},
+    },
+    {
+        "selector_hint": "#forgot",
+        "tag": "a",
+        "text": "Forgot password?",
+        "attributes": {"id": "forgot", "href": "#"},
+        "parent_tag": "div",
+        "rect": {"x": 320, "y": 470, "width": 120, "height": 20},
+        "styles": {"color": "rgb(79, 70, 229)"},
+    },
+]
+# Login page selectors that still match when only the button and email input are redesigned.
+INTACT_LOGIN_SELECTORS = ("#toggleEmail", "#togglePhone", "#phone", "#password", "#googleLogin", "#githubLogin")
+
+
+def build_healer(suite_config, root, llm_client, **kwargs) -> Healer:
+    """A Healer that keeps its artifacts and audit log under `root`."""
+
+    return Healer(
+        suite_config,
+        llm_client,
+        DomMonitor(),
+        ArtifactManager(root),
+        HealingAuditLogger(root),
+        **kwargs,
+    )
+
+
+def healed_attempt(element_key: str, new_selector: str, old_selector: str = "#old") -> HealAttempt:
+    """A successful scripted heal as the healer audits it."""
+
+    return HealAttempt(element_key, old_selector, "NoSuchElementException", [], "scripted", new_selector, True)
+
+
+def run_in_threads(target: Callable[[Any], None], arguments: Iterable[Any]) -> None:
+    """Calls `target(argument)` on one thread per argument and waits for all of them."""
+
+    threads = [threading.Thread(target=target, args=(argument,)) for argument in arguments]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """Keep-alive request handler for local test servers, with JSON helpers and no access log."""
+
+    protocol_version = "HTTP/1.1"
+
+    def read_json(self) -> Any:
+        return json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+    def send_json(self, status: int, body: Any, headers: dict[str, str] | None = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@contextmanager
+def serve_http(handler_class: type[BaseHTTPRequestHandler]) -> Iterator[str]:
+    """Serves `handler_class` on a free local port and yields the server's base URL."""
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
 
 
 def require_reachable_base_url(suite_config) -> None:
@@ -61,6 +223,8 @@ def require_reachable_base_url(suite_config) -> None:
 
 def require_llm_credentials() -> None:
     provider = os.getenv("LLM_PROVIDER", "openai").lower()
+    if provider == "local":
+        return
     if provider == "openai" and not os.getenv("OPENAI_API_KEY"):
         pytest.skip("OPENAI_API_KEY is required for self-healing tests")
     if provider == "anthropic" and not os.getenv("ANTHROPIC_API_KEY"):
@@ -110,8 +274,18 @@ def managed_runtime(suite_config, browser_name: str) -> Iterator[FrameworkRuntim
     dom_monitor.install(driver)
     artifact_manager = ArtifactManager()
     audit_logger = HealingAuditLogger()
-    llm_client = LazySelectorRepairClient()
-    healer = Healer(suite_config, llm_client, dom_monitor, artifact_manager, audit_logger)
+    llm_client = LazySelectorRepairClient(ResponseCache.from_env(artifact_manager.cache_root / "llm_responses"))
+    heal_cache = HealCache(artifact_manager.cache_root / "heal_cache.json")
+    healer = Healer(
+        suite_config,
+        llm_client,
+        dom_monitor,
+        artifact_manager,
+        audit_logger,
+        heal_cache,
+        single_flight=SingleFlight(artifact_manager.cache_root / "single_flight"),
+        heal_budget=RUN_HEAL_BUDGET,
+    )
     finder = SafeFinder(driver, suite_config, dom_monitor, healer, audit_logger)
     actions = SafeActions(driver, finder, healer)
     runtime = FrameworkRuntime(
@@ -129,6 +303,8 @@ def managed_runtime(suite_config, browser_name: str) -> Iterator[FrameworkRuntim
     finally:
         time.sleep(1)
         driver.quit()
+        artifact_manager.close()
+        audit_logger.close()
 
 
 def open_login_page(runtime: FrameworkRuntime, suite_config) -> None:
@@ -682,14 +858,10 @@ def assert_authenticated_state(runtime: FrameworkRuntime, base_url: str) -> None
 
 
 def healing_log_contains(element_key: str, root: str | Path = "artifacts") -> bool:
-    path = Path(root) / "healed_elements.json"
-    if not path.exists():
-        return False
-    payloads = json.loads(path.read_text(encoding="utf-8"))
-    for payload in payloads:
-        if payload.get("element_key") == element_key and payload.get("success"):
-            return True
-    return False
+    return any(
+        payload.get("element_key") == element_key and payload.get("success")
+        for payload in HealingAuditLogger(root).iter_attempts()
+    )
 
 
 def _send_keys_if_present(runtime: FrameworkRuntime, by: str, selector: str, value: str) -> None:
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import copy
+import random
+
+from benchmarks.load import run_load
+from benchmarks.mock_llm import MockLLMServer, build_mock_client
+from benchmarks.scoring import compare_results, run_benchmarks
+from benchmarks.synthetic import synthetic_candidates
+from framework.llm.prompts import build_system_prompt, estimate_tokens
+from framework.utils.scoring import score_candidates
+
+
+def test_undrifted_target_ranks_first(suite_config):
+    element_definition = suite_config.get_element("login_button")
+    candidates, target_index = synthetic_candidates(element_definition, 200, 0.0, random.Random(1))
+    target = candidates[target_index]
+    assert score_candidates(element_definition, candidates)[0] is target
+
+
+def test_benchmark_report_and_regression_check(suite_config):
+    report = run_benchmarks(suite_config, sizes=[50], drifts=[0.0], trials=1, element_keys=["login_button"])
+    benchmarks = {item["benchmark"] for item in report["results"]}
+    assert benchmarks == {"score_candidates", "extract_candidate_elements", "build_dom_snippet"}
+    scoring = next(item for item in report["results"] if item["benchmark"] == "score_candidates")
+    assert scoring["top_k_accuracy"]["1"] == 1.0
+
+    slower = copy.deepcopy(report)
+    for item in slower["results"]:
+        item["median_seconds"] = item["median_seconds"] * 10 + 1
+    assert compare_results(report, report) == []
+    assert len(compare_results(report, slower)) == len(report["results"])
+
+
+def test_mock_llm_server_speaks_every_provider_format():
+    payload = {"mode": "target_repair", "failed_element_key": "login_button", "top_ranked_candidates": []}
+    with MockLLMServer(answers={"login_button": "#loginButton"}) as server:
+        for provider in ("openai", "anthropic", "gemini", "azure_openai"):
+            client = build_mock_client(provider, server.url)
+            assert client.repair_selector(payload) == "#loginButton"
+            stats = client.last_call_stats
+            assert (stats.provider, stats.model, stats.retries) == (provider, "mock-model", 0)
+            # Token counts come from the usage block the server reports for this request.
+            expected_prompt_tokens = estimate_tokens(build_system_prompt(payload)) + estimate_tokens(
+                client.last_prompt.text
+            )
+            assert (stats.prompt_tokens, stats.completion_tokens) == (
+                expected_prompt_tokens,
+                estimate_tokens("#loginButton"),
+            )
+            assert stats.tokens_estimated is False
+
+            client.stream_responses = True
+            assert client.repair_selector(payload) == "#loginButton"
+            assert client.last_call_stats.tokens_estimated is True
+            assert server.stats[f"requests:{provider}"] == 2
+        assert server.stats["responses:200"] == 8
+        assert server.stats["injected:429"] == server.stats["injected:500"] == 0
+
+
+def test_load_harness_reports_tail_latency_through_injected_rate_limits(suite_config, monkeypatch):
+    monkeypatch.setenv("LLM_RETRY_MAX_ATTEMPTS", "10")
+    with MockLLMServer(latency="uniform:0,0.01", rate_limit_rate=0.3, retry_after_seconds=0) as server:
+        report = run_load(
+            suite_config,
+            build_mock_client("openai", server.url),
+            requests=12,
+            concurrency=4,
+            page_size=20,
+            element_keys=["login_button", "login_email_input"],
+        )
+        assert server.stats["injected:429"] > 0
+    assert report["succeeded"] == 12 and report["failed"] == 0
+    assert report["audit_write_errors"] == 0
+    assert report["latency_seconds"]["p50"] <= report["latency_seconds"]["p99"]
+    assert report["throughput_per_second"] > 0
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import json
+from pathlib import Path
 
 from framework.llm.client import AzureOpenAISelectorRepairClient, GeminiSelectorRepairClient, create_selector_repair_client
 from framework.config.loader import ConfigLoader
-from framework.llm.parser import infer_selector_type, parse_selector_response
+from framework.config.shards import split_elements
+from framework.llm.parser import infer_selector_type, parse_ranked_selector_response, parse_selector_response
+from framework.llm.prompts import build_user_prompt, encode_user_prompt
 from framework.utils.scoring import score_candidates
 
 
@@ -49,6 +52,85 @@ def test_config_loader_validates_json(tmp_path):
     assert config.get_element("login_button").selector == "#login"
 
 
+def test_config_loader_reuses_compiled_config_until_inputs_change(tmp_path, monkeypatch):
+    config_path = tmp_path / "suite.json"
+    payload = {
+        "environment": {"base_url": "${SUITE_BASE_URL}", "api_base_url": "http://localhost:8080",
+                        "browser_matrix": ["chrome"], "default_timeout_seconds": 5, "headless": True},
+        "credentials": {"email": "a@example.com", "phone": "+10000000000", "password": "${SUITE_PASSWORD}"},
+        "elements": [
+            {
+                "key": "login_button",
+                "intended_role": "button",
+                "selector_type": "css",
+                "selector": "#login",
+                "fallback_selectors": [],
+                "historical_metadata": {"parent_tag": "form", "location": {"x": 1, "y": 2}, "color": "rgb(0, 0, 0)"},
+            }
+        ],
+        "scenarios": {},
+    }
+    config_path.write_text(json.dumps(payload), encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("SUITE_BASE_URL", "http://one.test")
+    monkeypatch.setenv("SUITE_PASSWORD", "hunter2-secret")
+
+    first = ConfigLoader.load(config_path, cache_dir=cache_dir)
+    first.get_element("login_button").selector = "#mutated"
+    ConfigLoader._memory.clear()
+    second = ConfigLoader.load(config_path, cache_dir=cache_dir)
+    assert second.get_element("login_button").selector == "#login"
+    assert second.credentials.password == "hunter2-secret"
+
+    (cache_file,) = cache_dir.glob("*.pickle")
+    assert cache_file.stat().st_mode & 0o777 == 0o600
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    assert b"hunter2-secret" not in cache_file.read_bytes()
+    assert b"one.test" not in cache_file.read_bytes()
+    cache_file.chmod(0o644)
+    assert ConfigLoader._read_entry(cache_file) is None
+    cache_file.chmod(0o600)
+    assert ConfigLoader._read_entry(cache_file) is not None
+
+    monkeypatch.setenv("SUITE_BASE_URL", "http://two.test")
+    assert ConfigLoader.load(config_path, cache_dir=cache_dir).environment.base_url == "http://two.test"
+
+    payload["elements"][0]["selector"] = "#signin"
+    config_path.write_text(json.dumps(payload), encoding="utf-8")
+    assert ConfigLoader.load(config_path, cache_dir=cache_dir).get_element("login_button").selector == "#signin"
+
+
+def test_config_cache_skips_placeholders_under_keys_the_model_ignores(tmp_path, monkeypatch):
+    config_path = tmp_path / "suite.json"
+    payload = json.loads((Path(__file__).parents[1] / "config" / "test_suite.json").read_text(encoding="utf-8"))
+    payload["environment"]["notes"] = "${HOME}"
+    payload["environment"]["base_url"] = "${SUITE_BASE_URL}"
+    config_path.write_text(json.dumps(payload), encoding="utf-8")
+    monkeypatch.setenv("SUITE_BASE_URL", "http://one.test")
+
+    for _ in range(2):
+        ConfigLoader._memory.clear()
+        config = ConfigLoader.load(config_path, cache_dir=tmp_path / "cache")
+        assert config.environment.base_url == "http://one.test"
+        assert not hasattr(config.environment, "notes")
+    assert list((tmp_path / "cache").glob("*.pickle"))
+
+
+def test_sharded_elements_load_on_first_access(tmp_path):
+    config_path = tmp_path / "suite.json"
+    config_path.write_text((Path(__file__).parents[1] / "config" / "test_suite.json").read_text(encoding="utf-8"))
+    split_elements(config_path, tmp_path / "elements")
+
+    for _ in range(2):
+        config = ConfigLoader.load(config_path, cache_dir=tmp_path / "cache")
+        shards = config._element_shards
+        assert config.elements == [] and shards.loaded_pages == []
+        assert "login_button" in config.element_keys()
+        assert config.get_element("login_button").page == "login"
+        assert shards.loaded_pages == ["login"]
+        assert {element.key for element in config.elements_for_page("login")} >= {"login_button", "login_email_input"}
+
+
 def test_selector_parser_accepts_css_and_xpath():
     css_selector, css_type = parse_selector_response("#login-button")
     xpath_selector, xpath_type = parse_selector_response("//button[@type='submit']")
@@ -111,3 +193,48 @@ def test_selector_client_factory_supports_azure_openai(monkeypatch):
     client = create_selector_repair_client()
     assert isinstance(client, AzureOpenAISelectorRepairClient)
     assert client.provider_name == "azure_openai"
+
+
+def test_ranked_selector_parser_orders_by_confidence():
+    ranked = parse_ranked_selector_response(
+        '[{"selector": "#a", "confidence": 0.4}, {"selector": "//button[@type=\'submit\']", "confidence": 0.9},'
+        ' {"selector": "#a", "confidence": 0.3}, {"selector": "bad\\nselector", "confidence": 1}]'
+    )
+    assert [(item.selector, item.selector_type) for item in ranked] == [
+        ("//button[@type='submit']", "xpath"),
+        ("#a", "css"),
+    ]
+    assert parse_ranked_selector_response("#only")[0].confidence == 1.0
+
+
+def test_compact_prompt_encoding_shrinks_and_trims_to_budget():
+    candidate = {
+        "selector_hint": "#email",
+        "tag": "input",
+        "text": "",
+        "attributes": {"id": "email", "type": "email", "class": ""},
+        "parent_tag": "form",
+        "rect": {"x": 10.2, "y": 20.7, "width": 300, "height": 40},
+        "styles": {"color": "rgb(0, 0, 0)", "background_color": "rgb(255, 255, 255)"},
+        "heuristic_score": 0.87654321,
+    }
+    payload = {
+        "mode": "target_repair",
+        "failed_element_key": "email_input",
+        "top_ranked_candidates": [dict(candidate, selector_hint=f"#c{i}") for i in range(5)],
+        "dom_snippet": json.dumps({"candidate_hints": ["#c0"], "page_source_excerpt": "<div>" * 2000}, indent=2),
+        "mutation_events": [{"type": "childList", "targetTag": "div"}] * 20,
+    }
+
+    encoded = encode_user_prompt(payload)
+    decoded = json.loads(encoded.text)
+    assert encoded.estimated_tokens < encoded.original_tokens
+    assert decoded["key"] == "email_input"
+    assert decoded["candidates"]["rows"][0][0] == "#c0"
+    assert decoded["candidates"]["rows"][0][5] == [10, 21, 300, 40]
+
+    trimmed = encode_user_prompt(payload, token_budget=400)
+    assert trimmed.estimated_tokens <= 400
+    assert trimmed.trimmed[:3] == ["mutations", "styles", "rect"]
+    assert len(payload["mutation_events"]) == 20
+    assert build_user_prompt(payload, token_budget=400) == trimmed.text
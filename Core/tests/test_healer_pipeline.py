@@ -0,0 +1,519 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, NoSuchWindowException
+
+from framework.core import heal_cache as heal_cache_module
+from framework.core.budget import HealBudget
+from framework.core.dom_monitor import DomMonitor
+from framework.core.exceptions import HealBudgetExceededError, HealingError
+from framework.core.finder import SafeFinder
+from framework.core.heal_cache import HealCache
+from framework.core.single_flight import SingleFlight
+from framework.llm.client import create_selector_repair_client
+from framework.llm.local_client import LocalHeuristicSelectorRepairClient
+from framework.logging.artifacts import ArtifactManager, CapturePolicy
+from framework.logging.audit import HealingAuditLogger
+from framework.logging.audit_store import SQLiteAuditStore
+from framework.logging.background import BackgroundWriter
+from framework.logging.overrides import SelectorOverrideRegistry
+from framework.utils.dom_extract import COUNT_SELECTOR_MATCHES_SCRIPT
+from tests.helpers import (
+    INTACT_LOGIN_SELECTORS,
+    LOGIN_CANDIDATES,
+    FakeDriver,
+    ScriptedRepairClient,
+    build_healer,
+    healed_attempt,
+    run_in_threads,
+)
+
+def test_heal_cache_skips_llm_on_repeated_heal(suite_config, tmp_path):
+    cache_path = tmp_path / "cache" / "heal_cache.json"
+    driver = FakeDriver(candidates=LOGIN_CANDIDATES, matches={"#loginButtonMutated": 1})
+    first_client = ScriptedRepairClient("#loginButtonMutated")
+    first = build_healer(suite_config, tmp_path, first_client, heal_cache=HealCache(cache_path))
+    assert first.recover(driver, "login_button", NoSuchElementException("gone")) == "#loginButtonMutated"
+
+    second_client = ScriptedRepairClient("#unused")
+    second = build_healer(suite_config, tmp_path, second_client, heal_cache=HealCache(cache_path))
+    assert second.recover(driver, "login_button", NoSuchElementException("gone")) == "#loginButtonMutated"
+    assert first_client.calls == 1
+    assert second_client.calls == 0
+    assert HealingAuditLogger(tmp_path).read_attempts()[-1]["llm_provider"] == "heal_cache"
+
+
+def test_heal_cache_entry_invalidated_when_it_no_longer_matches(suite_config, tmp_path):
+    cache = HealCache(tmp_path / "heal_cache.json")
+    driver = FakeDriver(candidates=LOGIN_CANDIDATES, matches={"#fresh": 1})
+    client = ScriptedRepairClient("#fresh")
+    healer = build_healer(suite_config, tmp_path, client, heal_cache=cache)
+    healer.recover(driver, "login_button", NoSuchElementException("gone"))
+    fingerprint = HealingAuditLogger(tmp_path).read_attempts()[-1]["page_fingerprint"]
+    cache.put("login_button", fingerprint, "#stale")
+
+    assert healer.recover(driver, "login_button", NoSuchElementException("gone")) == "#fresh"
+    assert client.calls == 2
+    assert cache.get("login_button", fingerprint) == "#fresh"
+
+
+def test_heal_cache_evicts_least_recently_used_and_expired(tmp_path):
+    cache = HealCache(tmp_path / "heal_cache.json", max_entries=2)
+    cache.put("a", "fp", "#a")
+    cache.put("b", "fp", "#b")
+    assert cache.get("a", "fp") == "#a"
+    cache.put("c", "fp", "#c")
+    assert cache.get("b", "fp") is None
+    assert cache.get("a", "fp") == "#a"
+
+    expired = HealCache(tmp_path / "heal_cache.json", ttl_seconds=-1)
+    assert expired.get("c", "fp") == "#c"
+    expired.ttl_seconds = 1e-9
+    assert expired.get("c", "fp") is None
+
+
+def test_heal_cache_eviction_counts_hits_from_other_workers(tmp_path, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(heal_cache_module, "time", SimpleNamespace(time=lambda: next(clock)))
+    path = tmp_path / "heal_cache.json"
+    writer, reader = HealCache(path, max_entries=3), HealCache(path, max_entries=3)
+    writer.put("hot", "fp", "#hot")
+    writer.put("cold", "fp", "#cold")
+    assert reader.get("hot", "fp") == "#hot"
+    # Another worker rewrites the file before this one writes its touch back.
+    writer.put("other", "fp", "#other")
+    reader.put("new", "fp", "#new")
+
+    fresh = HealCache(path, max_entries=3)
+    assert fresh.get("cold", "fp") is None
+    assert fresh.get("hot", "fp") == "#hot"
+    assert json.loads(path.read_text(encoding="utf-8"))[HealCache.cache_key("hot", "fp")]["hits"] == 1
+
+
+def test_heal_cache_workers_sharing_a_file_keep_each_others_entries(tmp_path):
+    path = tmp_path / "heal_cache.json"
+
+    def put_all(worker: int) -> None:
+        # Each worker has its own instance, as separate processes would.
+        cache = HealCache(path)
+        for index in range(8):
+            cache.put(f"key-{worker}-{index}", "fp", f"#k{worker}-{index}")
+
+    run_in_threads(put_all, range(4))
+    assert len(HealCache(path)) == 32
+
+
+def test_artifacts_are_persisted_by_background_writer(suite_config, tmp_path):
+    driver = FakeDriver(page_source="<html>drifted</html>", candidates=LOGIN_CANDIDATES, matches={"#ok": 1})
+    healer = build_healer(suite_config, tmp_path, ScriptedRepairClient("#ok"))
+    healer.recover(driver, "login_button", NoSuchElementException("gone"))
+
+    paths = HealingAuditLogger(tmp_path).read_attempts()[-1]["artifact_paths"]
+    assert healer.artifact_manager.flush(timeout=5)
+    assert healer.artifact_manager.writer.errors == []
+    assert healer.artifact_manager.read_dom_snapshot(paths["dom_snapshot"]) == "<html>drifted</html>"
+    assert Path(paths["screenshot"]).read_bytes().startswith(b"\x89PNG")
+
+
+def test_identical_dom_snapshots_are_stored_once_compressed(suite_config, tmp_path, monkeypatch):
+    monkeypatch.setenv("DOM_SNAPSHOT_COMPRESSION", "lzma")
+    page_source = "<html>" + "<div class='row'>drifted</div>" * 200 + "</html>"
+    driver = FakeDriver(page_source=page_source, candidates=LOGIN_CANDIDATES, matches={"#ok": 1})
+    healer = build_healer(suite_config, tmp_path, ScriptedRepairClient("#ok", "#ok"))
+    healer.recover(driver, "login_button", NoSuchElementException("gone"))
+    healer.recover(driver, "login_email_input", NoSuchElementException("gone"))
+
+    first, second = HealingAuditLogger(tmp_path).read_attempts()[-2:]
+    assert first["artifact_paths"]["dom_snapshot"] == second["artifact_paths"]["dom_snapshot"]
+    assert healer.artifact_manager.read_dom_snapshot(second["artifact_paths"]["dom_snapshot"]) == page_source
+    blobs = list(healer.artifact_manager.dom_blobs.root.rglob("*.xz"))
+    assert len(blobs) == 1
+    assert blobs[0].stat().st_size < len(page_source) / 10
+
+
+def test_failed_dom_snapshot_write_is_retried_and_reported(tmp_path, monkeypatch):
+    manager = ArtifactManager(tmp_path)
+    put = manager.dom_blobs.put
+    failures = [OSError("disk full")]
+
+    def flaky_put(data, ref=None):
+        if failures:
+            raise failures.pop()
+        return put(data, ref)
+
+    monkeypatch.setattr(manager.dom_blobs, "put", flaky_put)
+    ref = manager.write_dom_snapshot("login_button", "<html>drifted</html>")
+    manager.flush()
+    assert ref not in manager.dom_blobs
+    with pytest.warns(RuntimeWarning, match="artifact-writer job failed: OSError: disk full"):
+        BackgroundWriter.drain_all()
+
+    # The ref was dropped with the failed write, so the same content is stored again.
+    assert manager.write_dom_snapshot("login_button", "<html>drifted</html>") == ref
+    assert manager.read_dom_snapshot(ref) == "<html>drifted</html>"
+    manager.close()
+
+
+def test_capture_policy_skips_successful_heals_and_repeat_fingerprints(suite_config, tmp_path):
+    driver = FakeDriver(candidates=LOGIN_CANDIDATES, matches={"#ok": 1})
+    healer = build_healer(
+        suite_config,
+        tmp_path,
+        ScriptedRepairClient("#ok", "#missing", "#ok"),
+        capture_policy=CapturePolicy.parse("on_failure"),
+    )
+    healer.recover(driver, "login_button", NoSuchElementException("gone"))
+    with pytest.raises(HealingError):
+        healer.recover(driver, "login_button", NoSuchElementException("gone"))
+    succeeded, failed = HealingAuditLogger(tmp_path).read_attempts()
+    assert succeeded["artifact_paths"] == {
+        "capture_policy": "on_failure",
+        "skipped": "dom_snapshot,screenshot",
+        "skip_reason": "heal succeeded",
+    }
+    assert set(failed["artifact_paths"]) == {"dom_snapshot", "screenshot"}
+
+    healer.capture_policy = CapturePolicy.parse("first_occurrence")
+    healer.recover(driver, "login_button", NoSuchElementException("gone"))
+    healer.recover(driver, "login_button", NoSuchElementException("gone"))
+    first, repeat = HealingAuditLogger(tmp_path).read_attempts()[-2:]
+    assert "screenshot" in first["artifact_paths"]
+    assert repeat["artifact_paths"]["skip_reason"] == "already captured for fingerprint"
+    assert CapturePolicy.parse("sampled:5") == CapturePolicy("sampled", 5.0)
+
+
+def test_failed_screenshot_is_audited_without_hiding_the_heal_error(suite_config, tmp_path):
+    class ClosedWindowDriver(FakeDriver):
+        def get_screenshot_as_png(self) -> bytes:
+            raise NoSuchWindowException("window already closed")
+
+    driver = ClosedWindowDriver(candidates=LOGIN_CANDIDATES)
+    healer = build_healer(suite_config, tmp_path, ScriptedRepairClient("#missing"))
+    with pytest.raises(HealingError, match="did not match"):
+        healer.recover(driver, "login_button", NoSuchElementException("gone"))
+
+    attempt = HealingAuditLogger(tmp_path).read_attempts()[-1]
+    assert attempt["success"] is False
+    assert attempt["error"].startswith("SelectorValidationError")
+    assert "dom_snapshot" in attempt["artifact_paths"]
+    assert "screenshot" not in attempt["artifact_paths"]
+    assert attempt["artifact_paths"]["capture_error"] == (
+        "screenshot: NoSuchWindowException: Message: window already closed\n"
+    )
+
+
+def test_ranked_response_keeps_best_unique_selector(suite_config, tmp_path):
+    driver = FakeDriver(candidates=LOGIN_CANDIDATES, matches={"button": 3, ".btn-login": 1})
+    response = (
+        '[{"selector": "#gone", "confidence": 0.95},'
+        ' {"selector": "button", "confidence": 0.8},'
+        ' {"selector": ".btn-login", "confidence": 0.6}]'
+    )
+    client = ScriptedRepairClient(response)
+    healer = build_healer(suite_config, tmp_path, client, response_format="ranked")
+    assert healer.recover(driver, "login_button", NoSuchElementException("gone")) == ".btn-login"
+    assert driver.find_calls == [("#gone", "button", ".btn-login")]
+    assert client.calls == 1
+
+
+def test_concurrent_heals_share_one_llm_call(suite_config, tmp_path):
+    class SlowClient(ScriptedRepairClient):
+        def repair_selector(self, payload):
+            time.sleep(0.2)
+            return super().repair_selector(payload)
+
+    clients = [SlowClient("#loginButtonMutated") for _ in range(4)]
+    results: list[str] = []
+
+    def heal(client) -> None:
+        healer = build_healer(
+            suite_config,
+            tmp_path / f"worker{clients.index(client)}",
+            client,
+            single_flight=SingleFlight(tmp_path / "single_flight"),
+        )
+        driver = FakeDriver(candidates=LOGIN_CANDIDATES, matches={"#loginButtonMutated": 1})
+        results.append(healer.recover(driver, "login_button", NoSuchElementException("gone")))
+
+    run_in_threads(heal, clients)
+    assert results == ["#loginButtonMutated"] * 4
+    assert sum(client.calls for client in clients) == 1
+
+
+def test_single_flight_only_shares_with_callers_that_waited(tmp_path):
+    flights = SingleFlight(tmp_path, wait_timeout=5)
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[str] = []
+    results: list[tuple[str, bool]] = []
+
+    def slow_work() -> str:
+        calls.append("leader")
+        started.set()
+        release.wait(5)
+        return "#shared"
+
+    leader = threading.Thread(target=lambda: results.append(flights.run("key", slow_work, bool)))
+    leader.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lambda: results.append(flights.run("key", lambda: "#own", bool)))
+    waiter.start()
+    time.sleep(0.1)
+    release.set()
+    leader.join()
+    waiter.join()
+    assert sorted(results) == [("#shared", False), ("#shared", True)]
+    assert calls == ["leader"]
+
+    # The flight is over: a later caller runs its own work instead of replaying the old result.
+    assert flights.run("key", lambda: "#fresh", bool) == ("#fresh", False)
+    assert not list(tmp_path.glob("*.flight"))
+
+    # Results nobody can still be waiting for are swept by the next leader.
+    assert len(list(tmp_path.glob("*.result"))) == 2
+    flights.wait_timeout = 0
+    flights.run("other", lambda: "#other", bool)
+    assert len(list(tmp_path.glob("*.result"))) == 1
+
+
+def test_spent_heal_budget_fails_fast_with_audit_entry(suite_config, tmp_path):
+    budget = HealBudget(total_seconds=1.0)
+    budget.charge(1.5)
+    client = ScriptedRepairClient("#ok")
+    healer = build_healer(suite_config, tmp_path, client, heal_budget=budget)
+    driver = FakeDriver(candidates=LOGIN_CANDIDATES, matches={"#ok": 1})
+    with pytest.raises(HealBudgetExceededError):
+        healer.recover(driver, "login_button", NoSuchElementException("gone"))
+    assert client.calls == 0
+    assert HealingAuditLogger(tmp_path).read_attempts()[-1]["error"].startswith("HealBudgetExceededError")
+
+
+def test_finder_heals_every_broken_element_of_the_page_in_one_call(suite_config, tmp_path):
+    driver = FakeDriver(
+        candidates=LOGIN_CANDIDATES,
+        matches={**dict.fromkeys(INTACT_LOGIN_SELECTORS, 1), "#loginButtonMutated": 1, "#emailMutated": 1},
+    )
+    client = ScriptedRepairClient('{"login_button": "#loginButtonMutated", "login_email_input": "#emailMutated"}')
+    healer = build_healer(suite_config, tmp_path, client)
+    audit_logger = HealingAuditLogger(tmp_path)
+    finder = SafeFinder(driver, suite_config, DomMonitor(), healer, audit_logger)
+
+    assert finder.find("login_button", timeout=0.01) is not None
+    assert client.calls == 1
+    assert finder.selector_overrides == {
+        "login_button": "#loginButtonMutated",
+        "login_email_input": "#emailMutated",
+    }
+    attempts = audit_logger.read_attempts()
+    assert [(item["element_key"], item["success"]) for item in attempts] == [
+        ("login_button", True),
+        ("login_email_input", True),
+    ]
+    assert attempts[0]["artifact_paths"] == attempts[1]["artifact_paths"]
+
+
+@pytest.mark.parametrize(
+    "batch_response",
+    [
+        '{"login_email_input": "#emailMutated"}',
+        '{"login_button": "#stillMissing"}',
+        '{"login_button": ".btn", "login_email_input": "#emailMutated"}',
+        '{"login_button": "#emailMutated", "login_email_input": "#emailMutated"}',
+    ],
+    ids=["key_left_out", "batch_raises", "ambiguous_match", "shared_element"],
+)
+def test_finder_heals_alone_when_the_batch_does_not_heal_its_key(suite_config, tmp_path, batch_response):
+    driver = FakeDriver(
+        candidates=LOGIN_CANDIDATES,
+        matches={
+            **dict.fromkeys(INTACT_LOGIN_SELECTORS, 1),
+            "#loginButtonMutated": 1,
+            "#emailMutated": 1,
+            ".btn": 2,
+        },
+    )
+    client = ScriptedRepairClient(batch_response, "#loginButtonMutated")
+    healer = build_healer(suite_config, tmp_path, client)
+    audit_logger = HealingAuditLogger(tmp_path)
+    finder = SafeFinder(driver, suite_config, DomMonitor(), healer, audit_logger)
+
+    assert finder.find("login_button", timeout=0.01) is not None
+    assert client.calls == 2
+    assert finder.selector_overrides["login_button"] == "#loginButtonMutated"
+    assert audit_logger.read_attempts()[-1]["element_key"] == "login_button"
+
+
+def test_finder_skips_the_batch_when_match_counts_come_back_short(suite_config, tmp_path):
+    class ShortCountsDriver(FakeDriver):
+        def execute_script(self, script, *args):
+            counts = super().execute_script(script, *args)
+            return counts[:-1] if script == COUNT_SELECTOR_MATCHES_SCRIPT else counts
+
+    driver = ShortCountsDriver(candidates=LOGIN_CANDIDATES, matches={"#loginButtonMutated": 1})
+    client = ScriptedRepairClient("#loginButtonMutated")
+    finder = SafeFinder(
+        driver, suite_config, DomMonitor(), build_healer(suite_config, tmp_path, client), HealingAuditLogger(tmp_path)
+    )
+
+    assert finder._missing_page_siblings("login_button") == []
+    assert finder.find("login_button", timeout=0.01) is not None
+    assert client.calls == 1
+
+
+def test_local_heuristic_provider_heals_without_network(suite_config, tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "local")
+    client = create_selector_repair_client()
+    assert isinstance(client, LocalHeuristicSelectorRepairClient)
+
+    candidates = [
+        dict(LOGIN_CANDIDATES[0], attributes={"id": "btn-93841", "name": "login", "type": "submit"}),
+        LOGIN_CANDIDATES[1],
+    ]
+    driver = FakeDriver(candidates=candidates, matches={"//button[normalize-space()='Sign In']": 1})
+    healer = build_healer(suite_config, tmp_path, client)
+    assert healer.recover(driver, "login_button", NoSuchElementException("gone")) == (
+        "//button[normalize-space()='Sign In']"
+    )
+    assert driver.find_calls[:2] == ['button[name="login"]', "//button[normalize-space()='Sign In']"]
+    attempt = HealingAuditLogger(tmp_path).read_attempts()[-1]
+    assert attempt["llm_provider"] == "local"
+    assert attempt["llm_telemetry"]["provider"] == "local"
+    assert attempt["llm_telemetry"]["latency_seconds"] < 1
+
+
+def test_audit_log_appends_lines_concurrently_and_compacts(tmp_path):
+    audit_logger = HealingAuditLogger(tmp_path, compact_every=0)
+
+    def append(worker: int) -> None:
+        for index in range(25):
+            audit_logger.append({"element_key": f"key-{worker}-{index}", "success": True})
+
+    run_in_threads(append, range(4))
+    with audit_logger.healed_elements_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"element_key": "torn"\n')
+
+    attempts = list(audit_logger.iter_attempts())
+    assert len(attempts) == 100
+    assert len({attempt["element_key"] for attempt in attempts}) == 100
+
+    trimming_logger = HealingAuditLogger(tmp_path, compact_every=1, max_entries=10)
+    trimming_logger.append({"element_key": "latest", "success": False})
+    lines = trimming_logger.healed_elements_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 10
+    assert trimming_logger.read_attempts()[-1]["element_key"] == "latest"
+
+
+def test_sqlite_audit_store_backs_logger_and_finder(suite_config, tmp_path, monkeypatch):
+    monkeypatch.setenv("HEAL_AUDIT_STORE", "sqlite")
+    writers = [HealingAuditLogger(tmp_path) for _ in range(4)]
+    assert all(isinstance(writer.store, SQLiteAuditStore) for writer in writers)
+
+    def heal(index: int) -> None:
+        writer = writers[index]
+        for attempt in range(10):
+            writer.store.append_attempt(
+                {"element_key": f"key-{index}", "success": True, "new_selector": f"#k{index}-{attempt}"},
+                override=f"#k{index}-{attempt}",
+            )
+
+    run_in_threads(heal, range(4))
+
+    audit_logger = HealingAuditLogger(tmp_path)
+    assert len(audit_logger.read_attempts()) == 40
+    assert len(list(audit_logger.store.iter_attempts(element_key="key-2"))) == 10
+    finder = SafeFinder(FakeDriver(), suite_config, DomMonitor(), None, audit_logger)
+    assert finder.selector_overrides == {f"key-{index}": f"#k{index}-9" for index in range(4)}
+
+    audit_logger.export()
+    assert len(audit_logger.healed_elements_path.read_text(encoding="utf-8").splitlines()) == 40
+    for writer in [*writers, audit_logger]:
+        writer.close()
+
+
+def test_sqlite_loggers_of_one_root_share_store_and_overrides(suite_config, tmp_path, monkeypatch):
+    monkeypatch.setenv("HEAL_AUDIT_STORE", "sqlite")
+    first = HealingAuditLogger(tmp_path, background=True)
+    finder = SafeFinder(FakeDriver(), suite_config, DomMonitor(), None, first)
+    first.write(healed_attempt("login_button", "#new"))
+
+    second = HealingAuditLogger(tmp_path, background=True)
+    assert second.store is first.store
+    assert second.overrides is first.overrides is finder.selector_overrides
+    # Remembered before the batch reached SQLite, and still there after another logger was built.
+    assert finder.selector_overrides.get("login_button") == "#new"
+    second.flush()
+    assert second.store.overrides() == {"login_button": "#new"}
+    first.close()
+
+
+def test_sqlite_override_deletes_reach_the_store(tmp_path):
+    registry = SelectorOverrideRegistry(tmp_path, SQLiteAuditStore(tmp_path / "audit.sqlite3"))
+    # A separate store has its own connection, as another process would.
+    other_worker = SelectorOverrideRegistry(tmp_path, SQLiteAuditStore(tmp_path / "audit.sqlite3"))
+    registry["login_button"] = "#new"
+    registry["login_email_input"] = "#email"
+    assert other_worker["login_button"] == "#new"
+
+    del registry["login_button"]
+    assert registry.store.overrides() == {"login_email_input": "#email"}
+    registry.refresh()
+    assert dict(registry) == {"login_email_input": "#email"}
+    assert dict(other_worker) == {"login_email_input": "#email"}
+    registry.store.close()
+    other_worker.store.close()
+
+
+def test_override_log_is_compacted_to_one_line_per_key(tmp_path):
+    audit_logger = HealingAuditLogger(tmp_path, background=False)
+    for index in range(5):
+        audit_logger.write(healed_attempt("login_button", f"#new-{index}"))
+    other_worker = SelectorOverrideRegistry(tmp_path)
+    assert other_worker["login_button"] == "#new-4"
+    assert len(audit_logger.overrides.log_path.read_text(encoding="utf-8").splitlines()) == 5
+
+    audit_logger.export()
+    assert audit_logger.overrides.log_path.read_text(encoding="utf-8").splitlines() == [
+        '{"key":"login_button","selector":"#new-4"}'
+    ]
+    other_worker["login_email_input"] = "#email"
+    assert audit_logger.read_overrides() == {"login_button": "#new-4", "login_email_input": "#email"}
+
+
+def test_audit_writes_are_batched_off_the_test_thread(tmp_path, monkeypatch):
+    monkeypatch.setenv("HEAL_AUDIT_BATCH_SIZE", "3")
+    monkeypatch.setenv("HEAL_AUDIT_FLUSH_INTERVAL_SECONDS", "60")
+    audit_logger = HealingAuditLogger(tmp_path, background=True, durability="fsync")
+
+    audit_logger.write(healed_attempt("key-0", "#new-0"))
+    audit_logger.write(healed_attempt("key-1", "#new-1"))
+    assert not audit_logger.healed_elements_path.exists()
+    audit_logger.write(healed_attempt("key-2", "#new-2"))
+    audit_logger.write(healed_attempt("key-3", "#new-3"))
+
+    reader = HealingAuditLogger(tmp_path, background=True)
+    assert [item["element_key"] for item in reader.read_attempts()] == [f"key-{index}" for index in range(4)]
+    assert reader.read_overrides()["key-3"] == "#new-3"
+    assert not audit_logger.batcher.errors
+
+
+def test_finder_sees_overrides_persisted_by_another_process(suite_config, tmp_path):
+    audit_logger = HealingAuditLogger(tmp_path, background=False)
+    finder = SafeFinder(FakeDriver(), suite_config, DomMonitor(), None, audit_logger)
+    # A registry that is not the process-wide one stands in for another worker.
+    other_worker = SelectorOverrideRegistry(tmp_path)
+
+    other_worker["login_button"] = "#loginButtonMutated"
+    assert finder.selector_overrides.get("login_button") == "#loginButtonMutated"
+    assert finder._selector_specs("login_button")[0][1] == "#loginButtonMutated"
+
+    audit_logger.write(healed_attempt("login_email_input", "#emailMutated", old_selector="#email"))
+    assert other_worker["login_email_input"] == "#emailMutated"
+    audit_logger.export()
+    snapshot = json.loads(audit_logger.selector_overrides_path.read_text(encoding="utf-8"))
+    assert snapshot == {"login_button": "#loginButtonMutated", "login_email_input": "#emailMutated"}
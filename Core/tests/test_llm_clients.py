@@ -0,0 +1,485 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, sleep
+
+import pytest
+
+from framework.core.exceptions import CircuitOpenError, LLMRequestError, SelectorValidationError
+from framework.llm import client as client_module
+from framework.llm.async_client import AsyncOpenAISelectorRepairClient, SyncSelectorRepairClientAdapter
+from framework.llm.client import (
+    AnthropicSelectorRepairClient,
+    GeminiSelectorRepairClient,
+    HedgedSelectorRepairClient,
+    OpenAISelectorRepairClient,
+    SelectorRepairClient,
+    create_selector_repair_client,
+)
+from framework.llm.prompts import encode_user_prompt, prompt_token_budget
+from framework.llm.resilience import CircuitBreaker, RateLimiter, RetryPolicy
+from framework.llm.response_cache import CachingSelectorRepairClient, ResponseCache
+from framework.llm.telemetry import LLMCallStats, summarize_llm_telemetry
+from framework.llm.transport import HTTPConnectionPool
+from tests.helpers import QuietHandler, serve_http
+
+
+class DelayedClient(SelectorRepairClient):
+    def __init__(self, provider_name: str, response: str, delay: float = 0.0) -> None:
+        self.provider_name = provider_name
+        self.response = response
+        self.delay = delay
+        self.calls = 0
+
+    def repair_selector(self, payload):
+        self.calls += 1
+        sleep(self.delay)
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+def test_hedged_client_returns_fastest_valid_response():
+    primary = DelayedClient("slow", "#slow", delay=1.0)
+    secondary = DelayedClient("fast", "#fast")
+    client = HedgedSelectorRepairClient(primary, secondary, hedge_delay_seconds=0.05)
+    started = monotonic()
+    assert client.repair_selector({}) == "#fast"
+    assert monotonic() - started < 0.5
+    assert client.last_provider_name == "fast"
+
+
+def test_hedged_client_skips_primary_when_it_is_fast_and_valid():
+    primary = DelayedClient("primary", "#primary")
+    secondary = DelayedClient("secondary", "#secondary")
+    client = HedgedSelectorRepairClient(primary, secondary, hedge_delay_seconds=0.5)
+    assert client.repair_selector({}) == "#primary"
+    assert secondary.calls == 0
+
+
+def test_hedged_client_falls_back_when_response_fails_validation():
+    def validator(response: str) -> str:
+        if response == "#missing":
+            raise SelectorValidationError("LLM selector did not match any element")
+        return response
+
+    primary = DelayedClient("primary", "#missing")
+    secondary = DelayedClient("secondary", "#present", delay=0.05)
+    client = HedgedSelectorRepairClient(primary, secondary, hedge_delay_seconds=5)
+    assert client.repair_selector({}, validator=validator) == "#present"
+
+    failing = HedgedSelectorRepairClient(primary, DelayedClient("down", RuntimeError("503")), 0)
+    with pytest.raises(RuntimeError, match="All hedged providers failed"):
+        failing.repair_selector({}, validator=validator)
+
+
+def test_selector_client_factory_builds_hedged_client(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_HEDGE_PROVIDER", "gemini")
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_HEDGE_DELAY_SECONDS", "0.75")
+    client = create_selector_repair_client()
+    assert isinstance(client, HedgedSelectorRepairClient)
+    assert isinstance(client.primary, OpenAISelectorRepairClient)
+    assert client.hedge_delay_seconds == 0.75
+    assert client.provider_name == "hedged:openai+gemini"
+
+
+def test_circuit_breaker_fails_fast_and_recovers_through_half_open_probe(monkeypatch):
+    now = [0.0]
+    calls = []
+
+    def flaky_post(url, payload, headers, timeout=None):
+        calls.append(url)
+        if len(calls) <= 3:
+            raise LLMRequestError("LLM request timed out after 30s", timed_out=True)
+        return {"choices": [{"message": {"content": "#recovered"}}]}
+
+    monkeypatch.setattr(client_module, "_post_json", flaky_post)
+    client = OpenAISelectorRepairClient("test-key")
+    client.circuit_breaker = CircuitBreaker("openai", failure_threshold=2, cooldown_seconds=10, clock=lambda: now[0])
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="timed out"):
+            client.repair_selector({})
+    with pytest.raises(CircuitOpenError, match="circuit is open"):
+        client.repair_selector({})
+    assert len(calls) == 2
+
+    now[0] = 11.0
+    with pytest.raises(RuntimeError, match="timed out"):
+        client.repair_selector({})
+    assert client.circuit_breaker.state == CircuitBreaker.OPEN
+
+    now[0] = 22.0
+    assert client.repair_selector({}) == "#recovered"
+    assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_ignores_rejected_requests_and_interrupted_probes(monkeypatch):
+    now = [0.0]
+    outcomes = [LLMRequestError("bad request", status=400), LLMRequestError("unauthorized", status=401)]
+
+    def post(url, payload, headers, timeout=None):
+        outcome = outcomes.pop(0) if outcomes else {"choices": [{"message": {"content": "#ok"}}]}
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(client_module, "_post_json", post)
+    client = OpenAISelectorRepairClient("test-key")
+    client.circuit_breaker = CircuitBreaker("openai", failure_threshold=1, cooldown_seconds=10, clock=lambda: now[0])
+
+    for message in ("bad request", "unauthorized"):
+        with pytest.raises(LLMRequestError, match=message):
+            client.repair_selector({})
+    assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+
+    outcomes.append(LLMRequestError("status 502", status=502))
+    with pytest.raises(LLMRequestError):
+        client.repair_selector({})
+    assert client.circuit_breaker.state == CircuitBreaker.OPEN
+
+    now[0] = 11.0
+    outcomes.append(KeyboardInterrupt())
+    with pytest.raises(KeyboardInterrupt):
+        client.repair_selector({})
+    # The interrupted probe does not leave the circuit stuck half-open.
+    assert client.repair_selector({}) == "#ok"
+    assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.fixture()
+def json_echo_server():
+    client_ports: list[int] = []
+
+    class Handler(QuietHandler):
+        def do_POST(self):
+            body = self.read_json()
+            client_ports.append(self.client_address[1])
+            self.send_json(200, {"echo": body})
+
+    with serve_http(Handler) as base_url:
+        yield base_url, client_ports
+
+
+def test_connection_pool_reuses_keep_alive_connections(json_echo_server):
+    base_url, client_ports = json_echo_server
+    pool = HTTPConnectionPool(max_connections_per_host=2, timeout=5)
+    for index in range(5):
+        response = pool.request("POST", f"{base_url}/v1/chat?i={index}", body=json.dumps({"i": index}).encode())
+        assert response.status == 200
+        assert json.loads(response.body) == {"echo": {"i": index}}
+    assert len(client_ports) == 5
+    assert len(set(client_ports)) == 1
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        statuses = list(executor.map(lambda i: pool.request("POST", base_url, body=b"{}").status, range(12)))
+    assert statuses == [200] * 12
+    assert len(set(client_ports)) <= 2
+    pool.close()
+
+
+def test_response_cache_replays_validated_answers_and_evicts_lru(tmp_path):
+    cache = ResponseCache(tmp_path / "llm_responses", max_entries=2)
+    inner = DelayedClient("openai", '{"selector": "#email", "selector_type": "css"}')
+    inner.model = "gpt-4o-mini"
+    client = CachingSelectorRepairClient(inner, cache)
+    payload = {"failed_element_key": "email", "mutation_events": [{"at": 1}]}
+
+    assert client.repair_selector(payload) == inner.response
+    assert client.repair_selector({**payload, "mutation_events": [{"at": 2}]}) == inner.response
+    assert inner.calls == 1
+    assert client.last_provider_name == "response_cache"
+
+    def reject(response: str) -> str:
+        raise SelectorValidationError("LLM selector did not match any element")
+
+    with pytest.raises(SelectorValidationError):
+        client.repair_selector(payload, validator=reject)
+    assert inner.calls == 2
+    assert len(cache) == 0
+
+    for index in range(3):
+        client.repair_selector({"failed_element_key": f"key{index}"})
+        sleep(0.01)
+    assert len(cache) == 2
+    client.repair_selector({"failed_element_key": "key0"})
+    assert inner.calls == 6
+
+
+def test_response_cache_key_ignores_layout_jitter():
+    def payload(x: float, score: float) -> dict:
+        candidate = {"selector_hint": "#email", "rect": {"x": x, "y": 40.5}, "heuristic_score": score}
+        return {"failed_element_key": "email", "top_ranked_candidates": [candidate]}
+
+    key = ResponseCache.request_key("openai", "gpt-4o-mini", "system", payload(120.0, 0.8125))
+    assert ResponseCache.request_key("openai", "gpt-4o-mini", "system", payload(120.4999, 0.8124999)) == key
+    other = {**payload(120.0, 0.8125), "failed_element_key": "password"}
+    assert ResponseCache.request_key("openai", "gpt-4o-mini", "system", other) != key
+
+
+def test_response_cache_scans_for_eviction_every_n_puts(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, max_entries=64)
+    assert cache.evict_every == 4
+    scans: list[int] = []
+    evict = cache._evict
+
+    def counting_evict() -> None:
+        scans.append(len(cache))
+        evict()
+
+    monkeypatch.setattr(cache, "_evict", counting_evict)
+
+    for index in range(70):
+        cache.put(f"{index:064x}", f"#k{index}")
+    assert scans == [4 * (index + 1) for index in range(16)] + [64 + 4]
+    assert len(cache) == 66
+    cache.put("f" * 64, "#last")
+    cache.put("e" * 64, "#last")
+    assert len(cache) == 64
+
+
+@pytest.fixture()
+def rate_limited_server():
+    statuses = [429, 503]
+
+    class Handler(QuietHandler):
+        def do_POST(self):
+            self.read_json()
+            status = statuses.pop(0) if statuses else 200
+            body = {"error": "slow down"} if status != 200 else {"choices": [{"message": {"content": "#ok"}}]}
+            self.send_json(status, body, {"Retry-After": "0"} if status == 429 else None)
+
+    with serve_http(Handler) as base_url:
+        yield f"{base_url}/v1/chat/completions", statuses
+
+
+def test_retry_policy_backs_off_through_rate_limits(rate_limited_server):
+    url, statuses = rate_limited_server
+    client = OpenAISelectorRepairClient("test-key")
+    client.endpoint = url
+    client.retry_policy = RetryPolicy(max_attempts=3, base_delay_seconds=0.01)
+    assert client.repair_selector({}) == "#ok"
+    assert statuses == []
+    stats = client.last_call_stats
+    assert stats.retries == 2 and stats.tokens_estimated
+    assert stats.model == "gpt-4o-mini" and stats.ttfb_seconds is not None
+    assert stats.latency_seconds >= stats.ttfb_seconds
+
+    statuses.extend([429, 429, 429])
+    with pytest.raises(LLMRequestError, match="status 429") as excinfo:
+        client.repair_selector({})
+    assert excinfo.value.retry_after == 0
+
+    policy = RetryPolicy(max_attempts=5, max_delay_seconds=10)
+    assert policy.retry_delay(1, LLMRequestError("x", status=400)) is None
+    assert policy.retry_delay(1, LLMRequestError("x", status=429, retry_after=30)) is None
+    assert policy.retry_delay(1, LLMRequestError("x", timed_out=True)) is None
+    assert 0 <= policy.retry_delay(4, LLMRequestError("x", status=502)) <= 4
+
+
+@pytest.fixture()
+def openai_format_server():
+    state = {"active": 0, "peak": 0, "ports": set()}
+    lock = threading.Lock()
+
+    class Handler(QuietHandler):
+        def do_POST(self):
+            body = self.read_json()
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                state["ports"].add(self.client_address[1])
+            sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            answer = json.loads(body["messages"][1]["content"])["element_key"]
+            self.send_json(200, {"choices": [{"message": {"content": f"#{answer}"}}]})
+
+    with serve_http(Handler) as base_url:
+        yield f"{base_url}/v1/chat/completions", state
+
+
+def test_async_client_bounds_concurrency_per_provider(openai_format_server):
+    url, state = openai_format_server
+    client = AsyncOpenAISelectorRepairClient("test-key", max_concurrency=2)
+    client.client.endpoint = url
+
+    async def repair(index):
+        selector = await client.repair_selector({"element_key": f"e{index}"})
+        return selector, client.last_call_stats
+
+    async def repair_all():
+        return await asyncio.gather(*(repair(index) for index in range(6)))
+
+    results = asyncio.run(repair_all())
+    client.close()
+    assert [selector for selector, _ in results] == [f"#e{index}" for index in range(6)]
+    assert all(stats.ttfb_seconds is not None for _, stats in results)
+    assert len({id(stats) for _, stats in results}) == 6
+    assert state["peak"] == 2
+    # Requests go through the shared keep-alive pool rather than a connection each.
+    assert len(state["ports"]) <= 2
+
+
+def test_async_client_retries_and_trips_the_breaker_like_the_sync_client(rate_limited_server):
+    url, statuses = rate_limited_server
+    client = AsyncOpenAISelectorRepairClient("test-key")
+    client.client.endpoint = url
+    client.client.retry_policy = RetryPolicy(max_attempts=3, base_delay_seconds=0.01)
+    client.client.circuit_breaker = CircuitBreaker("openai", failure_threshold=1, cooldown_seconds=60)
+
+    async def repair():
+        return await client.repair_selector({}), client.last_call_stats
+
+    selector, stats = asyncio.run(repair())
+    assert selector == "#ok" and stats.retries == 2
+
+    statuses.extend([503, 503, 503])
+    with pytest.raises(LLMRequestError, match="status 503"):
+        asyncio.run(repair())
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(repair())
+    client.close()
+
+
+def test_sync_adapter_runs_async_client_for_blocking_callers(openai_format_server):
+    url, state = openai_format_server
+    async_client = AsyncOpenAISelectorRepairClient("test-key", max_concurrency=3)
+    async_client.client.endpoint = url
+    adapter = SyncSelectorRepairClientAdapter(async_client)
+
+    def repair(index):
+        return adapter.repair_selector({"element_key": f"e{index}"}), adapter.last_call_stats
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(repair, range(6)))
+    adapter.close()
+    assert [selector for selector, _ in results] == [f"#e{index}" for index in range(6)]
+    assert all(stats is not None and stats.provider == "openai" for _, stats in results)
+    assert state["peak"] <= 3
+
+
+def test_rate_limiter_spaces_requests_and_tokens_per_minute():
+    now = [0.0]
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=600, clock=lambda: now[0])
+    assert limiter.reserve(100) == 0
+    assert limiter.reserve(100) == 0
+    assert limiter.reserve(100) == pytest.approx(30)
+    now[0] = 60.0
+    assert limiter.reserve(1000) == pytest.approx(40)
+
+
+@pytest.fixture()
+def sse_server():
+    requests_seen: list[tuple[str, dict]] = []
+
+    class Handler(QuietHandler):
+        def do_POST(self):
+            body = self.read_json()
+            requests_seen.append((self.path, body))
+            if "anthropic" in self.path:
+                events = [{"type": "message_start"}] + [
+                    {"type": "content_block_delta", "delta": {"type": "text_delta", "text": text}}
+                    for text in ("#pass", "word\nThis selector", " targets the input.")
+                ]
+            else:
+                events = [{"choices": [{"delta": {"content": text}}]} for text in ("```css\n#em", "ail\n", "```")]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for event in events:
+                    chunk = f"data: {json.dumps(event)}\n\n".encode("utf-8")
+                    self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    self.wfile.flush()
+                    sleep(0.05)
+                sleep(1.0)
+                self.wfile.write(b"0\r\n\r\n")
+            except OSError:
+                pass
+
+    with serve_http(Handler) as base_url:
+        yield base_url, requests_seen
+
+
+def test_streaming_clients_return_on_first_complete_line(sse_server):
+    base_url, requests_seen = sse_server
+    openai_client = OpenAISelectorRepairClient("test-key")
+    openai_client.endpoint = f"{base_url}/openai"
+    openai_client.stream_responses = True
+    anthropic_client = AnthropicSelectorRepairClient("test-key")
+    anthropic_client.endpoint = f"{base_url}/anthropic"
+    anthropic_client.stream_responses = True
+
+    started = monotonic()
+    assert openai_client.repair_selector({"mode": "target_repair"}) == "#email"
+    assert anthropic_client.repair_selector({"mode": "target_repair"}) == "#password"
+    assert monotonic() - started < 1.0
+    assert all(body["stream"] is True for _, body in requests_seen)
+
+    gemini_client = GeminiSelectorRepairClient("test-key")
+    url, body = gemini_client.build_stream_request(gemini_client.endpoint_template.format(model="m"), {})
+    assert url.endswith(":streamGenerateContent?alt=sse") and "stream" not in body
+    assert gemini_client.parse_stream_event({"candidates": [{"content": {"parts": [{"text": "#a"}]}}]}) == "#a"
+
+
+def test_shared_client_keeps_call_telemetry_per_thread(monkeypatch):
+    def fake_post(url, body, headers):
+        prompt = body["messages"][1]["content"]
+        slow = "slow" in prompt
+        if slow:
+            sleep(0.2)
+        return {"choices": [{"message": {"content": "#slow" if slow else "#fast"}}]}
+
+    monkeypatch.setattr(client_module, "_post_json", fake_post)
+    client = OpenAISelectorRepairClient("test-key")
+    payloads = {"slow": {"failed_element_key": "slow" + "_x" * 2000}, "fast": {"failed_element_key": "fast"}}
+    expected_tokens = {
+        name: encode_user_prompt(payload, prompt_token_budget("openai")).estimated_tokens
+        for name, payload in payloads.items()
+    }
+    barrier = threading.Barrier(2)
+
+    def repair(name):
+        barrier.wait()
+        selector = client.repair_selector(payloads[name])
+        return selector, client.last_call_stats
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        (slow_selector, slow), (fast_selector, fast) = executor.map(repair, ["slow", "fast"])
+
+    assert (slow_selector, fast_selector) == ("#slow", "#fast")
+    assert slow is not fast
+    assert slow.latency_seconds >= 0.2 > fast.latency_seconds
+    assert slow.prompt_tokens == expected_tokens["slow"] > fast.prompt_tokens == expected_tokens["fast"]
+    assert client.last_call_stats is None
+
+
+def test_llm_telemetry_reads_usage_and_summarizes_per_provider(monkeypatch):
+    monkeypatch.setenv("LLM_COST_PER_1K_TOKENS_ANTHROPIC", "3,15")
+    client = AnthropicSelectorRepairClient("test-key", model="claude-test")
+    usage = client.parse_usage({"usage": {"input_tokens": 1000, "output_tokens": 10}})
+    stats = LLMCallStats("anthropic", "claude-test", latency_seconds=0.5)
+    client.record_usage(stats, usage, "#ok")
+    assert (stats.prompt_tokens, stats.completion_tokens, stats.tokens_estimated) == (1000, 10, False)
+    assert stats.cost_usd == pytest.approx(3.15)
+    assert GeminiSelectorRepairClient("k").parse_usage({"usageMetadata": {"promptTokenCount": 7}}) == (7, 0)
+
+    attempts = [
+        {"success": True, "llm_telemetry": stats.to_dict()},
+        {"success": False, "llm_telemetry": {**stats.to_dict(), "latency_seconds": 1.5, "retries": 1}},
+        {"success": True, "llm_telemetry": {}},
+    ]
+    (row,) = summarize_llm_telemetry(attempts)
+    assert row["provider"] == "anthropic" and row["calls"] == 2
+    assert row["success_rate"] == 0.5
+    assert row["latency_p95_seconds"] == 1.5
+    assert row["prompt_tokens"] == 2000 and row["retries"] == 1
+    assert row["cost_usd"] == pytest.approx(6.3)